@@ -42,6 +42,8 @@ mutation = lambda: UniformFloatMutation(probability=1, radius=1)
 address_provider = address.SequenceAddressProvider
 
 migration = Pyro4Migration
+# batching migrants per destination needs one migration shared by all agents of the process:
+# the_migration = pyage.core.migration.BatchedPyro4Migration(); migration = lambda: the_migration
 locator = RowLocator
 
 ns_hostname = lambda: os.environ['NS_HOSTNAME']
@@ -0,0 +1,42 @@
+# coding=utf-8
+import logging
+import os
+
+from pyage.core import address
+
+from pyage.core.agent.agent import unnamed_agents
+from pyage.core.emas import EmasService, VectorizedEmasAggregate
+from pyage.core.stats.gnuplot import StepStatistics
+from pyage.core.stop_condition import StepLimitStopCondition
+from pyage.solutions.evolution.crossover import SinglePointCrossover
+from pyage.solutions.evolution.evaluation import FloatRastriginEvaluation
+from pyage.solutions.evolution.initializer import vectorized_float_emas_initializer
+from pyage.solutions.evolution.mutation import UniformFloatMutation
+
+
+logger = logging.getLogger(__name__)
+
+agents_count = int(os.environ['AGENTS'])
+logger.debug("Vectorized EMAS, %s aggregates", agents_count)
+agents = unnamed_agents(agents_count, VectorizedEmasAggregate)
+
+stop_condition = lambda: StepLimitStopCondition(100)
+
+emas_population = lambda: vectorized_float_emas_initializer(40, energy=100, size=50, lowerbound=-10, upperbound=10)
+
+emas = EmasService
+
+minimal_energy = lambda: 0
+reproduction_minimum = lambda: 90
+migration_minimum = lambda: 120
+newborn_energy = lambda: 100
+transferred_energy = lambda: 40
+migration_probability = lambda: 0.05
+
+evaluation = FloatRastriginEvaluation
+crossover = SinglePointCrossover
+mutation = lambda: UniformFloatMutation(probability=1, radius=1)
+
+address_provider = address.SequenceAddressProvider
+
+stats = lambda: StepStatistics('fitness_%s_pyage.txt' % __name__)
@@ -2,7 +2,7 @@ import logging
 import random
 
 from pyage.core.address import Addressable
-from pyage.core.inject import Inject
+from pyage.core.inject import Inject, InjectOptional
 
 
 logger = logging.getLogger(__name__)
@@ -32,7 +32,10 @@ class AbstractAgent:
 
 
 class Agent(Addressable, AbstractAgent):
+    profiler = None
+
     @Inject("locator", "migration")
+    @InjectOptional("profiler")
     def __init__(self, name=None):
         self.name = name
         super(Agent, self).__init__()
@@ -45,8 +48,11 @@ class Agent(Addressable, AbstractAgent):
     def step(self):
         self.steps += 1
         logger.debug("%s %s %s", self.steps, self.address, self.get_fitness())
-        for o in self.operators:
-            o.process(self.population)
+        if self.profiler is None:
+            for o in self.operators:
+                o.process(self.population)
+        else:
+            self.profiler.process(self.operators, self.population)
         # self.__send_genotype()
         # self.__migrate()
 
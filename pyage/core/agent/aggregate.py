@@ -1,5 +1,6 @@
 from pyage.core.address import Addressable
 from pyage.core.agent.agent import AbstractAgent
+from pyage.core.agent.index import AgentIndex
 from pyage.core.inject import Inject
 
 class AggregateAgent(Addressable, AbstractAgent):
@@ -9,6 +10,7 @@ class AggregateAgent(Addressable, AbstractAgent):
         super(AggregateAgent, self).__init__()
         for agent in self.__agents.values():
             agent.parent = self
+        self.agent_index = AgentIndex(self.__agents.values())
         self.steps = 0
 
     def step(self):
@@ -18,12 +20,19 @@ class AggregateAgent(Addressable, AbstractAgent):
     def remove_agent(self, agent):
         agent = self.__agents[agent.get_address()]
         del self.__agents[agent.get_address()]
+        self.agent_index.remove(agent)
         agent.parent = None
         return agent
 
     def add_agent(self, agent):
         agent.parent = self
         self.__agents[agent.get_address()] = agent
+        self.agent_index.add(agent)
+
+    def add_agents(self, agents):
+        """ receives a batch of migrants, see BatchedPyro4Migration """
+        for agent in agents:
+            self.add_agent(agent)
 
     def get_agents(self):
         return self.__agents.values()
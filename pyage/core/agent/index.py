@@ -0,0 +1,79 @@
+import random
+
+
+class AgentIndex(object):
+    """
+    Agents of a parent (aggregate or workplace), kept for O(1) neighbour lookups. Agents are hashed by identity.
+
+    dense - every agent exactly once, in no particular order; removing swaps the last agent into the freed place,
+            so a uniformly random sibling is a single random index
+    slots - positions of agents in a row or grid topology; a removed agent leaves a hole that the next added agent
+            fills, so the other agents keep their positions (and neighbours) as agents die and are born
+    """
+
+    def __init__(self, agents=()):
+        self.__dense = []
+        self.__dense_positions = {}
+        self.__slots = []
+        self.__agent_slots = {}
+        self.__holes = set()
+        for agent in agents:
+            self.add(agent)
+
+    def __len__(self):
+        return len(self.__dense)
+
+    def __contains__(self, agent):
+        return agent in self.__dense_positions
+
+    def add(self, agent):
+        if agent in self.__dense_positions:
+            raise ValueError("Agent %s is already indexed" % agent)
+        self.__dense_positions[agent] = len(self.__dense)
+        self.__dense.append(agent)
+        if self.__holes:
+            slot = self.__holes.pop()
+            self.__slots[slot] = agent
+        else:
+            slot = len(self.__slots)
+            self.__slots.append(agent)
+        self.__agent_slots[agent] = slot
+
+    def remove(self, agent):
+        position = self.__dense_positions.pop(agent)
+        last = self.__dense.pop()
+        if position < len(self.__dense):
+            self.__dense[position] = last
+            self.__dense_positions[last] = position
+        slot = self.__agent_slots.pop(agent)
+        self.__slots[slot] = None
+        self.__holes.add(slot)
+        while self.__slots and self.__slots[-1] is None:  # trailing holes just shorten the topology
+            self.__slots.pop()
+            self.__holes.remove(len(self.__slots))
+
+    def random_other(self, agent):
+        """ :return: agent drawn uniformly from all but :param agent:, None if there is no such agent """
+        size = len(self.__dense)
+        if size < 2:
+            return None
+        position = random.randrange(size - 1)
+        if position >= self.__dense_positions[agent]:
+            position += 1
+        return self.__dense[position]
+
+    def slot(self, agent):
+        return self.__agent_slots[agent]
+
+    def slots_count(self):
+        """ :return: length of the topology, holes included """
+        return len(self.__slots)
+
+    def agent_at(self, slot):
+        """ :return: agent at :param slot: or None for a hole """
+        return self.__slots[slot]
+
+    def random_agent_at(self, slots):
+        """ :return: agent at one of :param slots:, drawn uniformly among those which are not holes, or None """
+        candidates = [self.__slots[slot] for slot in slots if self.__slots[slot] is not None]
+        return random.choice(candidates) if candidates else None
@@ -0,0 +1,53 @@
+from unittest import TestCase
+from pyage.core.agent.index import AgentIndex
+
+
+class TestAgentIndex(TestCase):
+    def setUp(self):
+        self.agents = ["a%d" % number for number in xrange(5)]
+        self.index = AgentIndex(self.agents)
+
+    def test_indexes_agents_in_order_of_addition(self):
+        self.assertEqual(5, len(self.index))
+        self.assertEqual(5, self.index.slots_count())
+        self.assertEqual(range(5), [self.index.slot(agent) for agent in self.agents])
+        self.assertEqual(self.agents, [self.index.agent_at(slot) for slot in xrange(5)])
+        self.assertRaises(ValueError, self.index.add, "a0")
+
+    def test_removing_swaps_last_agent_into_freed_place(self):
+        self.index.remove("a1")
+        self.assertEqual(4, len(self.index))
+        self.assertNotIn("a1", self.index)
+        drawn = set(self.index.random_other("a0") for _ in xrange(200))
+        self.assertEqual({"a2", "a3", "a4"}, drawn)
+        self.index.remove("a4")  # the agent swapped into the place of a1
+        self.assertEqual({"a2", "a3"}, set(self.index.random_other("a0") for _ in xrange(200)))
+
+    def test_random_other_never_returns_the_agent(self):
+        self.assertEqual({"a1", "a2", "a3", "a4"}, set(self.index.random_other("a0") for _ in xrange(200)))
+        self.assertIsNone(AgentIndex(["single"]).random_other("single"))
+
+    def test_removed_agent_leaves_a_hole_filled_by_next_added_agent(self):
+        self.index.remove("a1")
+        self.index.remove("a3")
+        self.assertEqual(5, self.index.slots_count())
+        self.assertEqual([None, None], [self.index.agent_at(1), self.index.agent_at(3)])
+        self.assertEqual([0, 2, 4], [self.index.slot(agent) for agent in ("a0", "a2", "a4")])
+        self.index.add("b0")
+        self.index.add("b1")
+        self.assertEqual([1, 3], sorted([self.index.slot("b0"), self.index.slot("b1")]))
+        self.assertEqual([0, 2, 4], [self.index.slot(agent) for agent in ("a0", "a2", "a4")])
+        self.index.add("b2")
+        self.assertEqual(5, self.index.slot("b2"))
+
+    def test_trailing_holes_shorten_topology(self):
+        self.index.remove("a3")
+        self.index.remove("a4")
+        self.assertEqual(3, self.index.slots_count())
+        self.index.add("b0")
+        self.assertEqual(3, self.index.slot("b0"))
+
+    def test_random_agent_at_skips_holes(self):
+        self.index.remove("a1")
+        self.assertEqual({"a2"}, set(self.index.random_agent_at([1, 2]) for _ in xrange(50)))
+        self.assertIsNone(self.index.random_agent_at([1]))
@@ -0,0 +1,91 @@
+import logging
+import random
+import threading
+import time
+from pyage.core.lazy import LazyModule
+
+Pyro4 = LazyModule("Pyro4")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 5.0
+
+
+class NameServerDirectory(object):
+    """
+    Listings of the Pyro4 name server, refreshed at most once per ttl seconds, and a pool of proxies reused
+    across calls. Both are shared by the locators and migrations of a process (see get_directory) and may be used
+    from several threads.
+    """
+
+    def __init__(self, ns_hostname, ns_port=None, ttl=DEFAULT_TTL):
+        self.ns_hostname = ns_hostname
+        self.ns_port = ns_port
+        self.ttl = ttl
+        self.ns_lookups = 0
+        self.__listings = {}
+        self.__proxies = {}
+        self.__lock = threading.Lock()
+
+    def list(self, prefix):
+        """ :return: (names, dict name -> uri) of objects registered under :param prefix: """
+        with self.__lock:
+            listed_at, names, listing = self.__listings.get(prefix, (None, None, None))
+            if listed_at is None or time.time() - listed_at > self.ttl:
+                name_server = Pyro4.locateNS(self.ns_hostname, self.ns_port)
+                try:
+                    listing = name_server.list(prefix=prefix)
+                finally:
+                    name_server._pyroRelease()
+                names = listing.keys()
+                self.ns_lookups += 1
+                self.__listings[prefix] = (time.time(), names, listing)
+            return names, listing
+
+    def random_other(self, prefix, name):
+        """ :return: uri of a random object registered under :param prefix: other than :param name:, or None """
+        names, listing = self.list(prefix)
+        if len(names) < 2 and name in listing or not names:
+            return None
+        while True:
+            chosen = random.choice(names)
+            if chosen != name:
+                return listing[chosen]
+
+    def get_proxy(self, uri):
+        with self.__lock:
+            proxy = self.__proxies.get(uri)
+            if proxy is None:
+                proxy = Pyro4.Proxy(uri)
+                self.__proxies[uri] = proxy
+            return proxy
+
+    def invalidate(self, uri=None):
+        """ forgets the listings, and the proxy of :param uri:, e.g. after a call to it failed """
+        with self.__lock:
+            self.__listings = {}
+            proxy = self.__proxies.pop(uri, None)
+        if proxy is not None:
+            proxy._pyroRelease()
+
+    def close(self):
+        with self.__lock:
+            proxies = self.__proxies.values()
+            self.__proxies = {}
+            self.__listings = {}
+        for proxy in proxies:
+            proxy._pyroRelease()
+
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+
+def get_directory(ns_hostname, ns_port=None, ttl=DEFAULT_TTL):
+    """ :return: NameServerDirectory shared by every caller of the process asking for the same name server """
+    with _directories_lock:
+        directory = _directories.get((ns_hostname, ns_port))
+        if directory is None:
+            directory = NameServerDirectory(ns_hostname, ns_port, ttl)
+            _directories[(ns_hostname, ns_port)] = directory
+        return directory
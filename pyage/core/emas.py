@@ -1,6 +1,10 @@
 import logging
 from pyage.core.address import Addressable
-from pyage.core.inject import Inject
+from pyage.core.inject import Inject, InjectOptional
+from pyage.solutions.evolution.genotype import FloatGenotype
+
+from pyage.core.lazy import optional
+numpy = optional("numpy")
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +86,8 @@ class EmasAgent(Addressable):
 
 
 class EmasService(object):
+    migration_population_minimum = 10  # agents migrate only from larger aggregates
+
     @Inject("minimal_energy", "reproduction_minimum", "migration_minimum", "newborn_energy")
     def __init__(self):
         super(EmasService, self).__init__()
@@ -93,7 +99,20 @@ class EmasService(object):
         return a1.get_energy() > self.reproduction_minimum and a2.get_energy() > self.reproduction_minimum
 
     def can_migrate(self, agent):
-        return agent.get_energy() > self.migration_minimum and len(agent.parent.get_agents()) > 10
+        return agent.get_energy() > self.migration_minimum and \
+            len(agent.parent.get_agents()) > self.migration_population_minimum
+
+    def dying(self, energies):
+        """ batched should_die: :return: boolean array, true for every row of :param energies: that should die """
+        return energies <= self.minimal_energy
+
+    def reproducing(self, energies1, energies2):
+        """ batched should_reproduce of pairs (energies1[i], energies2[i]) """
+        return (energies1 > self.reproduction_minimum) & (energies2 > self.reproduction_minimum)
+
+    def migrating(self, energies, population_size):
+        """ batched can_migrate of rows of an aggregate of :param population_size: individuals """
+        return (energies > self.migration_minimum) & (population_size > self.migration_population_minimum)
 
     def reproduce(self, a1, a2):
         logger.debug(str(a1) + " " + str(a2) + "reproducing!")
@@ -104,3 +123,156 @@ class EmasService(object):
         a1.mutation.mutate(genotype)
         a1.parent.add_agent(EmasAgent(genotype, energy))
 
+
+
+class VectorizedEmasAggregate(Addressable):
+    """
+    Aggregate of EMAS individuals kept as rows of numpy arrays (genes, energies, fitnesses) instead of EmasAgents.
+
+    Every step applies the EmasService rules in batches: individuals with too little energy die and their energy is
+    shared among the survivors, then in two rounds the population is split into disjoint random pairs, each of which
+    either reproduces or meets (the fitter one takes transferred_energy from the other). So every individual acts
+    about twice per step, once as the one looking for a neighbour and once as the neighbour found, as with
+    EmasAgents and a RandomLocator. Individuals that can migrate move, with migration_probability, to another
+    aggregate of the same parent, while more than EmasService.migration_population_minimum individuals are left.
+
+    Evaluation, crossover and mutation are used through their evaluate_array, cross_arrays and mutate_array batched
+    counterparts when they have them, genotype by genotype otherwise. As in EmasService.reproduce, every child is
+    mutated, whatever the probability of the mutation. All random choices of the aggregate are drawn
+    from numpy.random, so seeding it makes a run reproducible (as long as the operators draw from it too).
+    """
+
+    migration_probability = 0.05
+
+    @Inject("emas", "evaluation", "crossover", "mutation", "transferred_energy", "emas_population")
+    @InjectOptional("migration_probability")
+    def __init__(self, name=None):
+        """ emas_population: (genes, energies) arrays, e.g. from initializer.vectorized_float_emas_initializer """
+        if numpy is None:
+            raise ImportError("VectorizedEmasAggregate requires numpy")
+        self.name = name
+        super(VectorizedEmasAggregate, self).__init__()
+        genes, energies = self.emas_population
+        self.genes = numpy.array(genes, dtype=float)
+        self.energies = numpy.array(energies, dtype=float)
+        self.fitnesses = self.__evaluate(self.genes)
+        self.steps = 0
+
+    def step(self):
+        self.steps += 1
+        self.__bury_dead()
+        for _ in xrange(2):
+            self.__pair_off()
+        self.__migrate()
+
+    def size(self):
+        return len(self.energies)
+
+    def get_agents(self):
+        """ :return: individuals as FloatGenotypes, the aggregate has no agent objects """
+        return [self.__genotype(i) for i in xrange(self.size())]
+
+    def get_fitness(self):
+        return self.fitnesses.max() if self.size() else None
+
+    def get_best_genotype(self):
+        return self.__genotype(int(self.fitnesses.argmax()))
+
+    def add_agent(self, agent):
+        """ accepts an EmasAgent migrating from a classic aggregate """
+        self.add_individuals([agent.genotype.genes], [agent.energy], [agent.genotype.fitness])
+
+    def add_individuals(self, genes, energies, fitnesses):
+        self.genes = numpy.vstack([self.genes, numpy.asarray(genes, dtype=float)])
+        self.energies = numpy.concatenate([self.energies, numpy.asarray(energies, dtype=float)])
+        self.fitnesses = numpy.concatenate([self.fitnesses, numpy.asarray(fitnesses, dtype=float)])
+
+    def __genotype(self, index):
+        genotype = FloatGenotype(self.genes[index].tolist())
+        genotype.fitness = float(self.fitnesses[index])
+        return genotype
+
+    def __keep(self, mask):
+        self.genes = self.genes[mask]
+        self.energies = self.energies[mask]
+        self.fitnesses = self.fitnesses[mask]
+
+    def __bury_dead(self):
+        if self.size() < 2:
+            return  # an EmasAgent without neighbours doesn't act
+        dead = self.emas.dying(self.energies)
+        if dead.any() and not dead.all():
+            left_energy = self.energies[dead].sum()
+            self.__keep(~dead)
+            self.energies += left_energy / self.size()
+
+    def __pair_off(self):
+        pairs_count = self.size() // 2
+        if not pairs_count:
+            return
+        order = numpy.random.permutation(self.size())[:2 * pairs_count]
+        first, second = order[:pairs_count], order[pairs_count:]
+        reproducing = self.emas.reproducing(self.energies[first], self.energies[second])
+        self.__meet(first[~reproducing], second[~reproducing])
+        self.__reproduce(first[reproducing], second[reproducing])
+
+    def __meet(self, first, second):
+        first_wins = self.fitnesses[first] > self.fitnesses[second]
+        second_wins = self.fitnesses[first] < self.fitnesses[second]
+        winners = numpy.concatenate([first[first_wins], second[second_wins]])
+        losers = numpy.concatenate([second[first_wins], first[second_wins]])
+        transferred = numpy.minimum(self.transferred_energy, self.energies[losers])
+        self.energies[winners] += transferred
+        self.energies[losers] -= transferred
+
+    def __reproduce(self, first, second):
+        if not len(first):
+            return
+        half = self.emas.newborn_energy / 2
+        self.energies[first] -= half
+        self.energies[second] -= half
+        children = self.__cross(self.genes[first], self.genes[second])
+        self.__mutate(children)
+        self.add_individuals(children, numpy.repeat(float(half * 2), len(children)), self.__evaluate(children))
+
+    def __migrate(self):
+        parent = getattr(self, "parent", None)
+        if parent is None:
+            return
+        siblings = [aggregate for aggregate in parent.get_agents()
+                    if aggregate is not self and isinstance(aggregate, VectorizedEmasAggregate)]
+        if not siblings:
+            return
+        migrating = self.emas.migrating(self.energies, self.size()) & \
+            (numpy.random.random(self.size()) < self.migration_probability)
+        migrants = numpy.flatnonzero(migrating)
+        places = self.size() - self.emas.migration_population_minimum
+        if len(migrants) > places:  # EmasAgents stop migrating once the aggregate is down to the minimum
+            migrating[numpy.random.choice(migrants, len(migrants) - places, replace=False)] = False
+        for index in numpy.flatnonzero(migrating):
+            sibling = siblings[numpy.random.randint(len(siblings))]
+            sibling.add_individuals(self.genes[index:index + 1], self.energies[index:index + 1],
+                                    self.fitnesses[index:index + 1])
+        self.__keep(~migrating)
+
+    def __evaluate(self, genes):
+        if hasattr(self.evaluation, "evaluate_array"):
+            return numpy.asarray(self.evaluation.evaluate_array(genes), dtype=float)
+        genotypes = [FloatGenotype(row.tolist()) for row in genes]
+        self.evaluation.process(genotypes)
+        return numpy.array([genotype.fitness for genotype in genotypes], dtype=float)
+
+    def __cross(self, genes1, genes2):
+        if hasattr(self.crossover, "cross_arrays"):
+            return self.crossover.cross_arrays(genes1, genes2)
+        return numpy.array([self.crossover.cross(FloatGenotype(g1.tolist()), FloatGenotype(g2.tolist())).genes
+                            for g1, g2 in zip(genes1, genes2)], dtype=float)
+
+    def __mutate(self, genes):
+        if hasattr(self.mutation, "mutate_array"):
+            self.mutation.mutate_array(genes)
+            return
+        for row in genes:
+            genotype = FloatGenotype(row.tolist())
+            self.mutation.mutate(genotype)
+            row[:] = genotype.genes
@@ -1,12 +1,19 @@
+import time
+
 config = None
 
 
+def parse_spec(arg):
+    """ :return: (conf_arg_name, property_name) of an injection spec "conf_arg_name[:property_name]" """
+    parts = arg.split(":")
+    return parts[0], parts[-1]
+
+
 class Inject(object):
     def __init__(self, *args):
         self.args = args
+        self.specs = [parse_spec(arg) for arg in args]  # parsed once, at decoration time
 
-    # TODO(vucalur): load the bloody config ONLY ONCE and cache it somehow! PERFORMANCE!
-    # I guess config module isn't replaced while pyage is computing, so caching makes sense.
     @staticmethod
     def read_config(config):
         # about importing modules: http://docs.python.org/2/reference/simple_stmts.html#grammar-token-import_stmt
@@ -16,10 +23,8 @@ class Inject(object):
 
     def __call__(self, f):
         def wrapped_f(*args, **kwargs):
-            conf = self.read_config(config)
-            for arg in self.args:
-                conf_arg_name = arg.split(":")[0]
-                property_name = arg.split(":")[-1]
+            conf = read_config_once()
+            for conf_arg_name, property_name in self.specs:
                 setattr(args[0], property_name, resolve_attr(conf, conf_arg_name, args))
             return f(*args, **kwargs)
 
@@ -33,10 +38,8 @@ class InjectOptional(Inject):
     def __call__(self, f):
         def wrapped_f(*args, **kwargs):
             try:
-                conf = self.read_config(config)
-                for arg in self.args:
-                    conf_arg_name = arg.split(":")[0]
-                    property_name = arg.split(":")[-1]
+                conf = read_config_once()
+                for conf_arg_name, property_name in self.specs:
                     setattr(args[0], property_name, resolve_attr(conf, conf_arg_name, args))
             except:
                 pass  # parameter is not mandatory
@@ -47,14 +50,13 @@ class InjectOptional(Inject):
 
 class InjectWithDefault(Inject):
     def __init__(self, *args):
-        super(InjectWithDefault, self).__init__(*args)
+        self.args = args
+        self.specs = [parse_spec(arg) + (default_value,) for (arg, default_value) in args]
 
     def __call__(self, f):
         def wrapped_f(*args, **kwargs):
-            conf = self.read_config(config)
-            for (arg, default_value) in self.args:
-                conf_arg_name = arg.split(":")[0]
-                property_name = arg.split(":")[-1]
+            conf = read_config_once()
+            for conf_arg_name, property_name, default_value in self.specs:
                 try:
                     attr = resolve_attr(conf, conf_arg_name, args)
                 except:
@@ -65,8 +67,100 @@ class InjectWithDefault(Inject):
         return wrapped_f
 
 
+_read_config = (None, None)
+
+
+def read_config_once():
+    """ config module isn't replaced while pyage is computing, so it is read once per value of config """
+    global _read_config
+    if _read_config[0] != config:
+        _read_config = (config, Inject.read_config(config))
+    return _read_config[1]
+
+
+def address_prefix(args):
+    """ :return: first segment of the address of the injected object, None before its address is assigned """
+    address = getattr(args[0], "address", None)
+    return address.split('.')[0] if address else None
+
+
 def resolve_attr(conf, conf_arg_name, args):
-    try:
-        return getattr(conf, args[0].address.split('.')[0] + '__' + conf_arg_name)()
-    except:
-        return getattr(conf, conf_arg_name)()
+    prefix = address_prefix(args)
+    if prefix is not None:
+        provider = getattr(conf, prefix + '__' + conf_arg_name, None)
+        if provider is not None:
+            return provider()
+    return getattr(conf, conf_arg_name)()
+
+
+class CachingResolver(object):
+    """
+    Replacement of resolve_attr reading providers from dicts instead of a config module.
+
+    Providers are looked up once per (address prefix, name) and cached; they are still called on every injection,
+    so each injected object gets what its provider returns at that time. Prefixes only matter when listed in
+    prefix_overrides, any other prefix shares the cache entries of objects without an address.
+    """
+
+    def __init__(self, params, prefix_overrides=None, measure=False):
+        """
+        :param params: dict name -> provider
+        :param prefix_overrides: dict address prefix -> dict name -> provider, used before :param params:
+        :param measure: count lookups and time spent in them, see :meth:`get_overhead`
+        """
+        self.params = params
+        self.prefix_overrides = prefix_overrides or {}
+        self.measure = measure
+        self.__providers = {}
+        self.lookups = 0
+        self.cache_misses = 0
+        self.lookup_time = 0.0
+
+    @staticmethod
+    def from_params(params, measure=False):
+        """ :param params: dict in launcher style, "prefix__name" keys override "name" for objects of that prefix """
+        plain_params = {}
+        prefix_overrides = {}
+        for key, provider in params.items():
+            if "__" in key:
+                prefix, name = key.split("__", 1)
+                prefix_overrides.setdefault(prefix, {})[name] = provider
+            else:
+                plain_params[key] = provider
+        return CachingResolver(plain_params, prefix_overrides, measure)
+
+    def __call__(self, conf, conf_arg_name, args):
+        if self.measure:
+            start = time.time()
+            provider = self.get_provider(args, conf_arg_name)
+            self.lookup_time += time.time() - start
+            self.lookups += 1
+            return provider()
+        return self.get_provider(args, conf_arg_name)()
+
+    def get_provider(self, args, conf_arg_name):
+        """ :param args: arguments of the injected method, args[0] is the object being injected """
+        prefix = address_prefix(args) if self.prefix_overrides else None
+        if prefix not in self.prefix_overrides:
+            prefix = None
+        provider = self.__providers.get((prefix, conf_arg_name))
+        if provider is None:
+            self.cache_misses += 1
+            provider = self.__find_provider(prefix, conf_arg_name)
+            self.__providers[(prefix, conf_arg_name)] = provider
+        return provider
+
+    def __find_provider(self, prefix, conf_arg_name):
+        if prefix is not None and conf_arg_name in self.prefix_overrides[prefix]:
+            return self.prefix_overrides[prefix][conf_arg_name]
+        if conf_arg_name in self.params:
+            return self.params[conf_arg_name]
+        raise KeyError("No provider of " + conf_arg_name)
+
+    def get_overhead(self):
+        """ :return: (lookups, seconds spent in them, excluding providers), counted only when measure is set """
+        return self.lookups, self.lookup_time
+
+    def __str__(self):
+        return "CachingResolver[lookups: {0}, cache misses: {1}, lookup time: {2:.6f}s]".format(
+            self.lookups, self.cache_misses, self.lookup_time)
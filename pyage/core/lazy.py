@@ -0,0 +1,44 @@
+import importlib
+import pkgutil
+
+
+class LazyModule(object):
+    """
+    Stands for a module until one of its attributes is used, then imports it. Heavy dependencies used only by some
+    code paths (numpy, Pyro4) are bound this way, so processes which don't need them don't pay for importing them.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_LazyModule__name"] = name
+        self.__dict__["_LazyModule__module"] = None
+
+    def is_loaded(self):
+        return self.__module is not None
+
+    def __load(self):
+        if self.__module is None:
+            self.__dict__["_LazyModule__module"] = importlib.import_module(self.__name)
+        return self.__module
+
+    def __getattr__(self, attribute):
+        return getattr(self.__load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self.__load(), attribute, value)
+
+    def __repr__(self):
+        return "<lazy module %r%s>" % (self.__name, "" if self.is_loaded() else ", not loaded")
+
+
+def optional(name):
+    """
+    Lazy counterpart of try: import name / except ImportError: name = None.
+
+    :return: LazyModule of top-level module :param name: if it is installed, None otherwise; the module is only looked
+             up, not imported
+    """
+    try:
+        loader = pkgutil.find_loader(name)
+    except ImportError:
+        loader = None
+    return LazyModule(name) if loader is not None else None
@@ -1,8 +1,8 @@
 import logging
 from math import sqrt, ceil
 import random
-import Pyro4
 from pyage.core.agent.agent import AGENT
+from pyage.core.directory import DEFAULT_TTL, get_directory
 from pyage.core.inject import Inject
 
 logger = logging.getLogger(__name__)
@@ -15,27 +15,29 @@ class Locator(object):
 
 class Pyro4Locator(Locator):
     @Inject("ns_hostname")
-    def __init__(self):
+    def __init__(self, ttl=DEFAULT_TTL, directory=None):
+        """ :param directory: NameServerDirectory, by default the one of ns_hostname shared by the process """
         super(Pyro4Locator, self).__init__()
+        self.directory = directory if directory is not None else get_directory(self.ns_hostname, ttl=ttl)
 
     def get_neighbour(self, agent):
         try:
-            random_agent = self.__get_random_agent(agent)
-            logger.debug(random_agent.get_address())
-            return random_agent
+            uri = self.directory.random_other(AGENT, AGENT + "." + agent.address)
+            return self.directory.get_proxy(uri) if uri is not None else None
         except:
             logging.exception('')
 
-    def __get_random_agent(self, a):
-        ns = Pyro4.locateNS(self.ns_hostname)
-        agents = ns.list(AGENT)
-        logger.debug(agents)
-        del agents[AGENT + "." + a.address]
-        return Pyro4.Proxy(random.choice(agents.values()))
+
+def get_agent_index(agent):
+    """ :return: AgentIndex of the parent of :param agent:, None for parents without one (e.g. remote ones) """
+    return getattr(agent.parent, "agent_index", None)
 
 
 class RandomLocator(Locator):
     def get_neighbour(self, agent):
+        agent_index = get_agent_index(agent)
+        if agent_index is not None:
+            return agent_index.random_other(agent)
         siblings = list(agent.parent.get_agents())
         if len(siblings) < 2:
             return None
@@ -45,19 +47,43 @@ class RandomLocator(Locator):
 
 class RowLocator(Locator):
     def get_neighbour(self, agent):
+        agent_index = get_agent_index(agent)
+        if agent_index is not None:
+            return self.__get_indexed_neighbour(agent_index, agent)
         siblings = list(agent.parent.get_agents())
         if len(siblings) < 2:
             return None
         index = siblings.index(agent)
         return random.choice(siblings[index - 2:index] + siblings[index + 1:index + 3])
 
+    @staticmethod
+    def __get_indexed_neighbour(agent_index, agent):
+        slot = agent_index.slot(agent)
+        slots = [s for s in (slot - 2, slot - 1, slot + 1, slot + 2) if 0 <= s < agent_index.slots_count()]
+        neighbour = agent_index.random_agent_at(slots)
+        return neighbour if neighbour is not None else agent_index.random_other(agent)
+
 
 class GridLocator(Locator):
     def get_neighbour(self, agent):
+        agent_index = get_agent_index(agent)
+        if agent_index is not None:
+            return self.__get_indexed_neighbour(agent_index, agent)
         siblings = list(agent.parent.get_agents())
         if len(siblings) < 2:
             return None
         index = siblings.index(agent)
         size = len(siblings)
         dim = int(ceil(sqrt(size)))
-        return siblings[random.choice([index - dim, index - 1, index + 1, index + dim]) % size]
\ No newline at end of file
+        return siblings[random.choice([index - dim, index - 1, index + 1, index + dim]) % size]
+
+    @staticmethod
+    def __get_indexed_neighbour(agent_index, agent):
+        if len(agent_index) < 2:
+            return None
+        slot = agent_index.slot(agent)
+        size = agent_index.slots_count()
+        dim = int(ceil(sqrt(size)))
+        slots = [s % size for s in (slot - dim, slot - 1, slot + 1, slot + dim) if s % size != slot]
+        neighbour = agent_index.random_agent_at(slots)
+        return neighbour if neighbour is not None else agent_index.random_other(agent)
@@ -1,7 +1,9 @@
 import logging
+import Queue
 import random
-import Pyro4
+import threading
 from pyage.core.agent.agent import AGENT
+from pyage.core.directory import DEFAULT_TTL, get_directory
 from pyage.core.inject import Inject
 
 logger = logging.getLogger(__name__)
@@ -11,12 +13,18 @@ class Migration(object):
     def migrate(self, agent):
         raise NotImplementedError()
 
+    def stop(self):
+        """ called by Workplace.stop """
+        pass
+
 
 class Pyro4Migration(Migration):
     @Inject("ns_hostname")
-    def __init__(self, probability=0.05):
+    def __init__(self, probability=0.05, ttl=DEFAULT_TTL, directory=None):
+        """ :param directory: NameServerDirectory, by default the one of ns_hostname shared by the process """
         super(Pyro4Migration, self).__init__()
         self.probability = probability
+        self.directory = directory if directory is not None else get_directory(self.ns_hostname, ttl=ttl)
 
     def migrate(self, agent):
         try:
@@ -31,11 +39,100 @@ class Pyro4Migration(Migration):
         return False
 
     def _get_random_aggregate(self, agent):
-        ns = Pyro4.locateNS(self.ns_hostname)
-        agents = ns.list(AGENT)
-        logger.debug(agents)
-        del agents[AGENT + "." + agent.parent.address]
-        return Pyro4.Proxy(random.choice(agents.values()))
+        return self.directory.get_proxy(self._get_random_aggregate_uri(agent))
+
+    def _get_random_aggregate_uri(self, agent):
+        uri = self.directory.random_other(AGENT, AGENT + "." + agent.parent.address)
+        if uri is None:
+            raise LookupError("No other aggregate registered")
+        return uri
+
+
+class BatchedPyro4Migration(Pyro4Migration):
+    """
+    Pyro4Migration which doesn't make Workplace.step wait for the network: migrants are queued and a background
+    thread sends all migrants queued for a destination in a single add_agents call. Migrants which could not be
+    delivered return to their aggregate on the next migrate call.
+
+    Batches gather migrants of all agents, so the whole process must share one instance - every agent gets migration
+    injected, so provide it as migration = lambda: the_migration rather than migration = BatchedPyro4Migration.
+    The sender thread is stopped by Workplace.stop.
+    """
+    __STOP = object()
+
+    def __init__(self, probability=0.05, ttl=DEFAULT_TTL, directory=None):
+        super(BatchedPyro4Migration, self).__init__(probability, ttl, directory)
+        self.sent = 0
+        self.batches = 0
+        self.__outgoing = Queue.Queue()
+        self.__returned = Queue.Queue()
+        self.__sender = threading.Thread(target=self.__send_loop, name="migration-sender")
+        self.__sender.daemon = True
+        self.__sender.start()
+
+    def migrate(self, agent):
+        self.__take_back_returned()
+        try:
+            if random.random() < self.probability and len(agent.parent.get_agents()) > 1:
+                uri = self._get_random_aggregate_uri(agent)
+                origin = agent.parent
+                self.__outgoing.put((uri, origin, origin.remove_agent(agent)))
+                return True
+        except:
+            logging.exception("")
+        return False
+
+    def flush(self):
+        """ waits until every queued migrant is sent or returned """
+        self.__outgoing.join()
+        self.__take_back_returned()
+
+    def stop(self):
+        """ sends queued migrants and stops the sender thread """
+        if self.__sender.is_alive():
+            self.__outgoing.put(self.__STOP)
+            self.__sender.join()
+        self.__take_back_returned()
+
+    def __take_back_returned(self):
+        while True:
+            try:
+                origin, agent = self.__returned.get_nowait()
+            except Queue.Empty:
+                return
+            origin.add_agent(agent)
+
+    def __send_loop(self):
+        stopped = False
+        while not stopped:
+            batch = [self.__outgoing.get()]
+            while True:
+                try:
+                    batch.append(self.__outgoing.get_nowait())
+                except Queue.Empty:
+                    break
+            migrants = {}
+            for item in batch:
+                if item is self.__STOP:
+                    stopped = True
+                    continue
+                uri, origin, agent = item
+                migrants.setdefault(uri, []).append((origin, agent))
+            for uri, destination_migrants in migrants.items():
+                self.__send(uri, destination_migrants)
+            for _ in batch:
+                self.__outgoing.task_done()
+
+    def __send(self, uri, migrants):
+        try:
+            self.directory.get_proxy(uri).add_agents([agent for _, agent in migrants])
+            self.sent += len(migrants)
+            self.batches += 1
+        except Exception:
+            logger.exception("Could not send %d migrants to %s", len(migrants), uri)
+            self.directory.invalidate(uri)
+            for migrant in migrants:
+                self.__returned.put(migrant)
 
 
 class ParentMigration(Migration):
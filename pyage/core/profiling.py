@@ -0,0 +1,133 @@
+import cProfile
+import csv
+import json
+import logging
+import pstats
+import time
+
+logger = logging.getLogger(__name__)
+
+OPERATOR_FIELDS = ["operator", "calls", "time", "population_in", "population_out", "evaluations"]
+STEP_FIELDS = ["step", "time", "agent_steps", "population", "evaluations"]
+
+
+class OperatorProfiler(object):
+    """
+    Per-operator timing of Agent.step and per-step totals of Workplace.step. Agents and the workplace get the
+    profiler injected as "profiler" (optional, so without it nothing is measured); all of them must share one
+    instance, e.g. profiler = lambda: the_profiler in the config.
+
+    Operators are aggregated by class name. Evaluations are read from an "evaluations" counter of the operator, when
+    it has one (e.g. FlowShopEvaluation). Tables are exported when the workplace stops.
+
+    Agents stepped in other processes (e.g. jobshop slaves of a SlavePool) would record into copies of the profiler
+    that are never sent back, so the jobshop MasterAgent rejects a profiler together with processes > 0.
+    """
+
+    def __init__(self, json_file=None, operators_csv_file=None, steps_csv_file=None, profile_steps=None,
+                 profile_file="pyage.pstats"):
+        """
+        :param profile_steps: (first step, number of steps) captured with cProfile, dumped to :param profile_file:
+        """
+        self.json_file = json_file
+        self.operators_csv_file = operators_csv_file
+        self.steps_csv_file = steps_csv_file
+        self.profile_steps = profile_steps
+        self.profile_file = profile_file
+        self.operators = {}
+        self.operators_order = []
+        self.steps = []
+        self.__step = None
+        self.__profile = None
+
+    def process(self, operators, population):
+        """ runs :param operators: on :param population:, as Agent.step does, measuring every operator """
+        if self.__step is not None:
+            self.__step["agent_steps"] += 1
+            self.__step["population"] += len(population)
+        for operator in operators:
+            population_in = len(population)
+            evaluations = getattr(operator, "evaluations", None)
+            start = time.time()
+            operator.process(population)
+            elapsed = time.time() - start
+            record = self.__get_record(operator.__class__.__name__)
+            record["calls"] += 1
+            record["time"] += elapsed
+            record["population_in"] += population_in
+            record["population_out"] += len(population)
+            if evaluations is not None:
+                evaluated = operator.evaluations - evaluations
+                record["evaluations"] += evaluated
+                if self.__step is not None:
+                    self.__step["evaluations"] += evaluated
+
+    def step_started(self, step):
+        self.__step = {"step": step, "time": time.time(), "agent_steps": 0, "population": 0, "evaluations": 0}
+        if self.profile_steps is not None and step == self.profile_steps[0]:
+            self.__profile = cProfile.Profile()
+            self.__profile.enable()
+
+    def step_finished(self):
+        if self.__step is None:
+            return
+        self.__step["time"] = time.time() - self.__step["time"]
+        if self.__profile is not None and self.__step["step"] >= sum(self.profile_steps) - 1:
+            self.__stop_profile()
+        self.steps.append(self.__step)
+        self.__step = None
+
+    def stop(self):
+        """ called by Workplace.stop, exports the tables to the configured files """
+        self.step_finished()
+        if self.__profile is not None:
+            self.__stop_profile()
+        if self.json_file:
+            with open(self.json_file, "w") as json_file:
+                json.dump(self.to_dict(), json_file, indent=1)
+        if self.operators_csv_file:
+            self.__write_csv(self.operators_csv_file, OPERATOR_FIELDS, self.get_operators())
+        if self.steps_csv_file:
+            self.__write_csv(self.steps_csv_file, STEP_FIELDS, self.steps)
+        logger.info("%s", self)
+
+    def get_operators(self):
+        """ :return: records of operators, in order of their first call """
+        return [self.operators[name] for name in self.operators_order]
+
+    def to_dict(self):
+        return {"operators": self.get_operators(), "steps": self.steps}
+
+    def get_profile_stats(self):
+        """ :rtype: pstats.Stats of the captured steps """
+        return pstats.Stats(self.profile_file)
+
+    def __get_record(self, name):
+        record = self.operators.get(name)
+        if record is None:
+            record = {"operator": name, "calls": 0, "time": 0.0, "population_in": 0, "population_out": 0,
+                      "evaluations": 0}
+            self.operators[name] = record
+            self.operators_order.append(name)
+        return record
+
+    def __stop_profile(self):
+        self.__profile.disable()
+        self.__profile.dump_stats(self.profile_file)
+        self.__profile = None
+
+    @staticmethod
+    def __write_csv(path, fields, records):
+        with open(path, "wb") as csv_file:
+            writer = csv.DictWriter(csv_file, fields)
+            writer.writerow(dict(zip(fields, fields)))
+            writer.writerows(records)
+
+    def __str__(self):
+        total = sum(record["time"] for record in self.operators.values()) or 1.0
+        lines = ["{0:<30}{1:>10}{2:>12}{3:>8}{4:>14}".format("operator", "calls", "time [s]", "%", "evaluations")]
+        for record in self.get_operators():
+            lines.append("{0:<30}{1:>10}{2:>12.3f}{3:>8.1f}{4:>14}".format(
+                record["operator"], record["calls"], record["time"], 100 * record["time"] / total,
+                record["evaluations"]))
+        return "\n".join(lines)
@@ -1,4 +1,6 @@
-import Pyro4
+from pyage.core.lazy import LazyModule
+
+Pyro4 = LazyModule("Pyro4")
 
 def query_property(workspace_name, agent_address, property):
     workspace = Pyro4.Proxy("PYRONAME:" + workspace_name)
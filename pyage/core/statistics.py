@@ -1,11 +1,12 @@
 import logging
 import os
-import urllib2
 import time
 import sys
 
 from pyage.core.inject import InjectOptional, Inject
+from pyage.core.lazy import LazyModule
 
+urllib2 = LazyModule("urllib2")  # only used to post stats
 
 logger = logging.getLogger(__name__)
 
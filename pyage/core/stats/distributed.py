@@ -1,13 +1,15 @@
 import logging
 import os
-import urllib2
-import Pyro4
 import time
 import sys
 from pyage.core.inject import Inject, InjectOptional
+from pyage.core.lazy import LazyModule
 from pyage.core.statistics import Statistics
 from pyage.core.workplace import WORKPLACE
 
+Pyro4 = LazyModule("Pyro4")
+urllib2 = LazyModule("urllib2")
+
 logger = logging.getLogger(__name__)
 
 
@@ -1,8 +1,10 @@
 import logging
-import Pyro4
+from pyage.core.lazy import LazyModule
 from pyage.core.inject import Inject
 from pyage.core.workplace import WORKPLACE
 
+Pyro4 = LazyModule("Pyro4")
+
 class StopCondition(object):
     def should_stop(self, workplace):
         raise NotImplementedError()
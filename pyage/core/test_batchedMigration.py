@@ -0,0 +1,136 @@
+import signal
+import threading
+from unittest import TestCase, skipIf
+try:
+    import Pyro4
+    import Pyro4.naming
+except ImportError:
+    Pyro4 = None
+from pyage.core import inject
+from pyage.core.address import SequenceAddressProvider
+from pyage.core.agent.agent import AGENT
+from pyage.core.directory import NameServerDirectory
+from pyage.core.migration import BatchedPyro4Migration
+from pyage.core.workplace import Workplace
+
+
+class Migrant(object):
+    def __init__(self, address):
+        self.address = address
+        self.parent = None
+
+    def get_address(self):
+        return self.address
+
+
+class LocalAggregate(object):
+    def __init__(self, address, agents=()):
+        self.address = address
+        self.agents = {}
+        self.batches = []
+        for agent in agents:
+            self.add_agent(agent)
+
+    def get_address(self):
+        return self.address
+
+    def get_agents(self):
+        return self.agents.values()
+
+    def add_agent(self, agent):
+        agent.parent = self
+        self.agents[agent.address] = agent
+
+    def add_agents(self, agents):
+        self.batches.append([agent.address for agent in agents])
+        for agent in agents:
+            self.add_agent(agent)
+
+    def remove_agent(self, agent):
+        agent = self.agents.pop(agent.address)
+        agent.parent = None
+        return agent
+
+
+@skipIf(Pyro4 is None, "Pyro4 is not installed")
+class TestBatchedPyro4Migration(TestCase):
+    def setUp(self):
+        self.config = Pyro4.config.REQUIRE_EXPOSE, Pyro4.config.SERIALIZER, Pyro4.config.SERIALIZERS_ACCEPTED
+        Pyro4.config.REQUIRE_EXPOSE = False
+        Pyro4.config.SERIALIZER = "pickle"
+        Pyro4.config.SERIALIZERS_ACCEPTED = set(["pickle"])
+        ns_uri, self.ns_daemon, _ = Pyro4.naming.startNS("127.0.0.1", 0)
+        self.daemon = Pyro4.Daemon("127.0.0.1")
+        for daemon in self.ns_daemon, self.daemon:
+            thread = threading.Thread(target=daemon.requestLoop)
+            thread.daemon = True
+            thread.start()
+        self.local = LocalAggregate("local", [Migrant("a%d" % i) for i in range(10)])
+        self.remote = LocalAggregate("remote")
+        ns = Pyro4.locateNS("127.0.0.1", ns_uri.port)
+        ns.register(AGENT + ".local", self.daemon.register(self.local))
+        ns.register(AGENT + ".remote", self.daemon.register(self.remote))
+        ns._pyroRelease()
+        self.directory = NameServerDirectory("127.0.0.1", ns_uri.port, ttl=60)
+        self.resolve_attr = inject.resolve_attr
+        inject.resolve_attr = inject.CachingResolver({"ns_hostname": lambda: "127.0.0.1"})
+
+    def tearDown(self):
+        inject.resolve_attr = self.resolve_attr
+        self.directory.close()
+        self.daemon.shutdown()
+        self.ns_daemon.shutdown()
+        Pyro4.config.REQUIRE_EXPOSE, Pyro4.config.SERIALIZER, Pyro4.config.SERIALIZERS_ACCEPTED = self.config
+
+    def test_sends_migrants_to_other_aggregate(self):
+        migration = BatchedPyro4Migration(probability=1, directory=self.directory)
+        for agent in self.local.get_agents()[:5]:
+            self.assertTrue(migration.migrate(agent))
+        migration.flush()
+        self.assertEqual(5, len(self.local.get_agents()))
+        self.assertEqual(5, len(self.remote.get_agents()))
+        self.assertEqual(5, migration.sent)
+        self.assertTrue(migration.batches <= 5)
+        self.assertEqual(1, self.directory.ns_lookups)
+
+    def test_returns_undelivered_migrants(self):
+        migration = BatchedPyro4Migration(probability=1, directory=self.directory)
+        self.daemon.unregister(self.remote)
+        agent = self.local.get_agents()[0]
+        self.assertTrue(migration.migrate(agent))
+        migration.flush()
+        self.assertEqual(10, len(self.local.get_agents()))
+        self.assertTrue(agent.address in self.local.agents)
+        self.assertEqual(0, migration.sent)
+
+    def test_doesnt_migrate_without_other_aggregates(self):
+        lonely = NameServerDirectory("127.0.0.1", self.directory.ns_port)
+        migration = BatchedPyro4Migration(probability=1, directory=lonely)
+        ns = Pyro4.locateNS("127.0.0.1", self.directory.ns_port)
+        ns.remove(AGENT + ".remote")
+        ns._pyroRelease()
+        self.assertFalse(migration.migrate(self.local.get_agents()[0]))
+        self.assertEqual(10, len(self.local.get_agents()))
+
+    def test_stop_sends_queued_migrants_and_ends_sender(self):
+        migration = BatchedPyro4Migration(probability=1, directory=self.directory)
+        for agent in self.local.get_agents()[:3]:
+            migration.migrate(agent)
+        migration.stop()
+        self.assertEqual(3, len(self.remote.get_agents()))
+        self.assertFalse(migration._BatchedPyro4Migration__sender.is_alive())
+
+    def test_workplace_stops_shared_migration(self):
+        migration = BatchedPyro4Migration(probability=1, directory=self.directory)
+        inject.resolve_attr = inject.CachingResolver({"ns_hostname": lambda: "127.0.0.1", "agents": lambda: {},
+                                                     "address_provider": SequenceAddressProvider,
+                                                     "stop_condition": lambda: None,
+                                                     "migration": lambda: migration})
+        sigint_handler = signal.getsignal(signal.SIGINT)
+        try:
+            workplace = Workplace()
+        finally:
+            signal.signal(signal.SIGINT, sigint_handler)
+        self.assertIs(migration, workplace.migration)
+        workplace.stop()
+        self.assertFalse(migration._BatchedPyro4Migration__sender.is_alive())
@@ -0,0 +1,132 @@
+from unittest import TestCase
+from pyage.core import inject
+from pyage.core.inject import CachingResolver, Inject, InjectOptional, InjectWithDefault
+
+
+class Injected(object):
+    def __init__(self, address=None):
+        self.address = address
+
+
+class Config(object):
+    """ stands for a config module """
+    size = staticmethod(lambda: 10)
+    island__size = staticmethod(lambda: 20)
+    name = staticmethod(lambda: "plain")
+
+
+class Plain(Injected):
+    @Inject("size", "name:label")
+    def configure(self):
+        pass
+
+
+class Optional(Injected):
+    @InjectOptional("size", "name:label", "missing")
+    def configure(self):
+        pass
+
+
+class WithDefault(Injected):
+    @InjectWithDefault(("size", 0), ("name:label", None), ("missing", "default"))
+    def configure(self):
+        pass
+
+
+class TestCachingResolver(TestCase):
+    def setUp(self):
+        self.resolve_attr = inject.resolve_attr
+        self.read_config = Inject.read_config
+        self.config = inject.config
+        self.read_configs = []
+
+        def read_config(config):
+            self.read_configs.append(config)
+            return Config
+
+        Inject.read_config = staticmethod(read_config)
+        inject._read_config = (None, None)
+
+    def tearDown(self):
+        inject.resolve_attr = self.resolve_attr
+        Inject.read_config = self.read_config
+        inject.config = self.config
+        inject._read_config = (None, None)
+
+    def test_from_params_splits_prefixed_names(self):
+        size, island_size, island_name = lambda: 10, lambda: 20, lambda: "island"
+        resolver = CachingResolver.from_params({"size": size, "island__size": island_size,
+                                                "island__name": island_name})
+        self.assertEqual({"size": size}, resolver.params)
+        self.assertEqual({"island": {"size": island_size, "name": island_name}}, resolver.prefix_overrides)
+
+    def test_prefix_overrides_take_precedence(self):
+        resolver = CachingResolver.from_params({"size": lambda: 10, "name": lambda: "plain",
+                                                "island__size": lambda: 20})
+        self.assertEqual(20, resolver(None, "size", [Injected("island.1")]))
+        self.assertEqual("plain", resolver(None, "name", [Injected("island.1")]))
+        self.assertEqual(10, resolver(None, "size", [Injected("other.1")]))
+        self.assertEqual(10, resolver(None, "size", [Injected()]))
+
+    def test_caches_providers_per_listed_prefix(self):
+        resolver = CachingResolver.from_params({"size": lambda: 10, "island__size": lambda: 20})
+        for address in (None, "other.1", "another.2", None):  # unlisted prefixes share the entry of no address
+            self.assertEqual(10, resolver(None, "size", [Injected(address)]))
+        self.assertEqual(1, resolver.cache_misses)
+        for address in ("island.1", "island.2"):
+            self.assertEqual(20, resolver(None, "size", [Injected(address)]))
+        self.assertEqual(2, resolver.cache_misses)
+
+    def test_calls_cached_providers_on_every_injection(self):
+        counter = iter(xrange(3))
+        resolver = CachingResolver({"size": lambda: next(counter)})
+        self.assertEqual([0, 1, 2], [resolver(None, "size", [Injected()]) for _ in xrange(3)])
+        self.assertEqual(1, resolver.cache_misses)
+
+    def test_missing_provider_raises_key_error(self):
+        resolver = CachingResolver.from_params({"island__size": lambda: 20})
+        self.assertRaises(KeyError, resolver, None, "size", [Injected("other.1")])
+        self.assertRaises(KeyError, resolver, None, "name", [Injected("island.1")])
+
+    def test_measures_lookups_only_when_asked(self):
+        resolver = CachingResolver({"size": lambda: 10})
+        resolver(None, "size", [Injected()])
+        self.assertEqual((0, 0.0), resolver.get_overhead())
+        resolver = CachingResolver({"size": lambda: 10}, measure=True)
+        for _ in xrange(3):
+            resolver(None, "size", [Injected()])
+        lookups, lookup_time = resolver.get_overhead()
+        self.assertEqual(3, lookups)
+        self.assertGreaterEqual(lookup_time, 0.0)
+
+    def test_resolve_attr_reads_config(self):
+        self.assertEqual(20, inject.resolve_attr(Config, "size", [Injected("island.1")]))
+        self.assertEqual(10, inject.resolve_attr(Config, "size", [Injected("other.1")]))
+        self.assertEqual(10, inject.resolve_attr(Config, "size", [Injected()]))
+        self.assertRaises(AttributeError, inject.resolve_attr, Config, "missing", [Injected()])
+
+    def test_reads_config_once_per_value(self):
+        inject.config = "conf"
+        self.assertIs(Config, inject.read_config_once())
+        self.assertIs(Config, inject.read_config_once())
+        self.assertEqual(["conf"], self.read_configs)
+        inject.config = "other_conf"
+        inject.read_config_once()
+        self.assertEqual(["conf", "other_conf"], self.read_configs)
+
+    def test_decorators_resolve_the_same_with_both_resolvers(self):
+        resolver = CachingResolver.from_params({"size": Config.size, "island__size": Config.island__size,
+                                                "name": Config.name})
+        inject.config = "conf"
+        for address in (None, "island.1", "other.1"):
+            values = []
+            for resolve_attr in (self.resolve_attr, resolver):
+                inject.resolve_attr = resolve_attr
+                plain, optional, with_default = Plain(address), Optional(address), WithDefault(address)
+                for injected in (plain, optional, with_default):
+                    injected.configure()  # once the address is assigned
+                self.assertFalse(hasattr(optional, "missing"))
+                self.assertEqual("default", with_default.missing)
+                values.append([(injected.size, injected.label) for injected in (plain, optional, with_default)])
+            self.assertEqual(values[0], values[1])
+            self.assertEqual([(20 if address == "island.1" else 10, "plain")] * 3, values[0])
@@ -0,0 +1,33 @@
+import sys
+from unittest import TestCase
+from pyage.core.lazy import LazyModule, optional
+
+
+class TestLazyModule(TestCase):
+    def setUp(self):
+        self.loaded = sys.modules.pop("colorsys", None)
+
+    def tearDown(self):
+        if self.loaded is not None:
+            sys.modules["colorsys"] = self.loaded
+
+    def test_imports_on_first_attribute_access(self):
+        colorsys = LazyModule("colorsys")
+        self.assertFalse(colorsys.is_loaded())
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual((0.0, 0.0, 1.0), colorsys.rgb_to_hsv(1, 1, 1))
+        self.assertTrue(colorsys.is_loaded())
+        self.assertIn("colorsys", sys.modules)
+
+    def test_optional_looks_modules_up_without_importing(self):
+        self.assertIsInstance(optional("colorsys"), LazyModule)
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertIsNone(optional("no_such_module_in_pyage"))
+
+    def test_sets_attributes_of_module(self):
+        colorsys = LazyModule("colorsys")
+        colorsys.ONE_THIRD = 0.5
+        try:
+            self.assertEqual(0.5, sys.modules["colorsys"].ONE_THIRD)
+        finally:
+            colorsys.ONE_THIRD = 1.0 / 3.0
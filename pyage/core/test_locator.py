@@ -0,0 +1,103 @@
+from unittest import TestCase
+from pyage.core.agent.index import AgentIndex
+from pyage.core.locator import GridLocator, RandomLocator, RowLocator
+
+
+class Member(object):
+    def __init__(self, name):
+        self.name = name
+        self.parent = None
+
+    def __repr__(self):
+        return self.name
+
+
+class IndexedParent(object):
+    """ parent keeping its agents in an AgentIndex, as AggregateAgent does """
+
+    def __init__(self, agents):
+        self.agent_index = AgentIndex()
+        for agent in agents:
+            self.add_agent(agent)
+
+    def add_agent(self, agent):
+        agent.parent = self
+        self.agent_index.add(agent)
+
+    def remove_agent(self, agent):
+        self.agent_index.remove(agent)
+
+    def get_agents(self):
+        raise AssertionError("indexed parents are not listed by locators")
+
+
+class PlainParent(object):
+    """ parent without an AgentIndex, e.g. a remote one """
+
+    def __init__(self, agents):
+        self.agents = list(agents)
+        for agent in agents:
+            agent.parent = self
+
+    def get_agents(self):
+        return self.agents
+
+
+def neighbours(locator, agent, draws=300):
+    return set(locator.get_neighbour(agent) for _ in xrange(draws))
+
+
+class TestLocators(TestCase):
+    def setUp(self):
+        self.members = [Member("m%d" % number) for number in xrange(9)]
+
+    def test_random_locator_draws_from_other_agents(self):
+        IndexedParent(self.members)
+        self.assertEqual(set(self.members[1:]), neighbours(RandomLocator(), self.members[0]))
+
+    def test_row_locator_keeps_neighbours_when_others_die_and_are_born(self):
+        parent = IndexedParent(self.members)
+        m = self.members
+        self.assertEqual({m[2], m[3], m[5], m[6]}, neighbours(RowLocator(), m[4]))
+        parent.remove_agent(m[0])
+        parent.remove_agent(m[3])
+        self.assertEqual({m[2], m[5], m[6]}, neighbours(RowLocator(), m[4]))
+        newborn = Member("newborn")
+        parent.add_agent(newborn)  # it fills one of the holes
+        self.assertIn(parent.agent_index.slot(newborn), (0, 3))
+        self.assertEqual(4, parent.agent_index.slot(m[4]))
+        expected = {m[2], m[5], m[6]} | ({newborn} if parent.agent_index.slot(newborn) == 3 else set())
+        self.assertEqual(expected, neighbours(RowLocator(), m[4]))
+
+    def test_grid_locator_keeps_neighbours_when_others_die_and_are_born(self):
+        parent = IndexedParent(self.members)
+        m = self.members
+        self.assertEqual({m[1], m[3], m[5], m[7]}, neighbours(GridLocator(), m[4]))
+        parent.remove_agent(m[1])
+        self.assertEqual({m[3], m[5], m[7]}, neighbours(GridLocator(), m[4]))
+        newborn = Member("newborn")
+        parent.add_agent(newborn)
+        self.assertEqual(1, parent.agent_index.slot(newborn))
+        self.assertEqual({newborn, m[3], m[5], m[7]}, neighbours(GridLocator(), m[4]))
+
+    def test_indexed_locators_fall_back_to_any_agent_when_topology_neighbours_are_holes(self):
+        parent = IndexedParent(self.members[:6])
+        m = self.members
+        for agent in m[1:5]:
+            parent.remove_agent(agent)
+        self.assertEqual({m[5]}, neighbours(RowLocator(), m[0]))
+        self.assertEqual({m[0]}, neighbours(GridLocator(), m[5]))
+        parent.remove_agent(m[5])
+        self.assertEqual({None}, neighbours(RandomLocator(), m[0], 5))
+        self.assertEqual({None}, neighbours(GridLocator(), m[0], 5))
+
+    def test_locators_list_siblings_of_parents_without_index(self):
+        PlainParent(self.members)
+        m = self.members
+        self.assertEqual(set(m[1:]), neighbours(RandomLocator(), m[0]))
+        self.assertEqual({m[2], m[3], m[5], m[6]}, neighbours(RowLocator(), m[4]))
+        self.assertEqual({m[1], m[3], m[5], m[7]}, neighbours(GridLocator(), m[4]))
+        PlainParent(m[:1])
+        self.assertEqual({None}, neighbours(RandomLocator(), m[0], 5))
+        self.assertEqual({None}, neighbours(RowLocator(), m[0], 5))
+        self.assertEqual({None}, neighbours(GridLocator(), m[0], 5))
@@ -0,0 +1,76 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from pyage.core.profiling import OperatorProfiler
+
+
+class Doubling(object):
+    def process(self, population):
+        population.extend(list(population))
+
+
+class Halving(object):
+    def __init__(self):
+        self.evaluations = 0
+
+    def process(self, population):
+        self.evaluations += len(population)
+        population[:] = population[:len(population) // 2]
+
+
+class TestOperatorProfiler(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.operators = [Doubling(), Halving()]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_counts_calls_populations_and_evaluations(self):
+        profiler = OperatorProfiler()
+        for step in xrange(1, 4):
+            profiler.step_started(step)
+            for _ in xrange(2):
+                profiler.process(self.operators, [1, 2, 3])
+            profiler.step_finished()
+        doubling, halving = profiler.get_operators()
+        self.assertEqual(("Doubling", 6, 18, 36, 0), (doubling["operator"], doubling["calls"],
+                                                      doubling["population_in"], doubling["population_out"],
+                                                      doubling["evaluations"]))
+        self.assertEqual(("Halving", 6, 36, 18, 36), (halving["operator"], halving["calls"], halving["population_in"],
+                                                      halving["population_out"], halving["evaluations"]))
+        self.assertEqual([1, 2, 3], [step["step"] for step in profiler.steps])
+        self.assertEqual((2, 6, 12), (profiler.steps[0]["agent_steps"], profiler.steps[0]["population"],
+                                      profiler.steps[0]["evaluations"]))
+
+    def test_exports_json_and_csv_on_stop(self):
+        json_file = os.path.join(self.directory, "profile.json")
+        operators_csv_file = os.path.join(self.directory, "operators.csv")
+        steps_csv_file = os.path.join(self.directory, "steps.csv")
+        profiler = OperatorProfiler(json_file, operators_csv_file, steps_csv_file)
+        profiler.step_started(1)
+        profiler.process(self.operators, [1])
+        profiler.stop()
+        with open(json_file) as exported:
+            self.assertEqual(["Doubling", "Halving"], [record["operator"] for record in json.load(exported)["operators"]])
+        with open(operators_csv_file) as exported:
+            rows = list(csv.DictReader(exported))
+        self.assertEqual(["Doubling", "Halving"], [row["operator"] for row in rows])
+        self.assertEqual("2", rows[1]["evaluations"])
+        with open(steps_csv_file) as exported:
+            self.assertEqual(["1"], [row["step"] for row in csv.DictReader(exported)])
+
+    def test_captures_profile_of_steps_window(self):
+        profile_file = os.path.join(self.directory, "steps.pstats")
+        profiler = OperatorProfiler(profile_steps=(2, 2), profile_file=profile_file)
+        for step in xrange(1, 5):
+            profiler.step_started(step)
+            profiler.process(self.operators, [1, 2])
+            if step == 3:
+                self.assertFalse(os.path.exists(profile_file))
+            profiler.step_finished()
+        self.assertTrue(os.path.exists(profile_file))
+        self.assertTrue(profiler.get_profile_stats().total_calls > 0)
@@ -0,0 +1,189 @@
+from unittest import TestCase, skipIf
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from pyage.core import inject
+from pyage.core.address import SequenceAddressProvider
+from pyage.core.emas import EmasAgent, EmasService, VectorizedEmasAggregate
+from pyage.solutions.evolution.crossover import SinglePointCrossover
+from pyage.solutions.evolution.evaluation import FloatRastriginEvaluation
+from pyage.solutions.evolution.genotype import FloatGenotype
+from pyage.solutions.evolution.mutation import UniformFloatMutation
+
+GENES = [[0.0, 0.5, -1.0], [1.5, -0.25, 2.0], [0.1, 0.2, 0.3], [-3.0, 4.0, 0.75]]
+
+
+class Individual(object):
+    def __init__(self, energy, parent=None):
+        self.energy = energy
+        self.parent = parent
+
+    def get_energy(self):
+        return self.energy
+
+
+class Population(object):
+    def __init__(self, agents):
+        self.agents = agents
+
+    def get_agents(self):
+        return self.agents
+
+
+class PerGenotypeEvaluation(object):
+    """ FloatRastriginEvaluation without its batched counterpart """
+
+    def __init__(self):
+        self.evaluation = FloatRastriginEvaluation()
+
+    def process(self, population):
+        self.evaluation.process(population)
+
+
+class PerGenotypeMutation(object):
+    """ UniformFloatMutation without its batched counterpart nor a probability """
+
+    def __init__(self):
+        self.mutation = UniformFloatMutation()
+
+    def mutate(self, genotype):
+        self.mutation.mutate(genotype)
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestVectorizedEmas(TestCase):
+    def setUp(self):
+        self.resolve_attr = inject.resolve_attr
+        self.params = {"address_provider": SequenceAddressProvider, "emas": EmasService,
+                       "minimal_energy": lambda: 0, "reproduction_minimum": lambda: 1000,
+                       "migration_minimum": lambda: 1000, "newborn_energy": lambda: 80,
+                       "transferred_energy": lambda: 0, "migration_probability": lambda: 0.0,
+                       "evaluation": FloatRastriginEvaluation, "crossover": SinglePointCrossover,
+                       "mutation": lambda: UniformFloatMutation(probability=0), "locator": lambda: None,
+                       "migration": lambda: None}
+        inject.resolve_attr = inject.CachingResolver(self.params)
+
+    def tearDown(self):
+        inject.resolve_attr = self.resolve_attr
+
+    def configure(self, **params):
+        self.params.update((name, lambda value=value: value) for name, value in params.items())
+        inject.resolve_attr = inject.CachingResolver(self.params)  # it caches providers
+
+    def aggregate(self, genes, energies):
+        self.configure(emas_population=(genes, energies))
+        return VectorizedEmasAggregate()
+
+    def test_batched_rules_agree_with_per_agent_rules(self):
+        self.configure(minimal_energy=5, reproduction_minimum=20, migration_minimum=30)
+        emas = EmasService()
+        energies = [0, 5, 6, 20, 21, 30, 31, 100]
+        partners = [100, 21, 21, 21, 20, 31, 5, 31]
+        for population_size in (10, 11):
+            population = Population([None] * population_size)
+            individuals = [Individual(energy, population) for energy in energies]
+            self.assertEqual([emas.should_die(individual) for individual in individuals],
+                             emas.dying(numpy.array(energies)).tolist())
+            self.assertEqual([emas.should_reproduce(individual, Individual(partner))
+                              for individual, partner in zip(individuals, partners)],
+                             emas.reproducing(numpy.array(energies), numpy.array(partners)).tolist())
+            self.assertEqual([emas.can_migrate(individual) for individual in individuals],
+                             emas.migrating(numpy.array(energies), population_size).tolist())
+
+    def test_evaluate_array_agrees_with_process(self):
+        evaluation = FloatRastriginEvaluation()
+        genotypes = [FloatGenotype(list(genes)) for genes in GENES]
+        evaluation.process(genotypes)
+        numpy.testing.assert_allclose([genotype.fitness for genotype in genotypes],
+                                      evaluation.evaluate_array(numpy.array(GENES)))
+
+    def test_cross_arrays_gives_single_point_children(self):
+        genes1 = numpy.array(GENES)
+        genes2 = -genes1 - 10
+        children = SinglePointCrossover().cross_arrays(genes1, genes2)
+        self.assertEqual(genes1.shape, children.shape)
+        for parent1, parent2, child in zip(genes1.tolist(), genes2.tolist(), children.tolist()):
+            self.assertIn(child, [parent1[:point] + parent2[point:] for point in xrange(1, len(parent1) + 1)])
+
+    def test_mutate_array_changes_one_gene_of_every_row_within_radius(self):
+        genes = numpy.array(GENES)
+        UniformFloatMutation(probability=0, radius=0.5).mutate_array(genes)  # as mutate, it ignores probability
+        changed = genes != numpy.array(GENES)
+        self.assertEqual([1] * len(GENES), changed.sum(axis=1).tolist())
+        self.assertTrue((abs(genes - numpy.array(GENES)) <= 0.5).all())
+
+    def test_evaluates_population_with_and_without_evaluate_array(self):
+        batched = self.aggregate(GENES, [10] * len(GENES))
+        self.configure(evaluation=PerGenotypeEvaluation())
+        per_genotype = self.aggregate(GENES, [10] * len(GENES))
+        numpy.testing.assert_allclose(batched.fitnesses, per_genotype.fitnesses)
+        self.assertEqual(batched.fitnesses.max(), batched.get_fitness())
+        self.assertEqual(GENES[int(batched.fitnesses.argmax())], batched.get_best_genotype().genes)
+
+    def test_dead_share_their_energy_among_survivors(self):
+        self.configure(minimal_energy=5)
+        aggregate = self.aggregate(GENES, [3, 10, 20, 31])
+        aggregate.step()
+        self.assertEqual([11, 21, 32], sorted(aggregate.energies.tolist()))
+        self.assertEqual(3, len(aggregate.genes))
+        self.assertEqual(3, len(aggregate.fitnesses))
+
+    def test_meeting_transfers_energy_as_emas_agents_do(self):
+        self.configure(transferred_energy=4, minimal_energy=-1)
+        aggregate = self.aggregate(GENES[:2], [10, 6])
+        agents = [EmasAgent(FloatGenotype(list(genes)), energy) for genes, energy in zip(GENES[:2], [10, 6])]
+        aggregate.step()  # two rounds, in each of them the only pair meets
+        agents[0].meet(agents[1])
+        agents[1].meet(agents[0])
+        self.assertEqual([agent.energy for agent in agents], aggregate.energies.tolist())
+
+    def test_reproduction_takes_newborn_energy_from_parents_as_emas_service_does(self):
+        self.configure(reproduction_minimum=60, newborn_energy=80, minimal_energy=-1,
+                       mutation=UniformFloatMutation(radius=0))  # children keep genes of their parents
+        aggregate = self.aggregate([GENES[0], GENES[0]], [100, 100])
+        children = []
+        parents = [EmasAgent(FloatGenotype(list(GENES[0])), 100) for _ in xrange(2)]
+        for parent in parents:
+            parent.parent = Population(children)
+            parent.parent.add_agent = children.append
+        EmasService().reproduce(parents[0], parents[1])
+        aggregate.step()  # parents are left with 60 energy, no pair can reproduce in the second round
+        self.assertEqual(sorted([parent.energy for parent in parents] + [child.energy for child in children]),
+                         sorted(aggregate.energies.tolist()))
+        self.assertEqual([GENES[0]] * 3, aggregate.genes.tolist())
+        numpy.testing.assert_allclose(aggregate.fitnesses, [children[0].get_fitness()] * 3)
+
+    def test_every_child_is_mutated_as_emas_service_does(self):
+        for mutation in (UniformFloatMutation(probability=0), PerGenotypeMutation()):
+            self.configure(reproduction_minimum=60, newborn_energy=80, minimal_energy=-1, mutation=mutation)
+            aggregate = self.aggregate([GENES[0], GENES[0]], [100, 100])
+            aggregate.step()
+            self.assertEqual(3, aggregate.size())
+            self.assertEqual([0, 0, 1], sorted((aggregate.genes != GENES[0]).sum(axis=1).tolist()))
+
+    def test_migrants_move_to_sibling_aggregates(self):
+        self.configure(migration_minimum=10, migration_probability=1.0, minimal_energy=-1)
+        genes = [GENES[index % len(GENES)] for index in xrange(12)]
+        source = self.aggregate(genes, [20] * 11 + [5])
+        target = self.aggregate(genes, [20] * 12)
+        source.parent = Population([source, target])
+        source.step()
+        self.assertEqual(10, source.size())  # EmasAgents can't migrate from an aggregate of 10 either
+        self.assertIn(5, source.energies.tolist())  # it can't migrate
+        self.assertEqual(14, target.size())
+        self.assertEqual(20 * 14, target.energies.sum())
+        self.assertEqual(len(target.genes), len(target.fitnesses))
+        source.step()
+        self.assertEqual(10, source.size())
+
+    def test_step_conserves_energy(self):
+        self.configure(reproduction_minimum=15, newborn_energy=10, transferred_energy=3, minimal_energy=2,
+                       mutation=UniformFloatMutation(probability=1))
+        aggregate = self.aggregate(GENES * 5, range(1, 21))
+        for _ in xrange(10):
+            aggregate.step()
+            self.assertAlmostEqual(sum(range(1, 21)), aggregate.energies.sum())
+            numpy.testing.assert_allclose(FloatRastriginEvaluation().evaluate_array(aggregate.genes),
+                                          aggregate.fitnesses)
+
@@ -2,27 +2,36 @@ import logging
 from pyage.core.address import Addressable
 from pyage.core.inject import Inject, InjectOptional
 from pyage.core.agent.agent import AGENT
+from pyage.core.agent.index import AgentIndex
+from pyage.core.lazy import optional
 import signal
+import sys
 
 logger = logging.getLogger(__name__)
 
-try:
-    from Pyro4 import locateNS
-except:
+Pyro4 = optional("Pyro4")
+if Pyro4 is None:
     print "Pyro4 not installed, running in local mode only"
 
 WORKPLACE = "workplace"
 
 
 class Workplace(Addressable):
+    profiler = None
+    migration = None
+
     @Inject("agents:_Workplace__agents", "stop_condition")
     @InjectOptional("ns_hostname", "daemon")
+    @InjectOptional("profiler")
+    @InjectOptional("migration")
     def __init__(self):
         super(Workplace, self).__init__()
         for agent in self.__agents.values():
             agent.parent = self
+        self.agent_index = AgentIndex(self.__agents.values())
         self.steps = 0
         self.stopped = False
+        self.error = None  # sys.exc_info() of the exception which stopped the workplace
         self.best_known_fitness = -float("inf")
 
         def signal_handler(signal, frame):
@@ -39,6 +48,10 @@ class Workplace(Addressable):
 
     def stop(self):
         self.stopped = True
+        if self.profiler is not None:
+            self.profiler.stop()
+        if self.migration is not None and hasattr(self.migration, "stop"):
+            self.migration.stop()
         # self.stats.summarize(self.__agents.values())
         try:
             for a in self.__agents.values():
@@ -50,12 +63,17 @@ class Workplace(Addressable):
         try:
             self.steps += 1
             logger.info("=========STEP %s=============", self.steps)
+            if self.profiler is not None:
+                self.profiler.step_started(self.steps)
             for agent in self.__agents.values():
                 agent.step()
+            if self.profiler is not None:
+                self.profiler.step_finished()
             # self.stats.update(self.steps, self.__agents.values())
             if self.stop_condition.should_stop(self):
                 self.stop()
         except:
+            self.error = sys.exc_info()
             logger.warning("Caught exception, stopping")
             logging.exception("exception in step %s" % self.steps)
             self.stop()
@@ -76,6 +94,7 @@ class Workplace(Addressable):
     def remove_agent(self, address):
         agent = self.__agents[address]
         del self.__agents[address]
+        self.agent_index.remove(agent)
         agent.workspace = None
         return agent
 
@@ -83,7 +102,7 @@ class Workplace(Addressable):
         if hasattr(self, "ns_hostname") and hasattr(self, "daemon"):
             uri = self.daemon.register(self)
             try:
-                ns = locateNS(self.ns_hostname)
+                ns = Pyro4.locateNS(self.ns_hostname)
                 ns.register(WORKPLACE + '.' + self.address, uri)
                 logger.debug(ns.list())
                 self.publish_agents()
@@ -94,7 +113,7 @@ class Workplace(Addressable):
         for agent in self.__agents.values():
             try:
                 uri = self.daemon.register(agent)
-                ns = locateNS(self.ns_hostname)
+                ns = Pyro4.locateNS(self.ns_hostname)
                 ns.register('%s.%s' % (AGENT, agent.address), uri)
                 logger.debug(ns.list())
             except:
@@ -103,7 +122,7 @@ class Workplace(Addressable):
     def unregister(self):
         try:
             self.unregister_agents()
-            ns = locateNS(self.ns_hostname)
+            ns = Pyro4.locateNS(self.ns_hostname)
             ns.remove(WORKPLACE + '.' + self.address)
             logger.debug(ns.list())
         except:
@@ -111,7 +130,7 @@ class Workplace(Addressable):
 
     def unregister_agents(self):
         try:
-            ns = locateNS(self.ns_hostname)
+            ns = Pyro4.locateNS(self.ns_hostname)
             for agent in self.__agents.values():
                 ns.remove('%s.%s' % (AGENT, agent.address))
             logger.debug(ns.list())
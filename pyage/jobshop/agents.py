@@ -1,13 +1,15 @@
-import copy
 import logging
 import sys
+import time
 
-from flowshop_genetics import FlowShopEvaluation
+from flowshop_genetics import FlowShopEvaluation, adjust_permutation
+from heuristics import carry_over_population
+from islands import accept_immigrants, elite_permutations
 from pyage.core.inject import Inject
 from problem import TimeMatrixConverter
 from problemGenerator import Counter, DistortedProblemGenerator
-from rolling_horizon import JobWindow
 from rolling_horizon import JobBacklog
+from slave_pool import SlavePool
 from stats import GanttStats
 
 logger = logging.getLogger(__name__)
@@ -19,7 +21,24 @@ class MasterAgent(object):
     @Inject("timeKeeper:_MasterAgent__timeKeeper")
     @Inject("stop_condition:_MasterAgent__stop_condition")
     @Inject("problem_provider:_MasterAgent__problem_provider")
-    def __init__(self, time_matrix, window_time, distortion_factor=0.1, steps_for_initial_window=100):
+    def __init__(self, time_matrix, window_time, distortion_factor=0.1, steps_for_initial_window=100, processes=0,
+                 steps_per_round=1, render_gantt=True, islands=None, warm_start=False, window_budget=None):
+        """
+        :param processes: when positive, slaves are stepped in that many worker processes (see SlavePool); slaves
+                          with a profiler are rejected then, as it would only see their steps in the workers
+        :param steps_per_round: generations each worker runs per round-trip with the master, slaves catch up
+                                anyway when a window ends
+        :param render_gantt: when False, history is still recorded but no Gantt charts are drawn
+        :param islands: optional islands.IslandMigration exchanging elites between slaves
+        :param warm_start: carry slave populations over to the next predicted window instead of reinitializing them
+        :param window_budget: AnytimeBudget, or function(window number) -> AnytimeBudget; when given, slaves keep
+                              evolving on the actual window for that budget before its schedule is taken (best
+                              combined with warm_start, so the predicted populations are refined), in process only
+        """
+        if window_budget is not None and processes > 0:
+            raise ValueError("window_budget requires slaves stepped in process")
+        if processes > 0 and any(getattr(slave, "profiler", None) is not None for slave in self.__slaves.values()):
+            raise ValueError("profiler requires slaves stepped in process")  # workers' records never reach it
         self.__window_time = window_time
         self.__steps_for_initial_window = steps_for_initial_window
         self.__summary_makespan = 0
@@ -29,39 +48,47 @@ class MasterAgent(object):
         self.__problem_generator = DistortedProblemGenerator(distortion_factor)
         self.__converter = TimeMatrixConverter(Counter())
         self.__initial_problem = self.__converter.matrix_to_problem(time_matrix)
-        self.__tasks_per_job = len(self.__initial_problem.get_jobs_list()[0].get_tasks_list())
+        self.__tasks_per_job = self.__initial_problem.to_compact().tasks_count(0)
         self.__backlog.add_problem(self.__initial_problem)
         self.__history = []
-        self.__stats = GanttStats()
+        self.__stats = GanttStats() if render_gantt else None
+        self.__steps_per_round = steps_per_round
+        self.__pending_steps = 0
+        self.__islands = islands
+        self.__warm_start = warm_start
+        self.__window_budget = window_budget
+        self.__traces = []
+        self.__slave_steps = 0
         self.__solve_initial_window()
+        self.__slave_pool = SlavePool(self.__slaves, processes, GeneticsHelper.reset_slave) if processes > 0 else None
         self.__assign_predicted_windows_to_slaves()
 
 
     def __solve_initial_window(self):
         initial_job_window = self.next_job_window()
         logger.info("About to solve initial job window %s", initial_job_window)
-        makespan, result_matrix = GeneticsHelper(initial_job_window).solve_with(self.__slaves.values()[0],
-                                                                                self.__steps_for_initial_window)
+        genetics_helper = GeneticsHelper(initial_job_window)
+        makespan, result_matrix = genetics_helper.solve_with(self.__slaves.values()[0], self.__steps_for_initial_window)
         logger.info("Initial window makespan=%s, result_matrix=%s", str(makespan), str(result_matrix))
-        time_matrix = self.__converter.window_to_matrix(initial_job_window)
+        time_matrix = genetics_helper.time_matrix
+        self.__manufacture.add_window_schedule(time_matrix, genetics_helper.best_permutation, result_matrix,
+                                               genetics_helper.jids, self.__timeKeeper.get_time())
         for machine_id in xrange(len(result_matrix)):
             for job_id in xrange(len(result_matrix[machine_id])):
                 time = time_matrix[machine_id][job_id]
                 start_time = result_matrix[machine_id][job_id]
                 self.__history.append([machine_id, job_id, start_time, time, 'Tick ' + str(start_time)])
-        self.__stats.summarize(self.get_history())
+        if self.__stats is not None:
+            self.__stats.summarize(self.get_history())
         print self.get_history()
 
     def next_job_window(self):
-        job_window = JobWindow(self.__window_time * (self.__tasks_per_job - 2))
-        while not job_window.is_full() and not self.__backlog.is_empty():
-            job_window.add_job(self.__backlog.pop_top_priority_job())
-        return job_window
+        return self.__backlog.pop_window(self.__window_time * (self.__tasks_per_job - 2))
 
     def step(self):
         self.__timeKeeper.step()
-        for slave in self.__slaves.values():
-            slave.step()
+        self.__manufacture.time_tick(self.__timeKeeper.get_time())
+        self.__step_slaves()
         if self.window_ended():
             self.__accept_new_problem()
             self.__current_window = self.next_job_window()
@@ -78,9 +105,40 @@ class MasterAgent(object):
                 print "{0}\t{1}".format(len(self.__slaves), self.__summary_makespan)
 
 
+    def stop(self):
+        if self.__slave_pool is not None:
+            self.__slave_pool.close()
+
     def window_ended(self):
         return self.__timeKeeper.get_time() % self.__window_time == 0
 
+    def __step_slaves(self):
+        if self.__slave_pool is None:
+            for slave in self.__slaves.values():
+                slave.step()
+            self.__count_slave_steps(1)
+            return
+        self.__pending_steps += 1
+        if self.__pending_steps >= self.__steps_per_round or self.window_ended():
+            self.__slave_pool.step(self.__pending_steps)
+            self.__count_slave_steps(self.__pending_steps)
+            self.__pending_steps = 0
+
+    def __count_slave_steps(self, steps):
+        previous_steps = self.__slave_steps
+        self.__slave_steps += steps
+        if self.__islands is not None and self.__islands.is_due(previous_steps, self.__slave_steps):
+            self.__exchange_elites()
+
+    def __exchange_elites(self):
+        elites = self.__islands.elites
+        if self.__slave_pool is None:
+            emigrants = dict((key, elite_permutations(slave, elites)) for key, slave in self.__slaves.items())
+            for key, permutations in self.__islands.route(emigrants).items():
+                accept_immigrants(self.__slaves[key], permutations)
+        else:
+            self.__slave_pool.immigrate(self.__islands.route(self.__slave_pool.get_elites(elites)))
+
     def __accept_new_problem(self):
         if self.__problem_provider.has_next():
             incoming_problem = self.__problem_provider.provide_next(self.__timeKeeper.get_time())
@@ -89,43 +147,81 @@ class MasterAgent(object):
             self.__backlog.add_problem(incoming_problem)
 
     def __calculate_schedule_for_current_window(self):
-        makespan, result_matrix = GeneticsHelper(self.__current_window).get_best_solution(self.__slaves.values())
+        genetics_helper = GeneticsHelper(self.__current_window)
+        if self.__window_budget is not None:
+            budget = get_window_budget(self.__window_budget, self.__windows_calculated)
+            result = genetics_helper.solve_anytime(self.__slaves.values(), budget, warm_start=True)
+            logger.info("Window solved in %d steps, %d evaluations, %.1fms", result.steps, result.evaluations,
+                        result.elapsed)
+            self.__traces.append(result.trace)
+            makespan, result_matrix = result.makespan, result.result_matrix
+            genetics_helper.best_permutation = result.permutation
+        elif self.__slave_pool is None:
+            makespan, result_matrix = genetics_helper.get_best_solution(self.__slaves.values())
+        else:
+            makespan, result_matrix = genetics_helper.get_best_solution_of(self.__slave_pool.get_best_genotypes())
         self.__summary_makespan += makespan
         self.__windows_calculated += 1
         logger.info("Job window solution found. Makespan=%s, result_matrix=%s", str(makespan), str(result_matrix))
         # print "makespan=" + str(makespan) + " result_matrix=" + str(result_matrix)
-        time_matrix = self.__converter.window_to_matrix(self.__current_window)
+        time_matrix = genetics_helper.time_matrix
+        self.__manufacture.add_window_schedule(time_matrix, genetics_helper.best_permutation, result_matrix,
+                                               genetics_helper.jids, self.__timeKeeper.get_time())
         for machine_id in xrange(len(result_matrix)):
             for job_id in xrange(len(result_matrix[machine_id])):
                 time = time_matrix[machine_id][job_id]
                 start_time = result_matrix[machine_id][job_id]
                 self.__history.append([machine_id, job_id, start_time, time, 'Tick ' + str(self.__timeKeeper.get_time() + start_time)])
-        self.__stats.summarize(self.get_history())
+        if self.__stats is not None:
+            self.__stats.summarize(self.get_history())
         print self.get_history()
-        # TODO: convert result_matrix to solution and add to manufacture as gantt statistics are generated based on manufacture
 
     def __assign_predicted_windows_to_slaves(self):
-        backlog_jobs = copy.copy(self.__backlog._jobs_priority_queue.queue)
-        for slave in self.__slaves.values():
-            self.__assign_predicted_window(slave)
-            self.__backlog._jobs_priority_queue.queue = backlog_jobs
+        if self.__slave_pool is None:
+            for slave in self.__slaves.values():
+                GeneticsHelper(self.__predict_window()).reset(slave, self.__warm_start)
+            return
+        time_matrices = {}
+        jids = {}
+        for key in self.__slave_pool.keys():
+            genetics_helper = GeneticsHelper(self.__predict_window())
+            time_matrices[key] = genetics_helper.time_matrix
+            jids[key] = genetics_helper.jids
+        self.__slave_pool.reset(time_matrices, jids if self.__warm_start else None)
 
 
     def get_history(self):
         return self.__history
 
-    def __assign_predicted_window(self, slave):
+    def get_summary_makespan(self):
+        return self.__summary_makespan
+
+    def get_windows_calculated(self):
+        return self.__windows_calculated
+
+    def get_executed_history(self):
+        """ :return: history of tasks executed so far by the manufacture, as [machine, jid, start, duration, label] """
+        return self.__manufacture.get_history()
+
+    def get_traces(self):
+        """ :return: convergence traces (see AnytimeResult) of windows solved with a window_budget """
+        return self.__traces
+
+    def __predict_window(self):
+        """ :return: window of backlog jobs and a predicted problem, the backlog itself is left unchanged """
+        snapshot = self.__backlog.snapshot()
         if self.__problem_provider.has_next():
             predicted_problem = self.__problem_generator.generate_distorted_problem(self.__initial_problem,
                                                                                    self.__timeKeeper.get_time() + self.__window_time)
             logger.debug("New predicted problem generated: %s", predicted_problem)
             self.__backlog.add_problem(predicted_problem)
         logger.debug("Generating predicted job window")
-        job_window = self.next_job_window()
+        job_window = self.__backlog.peek_window(self.__window_time * (self.__tasks_per_job - 2))
+        self.__backlog.restore(snapshot)
         logger.debug("Predicted job window generated: %s", job_window)
         time_matrix = self.__converter.window_to_matrix(job_window)
         logger.info("Time matrix for predicted job window: %s", str(time_matrix))
-        GeneticsHelper(job_window).reset(slave)
+        return job_window
 
 
 class NonPredictiveMasterAgent(object):
@@ -134,8 +230,14 @@ class NonPredictiveMasterAgent(object):
     @Inject("timeKeeper:_NonPredictiveMasterAgent__timeKeeper")
     @Inject("stop_condition:_NonPredictiveMasterAgent__stop_condition")
     @Inject("problem_provider:_NonPredictiveMasterAgent__problem_provider")
-    def __init__(self, time_matrix, window_time, distortion_factor=0.1, steps_for_initial_window=100):
+    def __init__(self, time_matrix, window_time, distortion_factor=0.1, steps_for_initial_window=100,
+                 window_budget=None):
+        """
+        :param window_budget: AnytimeBudget, or function(window number) -> AnytimeBudget, bounding computation of
+                              a window; by default a window is solved until a generation brings no progress
+        """
         self.__window_time = window_time
+        self.__window_budget = window_budget
         self.__steps_for_initial_window = steps_for_initial_window
         self.__summary_makespan = 0
         self.__windows_calculated = 0
@@ -144,7 +246,7 @@ class NonPredictiveMasterAgent(object):
         self.__problem_generator = DistortedProblemGenerator(distortion_factor)
         self.__converter = TimeMatrixConverter(Counter())
         self.__initial_problem = self.__converter.matrix_to_problem(time_matrix)
-        self.__tasks_per_job = len(self.__initial_problem.get_jobs_list()[0].get_tasks_list())
+        self.__tasks_per_job = self.__initial_problem.to_compact().tasks_count(0)
         self.__backlog.add_problem(self.__initial_problem)
         self.__solve_initial_window()
 
@@ -156,10 +258,7 @@ class NonPredictiveMasterAgent(object):
         logger.info("Initial window makespan=%s, result_matrix=%s", str(makespan), str(result_matrix))
 
     def next_job_window(self):
-        job_window = JobWindow(self.__window_time * (self.__tasks_per_job - 2))
-        while not job_window.is_full() and not self.__backlog.is_empty():
-            job_window.add_job(self.__backlog.pop_top_priority_job())
-        return job_window
+        return self.__backlog.pop_window(self.__window_time * (self.__tasks_per_job - 2))
 
     def step(self):
         self.__timeKeeper.step()
@@ -190,7 +289,13 @@ class NonPredictiveMasterAgent(object):
             self.__backlog.add_problem(incoming_problem)
 
     def __calculate_schedule_for_current_window(self):
-        steps_required, makespan, result_matrix = GeneticsHelper(self.__current_window).solve_until_no_progress(self.__slaves.values()[0])
+        genetics_helper = GeneticsHelper(self.__current_window)
+        if self.__window_budget is None:
+            steps_required, makespan, result_matrix = genetics_helper.solve_until_no_progress(self.__slaves.values()[0])
+        else:
+            budget = get_window_budget(self.__window_budget, self.__windows_calculated)
+            result = genetics_helper.solve_anytime([self.__slaves.values()[0]], budget)
+            steps_required, makespan, result_matrix = result.steps, result.makespan, result.result_matrix
         for _ in xrange(steps_required):
             self.__timeKeeper.step()        #time passed for calculation
         self.__summary_makespan += makespan
@@ -203,11 +308,11 @@ class NonPredictiveMasterAgent(object):
         return self.__manufacture.get_history()
 
 
-def masters_factory(count, job_window_time, time_matrix, distortion_factor=0.1):
+def masters_factory(count, job_window_time, time_matrix, distortion_factor=0.1, **kwargs):
     def factory():
         agents = {}
         for i in xrange(count):
-            agent = MasterAgent(time_matrix, job_window_time, distortion_factor)
+            agent = MasterAgent(time_matrix, job_window_time, distortion_factor, **kwargs)
             agents["Master_" + str(i)] = agent
         return agents
 
@@ -229,9 +334,50 @@ def _agents_factory(count, agent_type):
     return factory
 
 
+class AnytimeBudget(object):
+    def __init__(self, time=None, evaluations=None):
+        """
+        :param time: wall-clock milliseconds
+        :param evaluations: fitness evaluations, summed over slaves
+        with neither of them, a single generation is run
+        """
+        self.time = time
+        self.evaluations = evaluations
+
+    def is_spent(self, elapsed, evaluations, step_time, step_evaluations):
+        """ :return: whether another generation, costing as much as the last one, would exceed the budget """
+        if self.time is None and self.evaluations is None:
+            return True
+        if self.time is not None and elapsed + step_time > self.time:
+            return True
+        return self.evaluations is not None and evaluations + step_evaluations > self.evaluations
+
+
+def get_window_budget(window_budget, window_number):
+    return window_budget(window_number) if callable(window_budget) else window_budget
+
+
+class AnytimeResult(object):
+    def __init__(self, makespan, result_matrix, permutation, trace, steps, evaluations, elapsed):
+        """
+        :param trace: list of (elapsed milliseconds, evaluations, makespan), one entry per improvement of the best
+                      makespan
+        """
+        self.makespan = makespan
+        self.result_matrix = result_matrix
+        self.permutation = permutation
+        self.trace = trace
+        self.steps = steps
+        self.evaluations = evaluations
+        self.elapsed = elapsed
+
+
 class GeneticsHelper(object):
     def __init__(self, job_window):
-        self.time_matrix = TimeMatrixConverter(Counter()).window_to_matrix(job_window)
+        compact_window = job_window.to_compact()
+        self.time_matrix = compact_window.to_time_matrix()
+        self.jids = compact_window.jids
+        self.best_permutation = None
 
     def solve_with(self, slave, steps):
         self.reset(slave)
@@ -239,15 +385,67 @@ class GeneticsHelper(object):
             slave.step()
         return self.get_best_solution([slave])
 
-    def reset(self, slave):
+    def reset(self, slave, warm_start=False):
+        GeneticsHelper.reset_slave(slave, self.time_matrix, self.jids if warm_start else None)
+
+    @staticmethod
+    def reset_slave(slave, time_matrix, jids=None):
+        """
+        :param jids: jids of the jobs of the window, when given the population of the previous window is carried
+                     over by job identity (warm start) instead of being reinitialized
+        """
         #TODO: this is based on flowshop_classi_conf, make it more general(operators can have different order)
-        slave.operators[2].time_matrix = self.time_matrix  # now slave evaluates schedule accordingly to new job_window
-        slave.operators[2].JOBS_COUNT = len(self.time_matrix[0]) + 1
-        slave.operators[2].PROCESSORS_COUNT = len(self.time_matrix) + 1
-        slave.initializer.permutation_length = len(self.time_matrix[0])
+        # now slave evaluates schedule accordingly to new job_window, replacing the matrix also resets sentinel
+        # counts and invalidates the fitness cache of the evaluation
+        previous_jids = getattr(slave, "window_jids", None)
+        slave.window_jids = jids
+        slave.operators[2].time_matrix = time_matrix
+        slave.initializer.set_problem(time_matrix)
+        if jids is not None and previous_jids is not None and slave.population and \
+                carry_over_population(slave.population, previous_jids, jids, time_matrix):
+            fresh_population = []
+            slave.initializer.process(fresh_population)
+            slave.population.extend(fresh_population[:len(fresh_population) - len(slave.population)])
+            return
         slave.population = []
         slave.initialize()
 
+    def solve_anytime(self, slaves, budget, warm_start=False):
+        """
+        Evolves :param slaves: on the window until :param budget: (AnytimeBudget) is spent. At least one generation
+        is run; a generation isn't started when the previous one suggests it would exceed the budget, so the time
+        budget bounds latency up to the variance of generation times.
+
+        :param warm_start: carry populations of slaves over to the window, see reset_slave
+        :rtype: AnytimeResult of the best schedule found
+        """
+        start = time.time()
+        for slave in slaves:
+            self.reset(slave, warm_start)
+        evaluations_before = sum(slave.operators[2].evaluations for slave in slaves)
+        best_genotype = None
+        trace = []
+        steps = 0
+        evaluations = 0
+        while True:
+            step_start = time.time()
+            for slave in slaves:
+                slave.step()
+            steps += 1
+            step_evaluations = sum(slave.operators[2].evaluations for slave in slaves) - evaluations_before - evaluations
+            evaluations += step_evaluations
+            now = time.time()
+            elapsed = (now - start) * 1000
+            genotype = max((slave.get_best_genotype() for slave in slaves), key=lambda g: g.fitness)
+            if best_genotype is None or genotype.fitness > best_genotype[1]:
+                best_genotype = (list(genotype.permutation), genotype.fitness)
+                trace.append((elapsed, evaluations, -genotype.fitness))
+            if budget.is_spent(elapsed, evaluations, (now - step_start) * 1000, step_evaluations):
+                break
+        makespan, result_matrix = FlowShopEvaluation(self.time_matrix).compute_makespan(best_genotype[0], True)
+        return AnytimeResult(makespan, result_matrix, best_genotype[0], trace, steps, evaluations,
+                             (time.time() - start) * 1000)
+
     def solve_until_no_progress(self, slave):
         self.reset(slave)
         best_makespan = sys.maxint
@@ -273,23 +471,19 @@ class GeneticsHelper(object):
         return steps_required, best_makespan, best_result_matrix
 
     def get_best_solution(self, slaves):
+        return self.get_best_solution_of([slave.get_best_genotype() for slave in slaves])
+
+    def get_best_solution_of(self, genotypes):
         logger.debug("Searching for best solution for time_matrix %s", self.time_matrix)
         jobs_in_current_window = len(self.time_matrix[0])
         makespans = []
         result_matrices = []
-        for slave in slaves:
-            permutation = slave.get_best_genotype().permutation
-            self.__adjust_permutation(permutation, jobs_in_current_window)
+        for genotype in genotypes:
+            permutation = genotype.permutation
+            adjust_permutation(permutation, jobs_in_current_window)
             makespan, result_matrix = FlowShopEvaluation(self.time_matrix).compute_makespan(permutation, True)
             makespans.append(makespan)
             result_matrices.append(result_matrix)
         min_makespan_idx = makespans.index(min(makespans))
-        return makespans[min_makespan_idx], result_matrices[min_makespan_idx]
-
-    #Predicted Job Window could have different number of jobs, we have to adjust it
-    def __adjust_permutation(self, permutation, jobs_in_current_window):
-        while len(permutation) != jobs_in_current_window:
-            if len(permutation) > jobs_in_current_window:
-                permutation.remove(len(permutation)-1)
-            else:
-                permutation.append(len(permutation))
\ No newline at end of file
+        self.best_permutation = list(genotypes[min_makespan_idx].permutation)
+        return makespans[min_makespan_idx], result_matrices[min_makespan_idx]
\ No newline at end of file
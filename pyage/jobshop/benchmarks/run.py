@@ -0,0 +1,309 @@
+"""
+Benchmarks of the flow shop and job shop hot paths on bundled Taillard instances.
+
+Every (benchmark, instance) pair runs in a fresh worker process, so its peak memory (ru_maxrss) and module level state
+(inject.resolve_attr, Manufacture.history, id counters) are its own. Throughputs are measured over at least
+--min-time seconds, the genetic algorithm runs a fixed number of generations so its makespan only depends on --seed.
+
+usage: python run.py --instances ta001 ta011 --save baseline.json
+       python run.py --compare baseline.json --tolerance 0.1
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+
+from pyage.jobshop import launcher
+from pyage.jobshop import launcher_config_small as l_conf
+from pyage.jobshop.flowshop_genetics import FirstHalfSwapsCrossover, FlowShopEvaluation, OpenShopEvaluation
+from pyage.jobshop.flowshop_genetics import PermutationInitializer, PermutationMutation
+from pyage.jobshop.flowshop_genetics import swaps_p1_to_p2
+from pyage.jobshop.genetic_classes import BasicJobShopEvaluation, JobShopGenotype
+from pyage.jobshop.problem import TimeMatrixConverter
+from pyage.jobshop.problemGenerator import Counter
+from pyage.solutions.evolution.selection import TournamentSelection
+from taillard import INSTANCES, load_instance
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+POPULATION_SIZE = 50
+CROSSOVER_SIZE = 100
+ROLLING_HORIZON_MAX_JOBS = 20  # larger instances take minutes per window with the launcher configuration
+
+
+def measure(function, min_time):
+    """ :return: calls of :param function: per second, over at least :param min_time: seconds """
+    calls = 0
+    start = time.time()
+    while True:
+        function()
+        calls += 1
+        elapsed = time.time() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def random_population(permutation_length, size=POPULATION_SIZE):
+    population = []
+    PermutationInitializer(permutation_length, size).process(population)
+    return population
+
+
+def bench_flowshop_evaluation(instance, options):
+    population = random_population(instance.jobs_count())
+    evaluation = FlowShopEvaluation(instance.time_matrix)
+    return {"evaluations_per_sec": len(population) * measure(lambda: evaluation.process(population),
+                                                              options.min_time)}
+
+
+def bench_flowshop_evaluation_batched(instance, options):
+    if numpy is None:
+        return {"skipped": "numpy is not installed"}
+    population = random_population(instance.jobs_count())
+    evaluation = FlowShopEvaluation(instance.time_matrix, batched=True)
+    return {"evaluations_per_sec": len(population) * measure(lambda: evaluation.process(population),
+                                                              options.min_time)}
+
+
+def bench_openshop_evaluation(instance, options):
+    population = random_population(instance.jobs_count() * instance.machines_count())
+    evaluation = OpenShopEvaluation(instance.time_matrix)
+    return {"evaluations_per_sec": len(population) * measure(lambda: evaluation.process(population),
+                                                              options.min_time)}
+
+
+def bench_jobshop_evaluation(instance, options):
+    problem = TimeMatrixConverter(Counter()).matrix_to_problem(instance.time_matrix)
+    population = []
+    for _ in xrange(POPULATION_SIZE):
+        genotype = JobShopGenotype(problem)
+        random.shuffle(genotype.genes)
+        population.append(genotype)
+    evaluation = BasicJobShopEvaluation(instance.machines_count())
+    return {"evaluations_per_sec": len(population) * measure(lambda: evaluation.process(population),
+                                                              options.min_time)}
+
+
+def bench_crossover(instance, options):
+    population = random_population(instance.jobs_count())
+    crossover = FirstHalfSwapsCrossover()
+    pairs = [random.sample(population, 2) for _ in xrange(len(population))]
+
+    def cross_all():
+        for p1, p2 in pairs:
+            crossover.cross(p1, p2)
+
+    return {"crossovers_per_sec": len(pairs) * measure(cross_all, options.min_time)}
+
+
+def bench_swaps(instance, options):
+    pairs = [(PermutationInitializer.generate_permutation(instance.jobs_count()),
+              PermutationInitializer.generate_permutation(instance.jobs_count()))
+             for _ in xrange(POPULATION_SIZE)]
+
+    def swaps_all():
+        for p1, p2 in pairs:
+            swaps_p1_to_p2(p1, p2)
+
+    return {"calls_per_sec": len(pairs) * measure(swaps_all, options.min_time)}
+
+
+def bench_selection(instance, options):
+    candidates = random_population(instance.jobs_count(), CROSSOVER_SIZE)
+    FlowShopEvaluation(instance.time_matrix).process(candidates)
+    selection = TournamentSelection(POPULATION_SIZE, POPULATION_SIZE)
+
+    def select():
+        selection.process(list(candidates))
+
+    return {"selections_per_sec": measure(select, options.min_time)}
+
+
+def bench_genetic_algorithm(instance, options):
+    """ operators of a launcher slave, applied the way Agent.step does """
+    population = random_population(instance.jobs_count())
+    operators = [
+        FirstHalfSwapsCrossover(CROSSOVER_SIZE),
+        PermutationMutation(2),
+        FlowShopEvaluation(instance.time_matrix, batched=True),
+        TournamentSelection(POPULATION_SIZE, POPULATION_SIZE)
+    ]
+    operators[2].process(population)
+    start = time.time()
+    for _ in xrange(options.generations):
+        for operator in operators:
+            operator.process(population)
+    elapsed = time.time() - start
+    best_makespan = - max(genotype.fitness for genotype in population)
+    return {
+        "generations_per_sec": options.generations / elapsed,
+        "best_makespan": best_makespan,
+        "upper_bound": instance.upper_bound,
+        "gap": float(best_makespan - instance.upper_bound) / instance.upper_bound
+    }
+
+
+def bench_rolling_horizon(instance, options):
+    """ full launcher run: MasterAgent with l_conf slaves, initial problem and three distorted deliveries """
+    if instance.jobs_count() > ROLLING_HORIZON_MAX_JOBS:
+        return {"skipped": "more than {0} jobs".format(ROLLING_HORIZON_MAX_JOBS)}
+    distortion_factor = l_conf.distortion_factors[0]
+    incoming_problems = launcher.generate_incoming_problems(instance.time_matrix, distortion_factor,
+                                                            l_conf.number_of_deliveries)
+    start = time.time()
+    result = launcher.launch_computation(l_conf.numbers_of_aggregates[0], l_conf.aggregate_sizes,
+                                         {"matrix": instance.time_matrix}, incoming_problems, distortion_factor,
+                                         render_gantt=False)
+    elapsed = time.time() - start
+    return {
+        "wall_time": elapsed,
+        "steps_per_sec": result["steps"] / elapsed,
+        "best_makespan": result["makespan"],
+        "windows": result["windows"]
+    }
+
+
+BENCHMARKS = [
+    ("flowshop_evaluation", bench_flowshop_evaluation),
+    ("flowshop_evaluation_batched", bench_flowshop_evaluation_batched),
+    ("openshop_evaluation", bench_openshop_evaluation),
+    ("jobshop_evaluation", bench_jobshop_evaluation),
+    ("crossover", bench_crossover),
+    ("swaps", bench_swaps),
+    ("selection", bench_selection),
+    ("genetic_algorithm", bench_genetic_algorithm),
+    ("rolling_horizon", bench_rolling_horizon),
+]
+
+HIGHER_IS_BETTER = "higher"
+LOWER_IS_BETTER = "lower"
+
+
+def metric_direction(metric):
+    """ :return: HIGHER_IS_BETTER, LOWER_IS_BETTER or None for informational metrics """
+    if metric.endswith("_per_sec"):
+        return HIGHER_IS_BETTER
+    if metric in ("peak_memory_kb", "best_makespan", "gap", "wall_time"):
+        return LOWER_IS_BETTER
+    return None
+
+
+def run_benchmark(task):
+    """ executed in a worker process, never raises: failures are reported in the returned record """
+    benchmark_name, instance_name, options = task
+    random.seed(options.seed)
+    if numpy is not None:
+        numpy.random.seed(options.seed)
+    work_directory = tempfile.mkdtemp(prefix="pyage-benchmark-")
+    os.chdir(work_directory)  # launcher runs leave gantt/ and statistics files behind
+    sys.stdout = open(os.devnull, "w")  # masters print their histories
+    record = {"benchmark": benchmark_name, "instance": instance_name}
+    try:
+        benchmark = dict(BENCHMARKS)[benchmark_name]
+        record.update(benchmark(load_instance(instance_name), options))
+    except Exception:
+        record["error"] = traceback.format_exc()
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+    record["peak_memory_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return record
+
+
+def run_benchmarks(benchmark_names, instance_names, options):
+    tasks = [(benchmark_name, instance_name, options)
+             for instance_name in instance_names for benchmark_name in benchmark_names]
+    pool = multiprocessing.Pool(1, maxtasksperchild=1)  # one at a time: benchmarks must not compete for cpu
+    try:
+        results = []
+        for record in pool.imap(run_benchmark, tasks):
+            if "error" in record:
+                logger.warning("%s on %s failed:\n%s", record["benchmark"], record["instance"], record["error"])
+            results.append(record)
+            print format_record(record)
+            sys.stdout.flush()
+        return results
+    finally:
+        pool.close()
+        pool.join()
+
+
+def format_record(record):
+    metrics = ", ".join("{0}={1}".format(metric, _format_value(value)) for metric, value in sorted(record.items())
+                        if metric not in ("benchmark", "instance", "error"))
+    return "{0:<28} {1:<6} {2}".format(record["benchmark"], record["instance"],
+                                       "FAILED" if "error" in record else metrics)
+
+
+def compare(results, baseline, tolerance):
+    """
+    :param tolerance: relative change of a metric, in its worse direction, tolerated before it is reported
+    :return: list of regressions, as printable strings
+    """
+    baseline_records = dict(((record["benchmark"], record["instance"]), record) for record in baseline)
+    regressions = []
+    for record in results:
+        baseline_record = baseline_records.get((record["benchmark"], record["instance"]))
+        if baseline_record is None:
+            continue
+        for metric, value in sorted(record.items()):
+            direction = metric_direction(metric)
+            baseline_value = baseline_record.get(metric)
+            if direction is None or not baseline_value or not isinstance(value, (int, long, float)):
+                continue
+            change = float(value - baseline_value) / abs(baseline_value)
+            line = "{0:<28} {1:<6} {2:<20} {3:>12} -> {4:>12} ({5:+.1%})".format(
+                record["benchmark"], record["instance"], metric, _format_value(baseline_value),
+                _format_value(value), change)
+            print line
+            if (direction == HIGHER_IS_BETTER and change < -tolerance) or \
+                    (direction == LOWER_IS_BETTER and change > tolerance):
+                regressions.append(line)
+    return regressions
+
+
+def _format_value(value):
+    return "{0:.4g}".format(value) if isinstance(value, float) else str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks flow shop and job shop hot paths on Taillard instances")
+    parser.add_argument("--instances", nargs="+", default=sorted(INSTANCES), choices=sorted(INSTANCES))
+    parser.add_argument("--benchmarks", nargs="+", default=[name for name, _ in BENCHMARKS],
+                        choices=[name for name, _ in BENCHMARKS])
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds every throughput is measured for")
+    parser.add_argument("--generations", type=int, default=200, help="generations of the genetic_algorithm benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write results to this JSON file, to be used as a baseline later")
+    parser.add_argument("--compare", help="baseline JSON file the results are compared to")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative regression tolerated by --compare")
+    options = parser.parse_args()
+
+    results = run_benchmarks(options.benchmarks, options.instances, options)
+    if options.save:
+        with open(options.save, "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), options.tolerance)
+        if regressions:
+            print "\n{0} regressions over {1:.0%}:\n{2}".format(len(regressions), options.tolerance,
+                                                                "\n".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)  # workplace logs every step at INFO
+    main()
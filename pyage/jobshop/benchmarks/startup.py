@@ -0,0 +1,95 @@
+"""
+Startup time of pyAgE processes: every module is imported in fresh interpreters, as by spawned sweep or slave pool
+workers, reporting the median import time, the median time from spawning the interpreter to its exit, and which
+optional heavy dependencies the import loaded (they should load lazily, on first use).
+
+usage: python startup.py --repeats 10 --save startup.json
+       python startup.py --compare startup.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODULES = ["pyage.core.workplace", "pyage.jobshop.agents", "pyage.jobshop.launcher", "pyage.jobshop.sweep"]
+HEAVY_MODULES = ["matplotlib", "numpy", "Pyro4", "urllib2"]
+
+_IMPORT = """
+import json, sys, time
+start = time.time()
+import %s
+elapsed = time.time() - start
+print json.dumps({"import": elapsed, "loaded": [name for name in %r if name in sys.modules]})
+"""
+
+
+def _environment():
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir))
+    jobshop = os.path.join(root, "pyage", "jobshop")  # jobshop modules import each other by their short names
+    return dict(os.environ, PYTHONPATH=os.pathsep.join([root, jobshop, os.environ.get("PYTHONPATH", "")]))
+
+
+def measure_import(module, python=sys.executable):
+    """ :return: dict of import and process times (seconds) and heavy modules loaded by importing :param module: """
+    start = time.time()
+    output = subprocess.check_output([python, "-c", _IMPORT % (module, HEAVY_MODULES)], env=_environment())
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process"] = time.time() - start
+    return result
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def run(modules, repeats):
+    results = {}
+    for module in modules:
+        samples = [measure_import(module) for _ in xrange(repeats)]
+        results[module] = {"import": median([sample["import"] for sample in samples]),
+                           "process": median([sample["process"] for sample in samples]),
+                           "loaded": samples[-1]["loaded"]}
+        print "{0:<30}{1:>10.1f} ms import{2:>10.1f} ms process   loaded: {3}".format(
+            module, 1000 * results[module]["import"], 1000 * results[module]["process"],
+            ", ".join(results[module]["loaded"]) or "-")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """ :return: descriptions of modules importing slower than in :param baseline: by more than :param tolerance: """
+    regressions = []
+    for module, result in sorted(results.items()):
+        if module in baseline and result["import"] > baseline[module]["import"] * (1 + tolerance):
+            regressions.append("{0}: {1:.1f} ms, was {2:.1f} ms".format(module, 1000 * result["import"],
+                                                                       1000 * baseline[module]["import"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures import time of pyAgE modules in fresh interpreters")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save", help="write results to this JSON file, to be used as a baseline later")
+    parser.add_argument("--compare", help="baseline JSON file the results are compared to")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative regression tolerated by --compare")
+    options = parser.parse_args()
+
+    results = run(options.modules, options.repeats)
+    if options.save:
+        with open(options.save, "w") as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), options.tolerance)
+        if regressions:
+            print "\n{0} regressions over {1:.0%}:\n{2}".format(len(regressions), options.tolerance,
+                                                                "\n".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Taillard flow shop instances (E. Taillard, Benchmarks for basic scheduling problems, EJOR 64, 1993).
+
+Processing times are drawn from U[1, 99] by Taillard's portable linear congruential generator, machine by machine,
+so every instance is fully determined by its size and seed. The first instance of several sizes is bundled in
+instances/, upper bounds are the best known makespans.
+"""
+import os
+
+INSTANCES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instances")
+
+# name: (jobs, machines, seed, upper bound)
+INSTANCES = {
+    "ta001": (20, 5, 873654221, 1278),
+    "ta011": (20, 10, 587595453, 1582),
+    "ta021": (20, 20, 479340445, 2297),
+    "ta051": (50, 20, 1539989115, 3850),
+    "ta081": (100, 20, 450926852, 6202),
+    "ta101": (200, 20, 2013025619, 11195),
+    "ta111": (500, 20, 1368624604, 26059),
+}
+
+
+class TaillardInstance(object):
+    def __init__(self, name, time_matrix, seed, upper_bound):
+        """ :param time_matrix: time_matrix[machine][job], as expected by FlowShopEvaluation """
+        self.name = name
+        self.time_matrix = time_matrix
+        self.seed = seed
+        self.upper_bound = upper_bound
+
+    def jobs_count(self):
+        return len(self.time_matrix[0])
+
+    def machines_count(self):
+        return len(self.time_matrix)
+
+    def __str__(self):
+        return "{0} ({1}x{2})".format(self.name, self.jobs_count(), self.machines_count())
+
+
+def unif(seed, low, high):
+    """ :return: (next seed, integer drawn uniformly from low..high) """
+    a, b, c, m = 16807, 127773, 2836, 2 ** 31 - 1
+    k = seed // b
+    seed = a * (seed % b) - k * c
+    if seed < 0:
+        seed += m
+    return seed, low + int(seed / float(m) * (high - low + 1))
+
+
+def generate_time_matrix(jobs, machines, seed):
+    time_matrix = []
+    for _ in xrange(machines):
+        processor_times = []
+        for _ in xrange(jobs):
+            seed, duration = unif(seed, 1, 99)
+            processor_times.append(duration)
+        time_matrix.append(processor_times)
+    return time_matrix
+
+
+def instance_path(name):
+    return os.path.join(INSTANCES_DIRECTORY, name + ".txt")
+
+
+def load_instance(name):
+    """ reads a bundled instance, see :func:`save_instance` for the format """
+    with open(instance_path(name)) as instance_file:
+        lines = [line.split() for line in instance_file if line.strip() and not line.startswith("#")]
+    jobs, machines, seed, upper_bound = [int(value) for value in lines[0]]
+    time_matrix = [[int(duration) for duration in line] for line in lines[1:]]
+    if len(time_matrix) != machines or any(len(processor_times) != jobs for processor_times in time_matrix):
+        raise ValueError("Instance {0} is not a {1}x{2} matrix".format(name, jobs, machines))
+    return TaillardInstance(name, time_matrix, seed, upper_bound)
+
+
+def save_instance(name):
+    """ generates instance :param name: of INSTANCES and writes it to instances/<name>.txt """
+    jobs, machines, seed, upper_bound = INSTANCES[name]
+    with open(instance_path(name), "w") as instance_file:
+        instance_file.write("# Taillard {0}: jobs machines seed upper_bound, then processing times of every machine\n"
+                            .format(name))
+        instance_file.write("{0} {1} {2} {3}\n".format(jobs, machines, seed, upper_bound))
+        for processor_times in generate_time_matrix(jobs, machines, seed):
+            instance_file.write(" ".join(str(duration) for duration in processor_times) + "\n")
+
+
+if __name__ == "__main__":
+    for instance_name in sorted(INSTANCES):
+        save_instance(instance_name)
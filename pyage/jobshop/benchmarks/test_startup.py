@@ -0,0 +1,12 @@
+from unittest import TestCase
+from startup import compare, measure_import
+
+
+class TestStartup(TestCase):
+    def test_launcher_loads_heavy_modules_lazily(self):
+        self.assertEqual([], measure_import("pyage.jobshop.launcher")["loaded"])
+
+    def test_compare_reports_slower_imports(self):
+        baseline = {"a": {"import": 0.1}, "b": {"import": 0.1}}
+        self.assertEqual(["b: 150.0 ms, was 100.0 ms"], compare({"a": {"import": 0.11}, "b": {"import": 0.15}},
+                                                                 baseline, 0.2))
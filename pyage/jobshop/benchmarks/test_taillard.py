@@ -0,0 +1,17 @@
+from unittest import TestCase
+from taillard import INSTANCES, generate_time_matrix, load_instance
+
+
+class TestTaillard(TestCase):
+    def test_generator_reproduces_ta001(self):
+        time_matrix = generate_time_matrix(20, 5, 873654221)
+        self.assertEqual([54, 83, 15, 71, 77, 36, 53, 38, 27, 87, 76, 91, 14, 29, 12, 77, 32, 87, 68, 94],
+                         time_matrix[0])
+        self.assertEqual([58, 56, 20, 85, 53, 35, 53, 41, 69, 13, 86, 72, 8, 49, 47, 87, 58, 18, 68, 28],
+                         time_matrix[4])
+
+    def test_bundled_instances_match_generator(self):
+        for name, (jobs, machines, seed, upper_bound) in INSTANCES.items():
+            instance = load_instance(name)
+            self.assertEqual(generate_time_matrix(jobs, machines, seed), instance.time_matrix)
+            self.assertEqual(upper_bound, instance.upper_bound)
@@ -0,0 +1,133 @@
+import json
+import logging
+import struct
+from collections import deque
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+OFF = logging.CRITICAL + 1
+
+# events of manufacture and solutions, arguments are integers
+MANUFACTURE_CHECK = 1  # time, machine
+TASK_POPPED = 2  # time, machine, jid, start time, duration
+TASK_NOT_STARTED = 3  # time, machine, jid, start time
+NOTHING_TO_POP = 4  # time, machine
+SOLUTION_ASSIGNED = 5  # machines, tasks
+SOLUTION_APPENDED = 6  # machines, tasks
+SUPERJOB_TASK = 7  # task index, machine, duration, subtask machine, subtask duration
+SUPERJOB_TOO_SHORT = 8  # tasks, subjob tasks
+JOB_MATCHED = 9  # machine, jid, predicted jid
+EQUIVALENT_TASK = 10  # machine, duration, equivalent duration
+EQUIVALENT_TASK_MISSING = 11  # machine
+
+EVENT_FORMATS = {
+    MANUFACTURE_CHECK: "CHECK AND UPDATE: time {0}, machine {1}",
+    TASK_POPPED: "TASK POPPED: time {0}, machine {1}, job {2}, start at {3}, lasting {4}",
+    TASK_NOT_STARTED: "TASK NOT STARTED: time {0}, machine {1}, job {2}, start at {3}",
+    NOTHING_TO_POP: "NOTHING TO POP: time {0}, machine {1}",
+    SOLUTION_ASSIGNED: "SOLUTION ASSIGNED: {0} machines, {1} tasks",
+    SOLUTION_APPENDED: "SOLUTION APPENDED: {0} machines, {1} tasks",
+    SUPERJOB_TASK: "SUPERJOB TASK {0}: machine {1} lasting {2}, subtask machine {3} lasting {4}",
+    SUPERJOB_TOO_SHORT: "SUPERJOB TOO SHORT: {0} tasks, subjob has {1}",
+    JOB_MATCHED: "JOB MATCHED: machine {0}, job {1} represents predicted job {2}",
+    EQUIVALENT_TASK: "EQUIVALENT TASK: machine {0}, lasting {1}, equivalent lasting {2}",
+    EQUIVALENT_TASK_MISSING: "EQUIVALENT TASK MISSING: machine {0}"
+}
+
+_RECORD_HEADER = struct.Struct("<BHB")
+
+
+class EventTrace(object):
+    """
+    Structured trace of manufacture and solution events, replacing prints in their hot paths.
+
+    Events are (level, event, args) tuples kept in a ring buffer of the last :param capacity: events and, optionally,
+    streamed to a sink. Nothing is formatted while tracing, events below the level of the trace are dropped right
+    away, so a disabled trace (the default) costs a method call per event.
+    """
+
+    def __init__(self, level=OFF, capacity=4096, sink=None):
+        self.level = level
+        self.sink = sink
+        self.__events = deque(maxlen=capacity)
+
+    def emit(self, level, event, *args):
+        if level < self.level:
+            return
+        record = (level, event, args)
+        self.__events.append(record)
+        if self.sink is not None:
+            self.sink.write(record)
+
+    def is_enabled_for(self, level):
+        return level >= self.level
+
+    def get_events(self):
+        """ :return: buffered (level, event, args) records, oldest first """
+        return list(self.__events)
+
+    def dump(self):
+        """ :return: buffered events formatted for reading """
+        return [format_event(record) for record in self.__events]
+
+    def clear(self):
+        self.__events.clear()
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+
+
+def format_event(record):
+    level, event, args = record
+    return EVENT_FORMATS[event].format(*args)
+
+
+class JsonLinesSink(object):
+    """ one JSON object per event: {"level": ..., "event": ..., "args": [...]} """
+
+    def __init__(self, path):
+        self.__file = open(path, "w")
+
+    def write(self, record):
+        level, event, args = record
+        self.__file.write(json.dumps({"level": level, "event": event, "args": args}) + "\n")
+
+    def close(self):
+        self.__file.close()
+
+
+class BinarySink(object):
+    """ records of level (uint8), event (uint16), argument count (uint8) and arguments (int64), little endian """
+
+    def __init__(self, path):
+        self.__file = open(path, "wb")
+
+    def write(self, record):
+        level, event, args = record
+        self.__file.write(_RECORD_HEADER.pack(level, event, len(args)) + struct.pack("<%dq" % len(args), *args))
+
+    def close(self):
+        self.__file.close()
+
+
+def read_binary(path):
+    """ yields (level, event, args) records written by BinarySink to :param path: """
+    with open(path, "rb") as trace_file:
+        while True:
+            header = trace_file.read(_RECORD_HEADER.size)
+            if not header:
+                return
+            level, event, args_count = _RECORD_HEADER.unpack(header)
+            yield level, event, struct.unpack("<%dq" % args_count, trace_file.read(8 * args_count))
+
+
+current = EventTrace()
+
+
+def install(trace):
+    """ makes :param trace: the one manufacture and solutions emit to, :return: the previous one """
+    global current
+    previous = current
+    current = trace
+    return previous
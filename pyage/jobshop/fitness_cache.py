@@ -0,0 +1,127 @@
+from itertools import count
+
+PREVIOUS, NEXT, KEY, FITNESS = 0, 1, 2, 3
+
+
+class FitnessCache(object):
+    """
+    Bounded LRU memo of fitness values of permutation genotypes.
+
+    Entries are keyed on a time matrix token and the permutation tuple. Operators get tokens from :meth:`acquire`,
+    which gives equal time matrices evaluated by the same kind of operator the same token, so a single cache can be
+    shared by operators evaluating the same or different time matrices. An operator replacing its time matrix
+    releases the token of the old one; entries of a token are evicted once no operator holds it. Recency is kept in
+    a circular doubly linked list of [previous, next, key, fitness] links (as functools.lru_cache does), which is
+    much cheaper per hit than re-inserting into an OrderedDict.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__links = {}
+        self.__root = []
+        self.__root[:] = [self.__root, self.__root, None, None]
+        self.__tokens = {}  # (kind, time matrix as tuple of tuples) -> token
+        self.__token_matrices = {}  # token -> (kind, time matrix as tuple of tuples)
+        self.__token_holders = {}  # token -> number of operators holding it
+        self.__next_token = count()
+
+    def __len__(self):
+        return len(self.__links)
+
+    def __str__(self):
+        return "FitnessCache[size: {0}/{1}, hits: {2}, misses: {3}]".format(len(self), self.max_size, self.hits,
+                                                                            self.misses)
+
+    def acquire(self, kind, time_matrix):
+        """
+        :param kind: what fitness means, e.g. the class of the evaluation operator
+        :return: token of :param time_matrix:, the same for equal time matrices of :param kind: until all of them are
+                 released
+        """
+        matrix = (kind, tuple(tuple(row) for row in time_matrix))
+        token = self.__tokens.get(matrix)
+        if token is None:
+            token = self.__tokens[matrix] = next(self.__next_token)
+            self.__token_matrices[token] = matrix
+            self.__token_holders[token] = 0
+        self.__token_holders[token] += 1
+        return token
+
+    def release(self, token):
+        """ gives back :param token: of :meth:`acquire`, evicting its entries if no operator holds it anymore """
+        self.__token_holders[token] -= 1
+        if self.__token_holders[token]:
+            return
+        del self.__token_holders[token]
+        del self.__tokens[self.__token_matrices.pop(token)]
+        for key in [key for key in self.__links if key[0] == token]:
+            self.__unlink(self.__links.pop(key))
+
+    def get(self, token, permutation):
+        link = self.__links.get((token, tuple(permutation)))
+        if link is None:
+            self.misses += 1
+            return None
+        self.__move_to_end(link)
+        self.hits += 1
+        return link[FITNESS]
+
+    def put(self, token, permutation, fitness):
+        key = (token, tuple(permutation))
+        link = self.__links.get(key)
+        if link is not None:
+            link[FITNESS] = fitness
+            self.__move_to_end(link)
+            return
+        root = self.__root
+        last = root[PREVIOUS]
+        link = [last, root, key, fitness]
+        last[NEXT] = root[PREVIOUS] = self.__links[key] = link
+        while len(self.__links) > self.max_size:
+            oldest = root[NEXT]
+            self.__unlink(oldest)
+            del self.__links[oldest[KEY]]
+
+    def lookup(self, token, population):
+        """
+        assigns fitness to genotypes of :param population: which are already known
+
+        :return: genotypes which still have to be evaluated
+        """
+        unknown = []
+        for genotype in population:
+            fitness = self.get(token, genotype.permutation)
+            if fitness is None:
+                unknown.append(genotype)
+            else:
+                genotype.fitness = fitness
+        return unknown
+
+    def store(self, token, population):
+        for genotype in population:
+            self.put(token, genotype.permutation, genotype.fitness)
+
+    def invalidate(self):
+        """ evicts all entries, tokens stay valid """
+        self.__links.clear()
+        self.__root[:] = [self.__root, self.__root, None, None]
+
+    @staticmethod
+    def __unlink(link):
+        link_previous, link_next = link[PREVIOUS], link[NEXT]
+        link_previous[NEXT] = link_next
+        link_next[PREVIOUS] = link_previous
+
+    def __move_to_end(self, link):
+        self.__unlink(link)
+        root = self.__root
+        last = root[PREVIOUS]
+        last[NEXT] = root[PREVIOUS] = link
+        link[PREVIOUS] = last
+        link[NEXT] = root
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
@@ -1,7 +1,8 @@
 import random
 from pyage.core.inject import Inject
 from pyage.core.operator import Operator
-import copy
+from pyage.core.lazy import optional
+numpy = optional("numpy")
 from pyage.solutions.evolution.mutation import AbstractMutation
 from pyage.solutions.evolution.crossover import AbstractCrossover
 
@@ -37,6 +38,18 @@ def rand_bool():
     return random.random() < 0.5
 
 
+def adjust_permutation(permutation, jobs_count):
+    """
+    Fits :param permutation: of a (predicted) job window to a window of :param jobs_count: jobs, in place:
+    missing jobs are appended, jobs beyond the window are removed.
+    """
+    while len(permutation) != jobs_count:
+        if len(permutation) > jobs_count:
+            permutation.remove(len(permutation) - 1)
+        else:
+            permutation.append(len(permutation))
+
+
 class PermutationGenotype(object):
     def __init__(self, permutation):
         """
@@ -77,6 +90,10 @@ class PermutationInitializer(Operator):
         self.permutation_length = permutation_length
         self.population_size = population_size
 
+    def set_problem(self, time_matrix):
+        """ prepares the initializer for flow shop permutations of :param time_matrix: """
+        self.permutation_length = len(time_matrix[0])
+
     def process(self, population):
         for _ in xrange(self.population_size):
             population.append(PermutationGenotype(PermutationInitializer.generate_permutation(self.permutation_length)))
@@ -96,16 +113,13 @@ class PermutationMutation(AbstractMutation):
 
     def mutate(self, genotype):
         """:type genotype: PermutationGenotype"""
+        for (i, j) in self.random_swaps(len(genotype.permutation)):
+            swap(genotype.permutation, i, j)
 
-        def perform_random_swap(permutation):
-            """ :param permutation: list of int """
-            length = len(permutation)
-            i = random.randint(0, length - 1)
-            j = random.randint(0, length - 1)
-            permutation[i], permutation[j] = permutation[j], permutation[i]
-
-        for _ in xrange(self.random_swaps_count):
-            perform_random_swap(genotype.permutation)
+    def random_swaps(self, length):
+        """ :rtype: list of (int, int) """
+        return [(random.randint(0, length - 1), random.randint(0, length - 1))
+                for _ in xrange(self.random_swaps_count)]
 
 
 class FirstHalfSwapsCrossover(AbstractCrossover):
@@ -138,6 +152,14 @@ class FirstHalfSwapsCrossover(AbstractCrossover):
 
 
 class MemeticPermutationMutation(PermutationMutation):
+    """
+    Local search over random swaps: every round, attempts_per_round candidates of the round's best permutation, each
+    with random_swaps_count random swaps, are scored and the best of them becomes the base of the next round.
+
+    Candidates are scored incrementally (IncrementalFlowShopEvaluation, only the block of swapped positions is
+    recomputed) when the evaluation is a FlowShopEvaluation, with the evaluation's compute_makespan otherwise.
+    """
+
     def __init__(self, local_rounds_count, attempts_per_round, random_swaps_count, probability=0.4):
         super(MemeticPermutationMutation, self).__init__(random_swaps_count, probability)
         self.local_rounds_count = local_rounds_count
@@ -147,43 +169,163 @@ class MemeticPermutationMutation(PermutationMutation):
     def mutate(self, genotype):
         """:type genotype: PermutationGenotype"""
 
-        def fitness(genotype):
-            result = self.evaluation.compute_makespan(genotype.permutation)
-            return result
-
         def do_round():
-            def perform_mutation(round_base_genotype):
-                candidate_genotype = copy.deepcopy(round_base_genotype)
-                super(MemeticPermutationMutation, self).mutate(candidate_genotype)
-                candidate_fitness = fitness(candidate_genotype)
-                return candidate_fitness, candidate_genotype
-
-            def update_best_if_better(candidate_fitness, candidate_genotype):
+            def perform_mutation(round_base_permutation):
+                candidate_permutation = list(round_base_permutation)
+                swaps = self.random_swaps(len(candidate_permutation))
+                for (i, j) in swaps:
+                    swap(candidate_permutation, i, j)
+                if neighbourhood is None:
+                    return self.evaluation.compute_makespan(candidate_permutation), candidate_permutation
+                changed_positions = [position for pair in swaps for position in pair]
+                candidate_fitness = neighbourhood.compute_partial_makespan(candidate_permutation,
+                                                                           min(changed_positions),
+                                                                           max(changed_positions))
+                return candidate_fitness, candidate_permutation
+
+            def update_best_if_better(candidate_fitness, candidate_permutation):
                 if candidate_fitness < best['fitness']:
-                    best['genotype'] = candidate_genotype
+                    best['permutation'] = candidate_permutation
                     best['fitness'] = candidate_fitness
 
-            round_base_genotype = copy.deepcopy(best['genotype'])
+            round_base_permutation = best['permutation']
+            if neighbourhood is not None:
+                neighbourhood.set_base(round_base_permutation)
             for _ in xrange(self.attempts_per_round):
-                candidate_fitness, candidate_genotype = perform_mutation(round_base_genotype)
-                update_best_if_better(candidate_fitness, candidate_genotype)
-
-        best = {'genotype': genotype, 'fitness': fitness(genotype)}  # why a dict? here: http://stackoverflow.com/a/2609593/1432478
+                candidate_fitness, candidate_permutation = perform_mutation(round_base_permutation)
+                update_best_if_better(candidate_fitness, candidate_permutation)
+
+        if not self.random_swaps_count or not genotype.permutation:
+            return
+        if isinstance(self.evaluation, FlowShopEvaluation):
+            neighbourhood = IncrementalFlowShopEvaluation(self.evaluation.time_matrix)
+            neighbourhood.set_base(genotype.permutation)
+            fitness = neighbourhood.makespan
+        else:
+            neighbourhood = None
+            fitness = self.evaluation.compute_makespan(genotype.permutation)
+        best = {'permutation': genotype.permutation, 'fitness': fitness}  # why a dict? here: http://stackoverflow.com/a/2609593/1432478
         for _ in xrange(self.local_rounds_count):
             do_round()
-        genotype.permutation = best['genotype'].permutation  # genotype = best['genotype'] won't work
+        genotype.permutation = best['permutation']  # genotype = best['genotype'] won't work
+
+
+class InsertionPermutationMutation(AbstractMutation):
+    """
+    Local search in the insertion neighbourhood of a flow shop permutation, scored with IncrementalFlowShopEvaluation:
+    every attempt takes a random job out of the round's base permutation and finds the best of all n positions to
+    put it back at in O(m * n) (Taillard's acceleration), the best move of a round becomes the base of the next one.
+    Requires a FlowShopEvaluation, see MemeticPermutationMutation for other evaluations.
+    """
+
+    def __init__(self, local_rounds_count, attempts_per_round, probability=0.4):
+        super(InsertionPermutationMutation, self).__init__(PermutationGenotype, probability)
+        self.local_rounds_count = local_rounds_count
+        self.attempts_per_round = attempts_per_round
+
+    @Inject('evaluation')
+    def mutate(self, genotype):
+        """:type genotype: PermutationGenotype"""
+        if not isinstance(self.evaluation, FlowShopEvaluation):
+            raise TypeError("InsertionPermutationMutation requires a FlowShopEvaluation (with a time_matrix), got %s"
+                            % type(self.evaluation).__name__)
+        if len(genotype.permutation) < 2:
+            return
+        neighbourhood = IncrementalFlowShopEvaluation(self.evaluation.time_matrix)
+        neighbourhood.set_base(genotype.permutation)
+        for _ in xrange(self.local_rounds_count):
+            best_makespan, best_move = neighbourhood.makespan, None
+            for _ in xrange(self.attempts_per_round):
+                position = random.randrange(len(neighbourhood.permutation))
+                makespans = neighbourhood.compute_move_makespans(position)
+                target = min(xrange(len(makespans)), key=makespans.__getitem__)
+                if makespans[target] < best_makespan:
+                    best_makespan, best_move = makespans[target], (position, target)
+            if best_move is None:
+                continue
+            permutation = list(neighbourhood.permutation)
+            permutation.insert(best_move[1], permutation.pop(best_move[0]))
+            neighbourhood.set_base(permutation)
+        genotype.permutation = neighbourhood.permutation
 
 class FlowShopEvaluation(Operator):
-    def __init__(self, time_matrix):
+    __time_matrix_token = None  # token of time_matrix in cache
+
+    def __init__(self, time_matrix, batched=False, cache=None):
+        """
+        :param batched: evaluate the whole population at once with numpy (falls back to the scalar path
+                        when numpy is not installed)
+        :param cache: optional :class:`fitness_cache.FitnessCache`, entries are shared with operators evaluating
+                      an equal time matrix
+        """
         super(FlowShopEvaluation, self).__init__(PermutationGenotype)
+        self.cache = cache
         self.time_matrix = time_matrix
-        self.JOBS_COUNT = len(self.time_matrix[0]) + 1  # + 1: for sentinel column
-        self.PROCESSORS_COUNT = len(self.time_matrix) + 1  # + 1: for sentinel row
+        self.batched = batched
+        self.evaluations = 0
+
+    @staticmethod
+    def from_matrix_file(matrix_file, index=0, batched=False, cache=None):
+        """
+        :param matrix_file: :class:`matrix_io.MatrixFile`, evaluates its problem :param index:; batched evaluation
+                            reads durations straight from the mapping, the scalar path gets them as lists, which
+                            are faster to index one by one
+        """
+        return FlowShopEvaluation(matrix_file.get_time_matrix(index, as_lists=not batched), batched, cache)
+
+    @property
+    def time_matrix(self):
+        return self.__time_matrix
+
+    @time_matrix.setter
+    def time_matrix(self, time_matrix):
+        self.__time_matrix = time_matrix
+        self.JOBS_COUNT = len(time_matrix[0]) + 1  # + 1: for sentinel column
+        self.PROCESSORS_COUNT = len(time_matrix) + 1  # + 1: for sentinel row
+        if self.cache is not None:
+            token = self.cache.acquire(type(self), time_matrix)
+            if self.__time_matrix_token is not None:
+                self.cache.release(self.__time_matrix_token)
+            self.__time_matrix_token = token
 
     def process(self, population):
         """ :type population: list of PermutationGenotype """
-        for individual in population:
-            individual.fitness = - self.compute_makespan(individual.permutation)
+        if self.cache is not None:
+            population = self.cache.lookup(self.__time_matrix_token, population)
+        self.evaluations += len(population)
+        if self.batched and numpy is not None and population:
+            makespans = self.compute_makespans([individual.permutation for individual in population])
+            for individual, makespan in zip(population, makespans):
+                individual.fitness = - makespan
+        else:
+            for individual in population:
+                individual.fitness = - self.compute_makespan(individual.permutation)
+        if self.cache is not None:
+            self.cache.store(self.__time_matrix_token, population)
+
+    def compute_makespans(self, permutations):
+        """
+        Batched counterpart of :meth:`compute_makespan`, requires numpy.
+
+        Sweeps one machine row at a time over the whole population. For machine i and position j
+            C[i][j] = p[i][j] + max(C[i][j-1], C[i-1][j])
+        unrolls to
+            C[i][j] = S[i][j] + max_{k<=j}(C[i-1][k] - S[i][k-1]),
+        where S[i] is the prefix sum of processing times on machine i, so every row is a single cumulative
+        maximum along the job axis.
+
+        :type permutations: list of list of int
+        :return: list of makespans, in order of :param permutations:
+        """
+        orders = numpy.asarray(permutations, dtype=numpy.int64)
+        durations = numpy.asarray(self.time_matrix)  # not copied when it is already an array, e.g. of a MatrixFile
+        completion_times = numpy.zeros(orders.shape, dtype=numpy.int64)
+        for processor_times in durations:
+            ordered_times = processor_times[orders]
+            prefix_sums = numpy.cumsum(ordered_times, axis=1, dtype=numpy.int64)
+            shifted_prefix_sums = prefix_sums - ordered_times
+            completion_times = prefix_sums + numpy.maximum.accumulate(completion_times - shifted_prefix_sums, axis=1)
+        return completion_times[:, -1].tolist()
 
     def compute_makespan(self, permutation, compute_solution_matrix=False):
         """ :return: makespan for processing in order specified by :param permutation: """
@@ -210,17 +352,158 @@ class FlowShopEvaluation(Operator):
         return [processor[1:] for processor in completion_times[1:]]
 
 
-class OpenShopEvaluation(Operator):
+class IncrementalFlowShopEvaluation(object):
+    """
+    Scores neighbours of a base permutation without re-evaluating it from column 0 (Taillard, 1990).
+
+    Caches for the base permutation:
+        heads[i][k] - completion time of the k-th job on processor i
+        tails[i][k] - length of the longest path from the start of the k-th job on processor i to the end
+                      of the schedule (processing time of that operation included)
+    A critical path leaves the block of positions lo..hi exactly once, so a permutation differing from
+    the base only inside that block has makespan max_i(heads'[i][hi] + tails[i][hi + 1]), where heads'
+    are recomputed for the block only: O(m * (hi - lo + 1)), i.e. O(m) for an adjacent swap.
+    """
+
     def __init__(self, time_matrix):
+        self.time_matrix = time_matrix
+        self.PROCESSORS_COUNT = len(time_matrix)
+        self.permutation = None
+        self.heads = None
+        self.tails = None
+        self.makespan = None
+
+    def set_base(self, permutation):
+        """ computes heads and tails of :param permutation: in O(m * n) """
+        self.permutation = list(permutation)
+        self.heads = self._calculate_heads(self.permutation)
+        self.tails = self._calculate_tails(self.permutation)
+        self.makespan = self.heads[-1][-1] if self.permutation else 0
+
+    def compute_partial_makespan(self, permutation, lo, hi):
+        """
+        :param permutation: equal to the base permutation outside of positions lo..hi (inclusive)
+        :return: makespan of :param permutation:
+        """
+        column = [processor_heads[lo - 1] for processor_heads in self.heads] if lo > 0 else [0] * self.PROCESSORS_COUNT
+        for ji in xrange(lo, hi + 1):
+            column = self._next_head_column(column, permutation[ji])
+        if hi + 1 >= len(permutation):
+            return column[-1]
+        return max(column[pi] + self.tails[pi][hi + 1] for pi in xrange(self.PROCESSORS_COUNT))
+
+    def compute_swap_makespan(self, i, j):
+        """
+        :return: makespan of the base permutation with positions :param i: and :param j: swapped, in
+                 O(m * (|i - j| + 1)), the base permutation is not copied
+        """
+        lo, hi = min(i, j), max(i, j)
+        permutation = self.permutation
+        column = [processor_heads[lo - 1] for processor_heads in self.heads] if lo > 0 else [0] * self.PROCESSORS_COUNT
+        column = self._next_head_column(column, permutation[hi])
+        for ji in xrange(lo + 1, hi):
+            column = self._next_head_column(column, permutation[ji])
+        if hi > lo:
+            column = self._next_head_column(column, permutation[lo])
+        if hi + 1 >= len(permutation):
+            return column[-1]
+        return max(column[pi] + self.tails[pi][hi + 1] for pi in xrange(self.PROCESSORS_COUNT))
+
+    def compute_insertion_makespans(self, job):
+        """
+        :param job: a job missing from the base permutation
+        :return: makespans of inserting :param job: at every position 0..n of the base permutation, O(m)
+                 per position
+        """
+        makespans = []
+        for ji in xrange(len(self.permutation) + 1):
+            makespan = 0
+            completion_time = 0
+            for pi in xrange(self.PROCESSORS_COUNT):
+                head = self.heads[pi][ji - 1] if ji > 0 else 0
+                completion_time = max(completion_time, head) + self.time_matrix[pi][job]
+                tail = self.tails[pi][ji] if ji < len(self.permutation) else 0
+                makespan = max(makespan, completion_time + tail)
+            makespans.append(makespan)
+        return makespans
+
+    def compute_move_makespans(self, position):
+        """
+        :return: makespans of moving the job at :param position: of the base permutation to every
+                 position 0..n-1 (positions of the permutation after the job has been removed)
+        """
+        reduced_permutation = self.permutation[:position] + self.permutation[position + 1:]
+        reduced = IncrementalFlowShopEvaluation(self.time_matrix)
+        reduced.set_base(reduced_permutation)
+        return reduced.compute_insertion_makespans(self.permutation[position])
+
+    def _next_head_column(self, previous_column, job):
+        column = []
+        completion_time = 0
+        for previous_completion_time, processor_times in zip(previous_column, self.time_matrix):
+            if previous_completion_time > completion_time:
+                completion_time = previous_completion_time
+            completion_time += processor_times[job]
+            column.append(completion_time)
+        return column
+
+    def _calculate_heads(self, permutation):
+        heads = [[] for _ in xrange(self.PROCESSORS_COUNT)]
+        column = [0] * self.PROCESSORS_COUNT
+        for job in permutation:
+            column = self._next_head_column(column, job)
+            for pi in xrange(self.PROCESSORS_COUNT):
+                heads[pi].append(column[pi])
+        return heads
+
+    def _calculate_tails(self, permutation):
+        jobs_count = len(permutation)
+        tails = [[0] * jobs_count for _ in xrange(self.PROCESSORS_COUNT)]
+        for ji in xrange(jobs_count - 1, -1, -1):
+            job = permutation[ji]
+            next_processor_tail = 0
+            for pi in xrange(self.PROCESSORS_COUNT - 1, -1, -1):
+                next_job_tail = tails[pi][ji + 1] if ji + 1 < jobs_count else 0
+                next_processor_tail = self.time_matrix[pi][job] + max(next_processor_tail, next_job_tail)
+                tails[pi][ji] = next_processor_tail
+        return tails
+
+
+class OpenShopEvaluation(Operator):
+    __time_matrix_token = None  # token of time_matrix in cache
+
+    def __init__(self, time_matrix, cache=None):
+        """
+        :param cache: optional :class:`fitness_cache.FitnessCache`, entries are shared with operators evaluating an
+                      equal time matrix
+        """
         super(OpenShopEvaluation, self).__init__(PermutationGenotype)
+        self.cache = cache
         self.time_matrix = time_matrix
-        self.JOBS_COUNT = len(self.time_matrix[0])
-        self.PROCESSORS_COUNT = len(self.time_matrix)
+
+    @property
+    def time_matrix(self):
+        return self.__time_matrix
+
+    @time_matrix.setter
+    def time_matrix(self, time_matrix):
+        self.__time_matrix = time_matrix
+        self.JOBS_COUNT = len(time_matrix[0])
+        self.PROCESSORS_COUNT = len(time_matrix)
+        if self.cache is not None:
+            token = self.cache.acquire(type(self), time_matrix)
+            if self.__time_matrix_token is not None:
+                self.cache.release(self.__time_matrix_token)
+            self.__time_matrix_token = token
 
     def process(self, population):
         """ :type population: list of PermutationGenotype """
+        if self.cache is not None:
+            population = self.cache.lookup(self.__time_matrix_token, population)
         for individual in population:
             individual.fitness = - self.compute_makespan(individual.permutation)
+        if self.cache is not None:
+            self.cache.store(self.__time_matrix_token, population)
 
     def compute_makespan(self, permutation):
         jobs_cts = self._calculate_jobs_completion_times(permutation)
@@ -1,65 +1,156 @@
-from os import sep
-from os import path
+import sys
 from os import makedirs
-import matplotlib.pyplot as plt
+from os import path
+from os import sep
+from xml.sax.saxutils import escape
+
+COLORS = ['#1f77b4', '#aec7e8', '#ff7f0e', '#ffbb78', '#2ca02c', '#98df8a', '#d62728', '#ff9896', '#9467bd',
+          '#c5b0d5', '#8c564b', '#c49c94', '#e377c2', '#f7b6d2', '#7f7f7f', '#c7c7c7', '#bcbd22', '#dbdb8d',
+          '#17becf', '#9edae5']
+
+FORMATS = ("png", "svg", "html")
+
+
+def _pyplot():
+    """ matplotlib is imported on first drawing only, with a file backend unless pyplot is already in use """
+    import matplotlib
+    if "matplotlib.pyplot" not in sys.modules:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def tick_step(span, max_ticks=20):
+    """ :return: 1, 2 or 5 times a power of 10, giving at most :param max_ticks: ticks over :param span: """
+    step = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            if span <= step * multiplier * max_ticks:
+                return step * multiplier
+        step *= 10
+
 
 class GanttGenerator(object):
-    __tasks = {}
-    __N = 50
-    __n_machines = 0
-    __fig = plt.figure(figsize=(16,8))
-
-    __colors = [(31, 119, 180), (174, 199, 232), (255, 127, 14), (255, 187, 120),
-             (44, 160, 44), (152, 223, 138), (214, 39, 40), (255, 152, 150),
-             (148, 103, 189), (197, 176, 213), (140, 86, 75), (196, 156, 148),
-             (227, 119, 194), (247, 182, 210), (127, 127, 127), (199, 199, 199),
-             (188, 189, 34), (219, 219, 141), (23, 190, 207), (158, 218, 229)]
-
-    def __init__(self, out_dir='gantt'):
+    """
+    Gantt chart of tasks added so far, one image per generate call.
+
+    All bars of a machine are drawn with a single broken_barh call, ticks are thinned out to a readable number and
+    job numbers are written only on bars wide enough to hold them, and only up to MAX_LABELS bars. "svg" and "html"
+    outputs are written without matplotlib.
+    """
+    MAX_LABELS = 500
+    WIDTH = 1600  # pixels of png and svg images
+    ROW_HEIGHT = 40
+    MARGIN = 60
+    CHAR_WIDTH = 7
+
+    def __init__(self, out_dir='gantt', output_format='png'):
+        if output_format not in FORMATS:
+            raise ValueError("Unknown Gantt output format %s, expected one of %s" % (output_format, FORMATS))
         self.__out_dir = out_dir
-        if not path.exists(out_dir):
-            makedirs(out_dir)
-        for i in range(len(self.__colors)):
-            r, g, b = self.__colors[i]
-            self.__colors[i] = (r / 255., g / 255., b / 255.)
+        self.__output_format = output_format
+        self.__tasks = {}
 
     def add_task(self, machine_nr, job_nr, start_time, duration):
-        if machine_nr not in self.__tasks.keys():
-            self.__tasks[machine_nr] = {}
-            self.__n_machines = self.__n_machines + 1
+        self.__tasks.setdefault(machine_nr, {})[start_time] = (job_nr, duration)
+
+    def add_tasks(self, history):
+        """ :param history: [machine, job, start time, duration, ...] records, e.g. MasterAgent.get_history() """
+        for record in history:
+            self.add_task(record[0], record[1], record[2], record[3])
 
-        machine = self.__tasks[machine_nr]
-        machine[start_time] = {'job_nr': job_nr, 'duration': duration}
+    def clear(self):
+        self.__tasks = {}
+
+    def get_tasks_count(self):
+        return sum(len(machine) for machine in self.__tasks.values())
 
     def generate(self, title=None):
-        max_duration = 0
-        for machine_nr in self.__tasks:
-            machine = self.__tasks[machine_nr]
-            for start_time in machine:
-                job_nr = machine[start_time]['job_nr']
-                duration = machine[start_time]['duration']
-                color = self.__colors[job_nr % len(self.__colors)]
-                color = map(lambda x: x * 222, color)   #Bo wartosci rgb wychodzily z niewiadomych przyczyn duzo za male
-
-                plt.hlines(machine_nr, start_time, start_time + duration, colors=color, lw=50)
-                plt.text(start_time + 0.1, machine_nr + 0.1, str(job_nr), bbox=dict(facecolor='white', alpha=1.0)) #fontdict=dict(color='white'))
-
-                if duration + start_time > max_duration:
-                    max_duration = duration + start_time
-
-        plt.margins(1)
-        if self.__n_machines is 0:
-            plt.axis([0, max_duration, 0.8, len(self.__tasks)])
+        """ :return: path of the written image, named after :param title: """
+        title = title or 'gantt'
+        if not path.exists(self.__out_dir):
+            makedirs(self.__out_dir)
+        image_path = self.__out_dir + sep + title + '.' + self.__output_format
+        if self.__output_format == 'png':
+            self.__save_png(image_path, title)
         else:
-            plt.axis([0, max_duration, -0.8, self.__n_machines])
-        plt.xticks(range(0, max_duration, 1))
+            content = self.to_svg(title) if self.__output_format == 'svg' else self.to_html(title)
+            with open(image_path, 'w') as image:
+                image.write(content)
+        return image_path
+
+    def to_svg(self, title=None):
+        machines = sorted(self.__tasks)
+        span = max(self.__get_span(), 1)
+        plot_width = self.WIDTH - 2 * self.MARGIN
+        scale = float(plot_width) / span
+        height = self.ROW_HEIGHT * len(machines) + 2 * self.MARGIN
+        labelled = self.get_tasks_count() <= self.MAX_LABELS
+        elements = ['<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" font-family="sans-serif" '
+                    'font-size="11">' % (self.WIDTH, height)]
         if title:
-            plt.title(title)
-        plt.xlabel("Time")
-        plt.ylabel("Machines")
-        if self.__n_machines is 0:
-            plt.yticks(range(0, len(self.__tasks), 1))
-        else:
-            plt.yticks(range(0, self.__n_machines, 1))
+            elements.append('<text x="%d" y="%d" text-anchor="middle" font-size="14">%s</text>'
+                            % (self.WIDTH // 2, self.MARGIN // 2, escape(title)))
+        for row, machine_nr in enumerate(machines):
+            y = self.MARGIN + row * self.ROW_HEIGHT
+            elements.append('<text x="%d" y="%d" text-anchor="end">%s</text>'
+                            % (self.MARGIN - 6, y + self.ROW_HEIGHT // 2 + 4, machine_nr))
+            for start_time, (job_nr, duration) in sorted(self.__tasks[machine_nr].items()):
+                x = self.MARGIN + start_time * scale
+                width = duration * scale
+                elements.append('<rect x="%.2f" y="%d" width="%.2f" height="%d" fill="%s"><title>job %s: %s-%s'
+                                '</title></rect>' % (x, y + 4, width, self.ROW_HEIGHT - 8, self.__color(job_nr),
+                                                     job_nr, start_time, start_time + duration))
+                if labelled and self.__fits(job_nr, width):
+                    elements.append('<text x="%.2f" y="%d" text-anchor="middle">%s</text>'
+                                    % (x + width / 2, y + self.ROW_HEIGHT // 2 + 4, job_nr))
+        axis_y = self.MARGIN + len(machines) * self.ROW_HEIGHT
+        step = tick_step(span)
+        for tick in xrange(0, span + 1, step):
+            x = self.MARGIN + tick * scale
+            elements.append('<line x1="%.2f" y1="%d" x2="%.2f" y2="%d" stroke="black"/><text x="%.2f" y="%d" '
+                            'text-anchor="middle">%d</text>' % (x, axis_y, x, axis_y + 5, x, axis_y + 18, tick))
+        elements.append('<text x="%d" y="%d" text-anchor="middle">Time</text>' % (self.WIDTH // 2, height - 10))
+        elements.append('</svg>')
+        return '\n'.join(elements)
+
+    def to_html(self, title=None):
+        return '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>%s</title></head><body>\n%s\n</body></html>' \
+               % (escape(title or 'gantt'), self.to_svg(title))
+
+    def __save_png(self, image_path, title):
+        plt = _pyplot()
+        machines = sorted(self.__tasks)
+        span = max(self.__get_span(), 1)
+        fig = plt.figure(figsize=(self.WIDTH / 100., max(4, len(machines) * self.ROW_HEIGHT / 100. + 1.5)), dpi=100)
+        ax = fig.add_subplot(111)
+        scale = (self.WIDTH - 2 * self.MARGIN) / float(span)  # pixels per time unit, approximately
+        labelled = self.get_tasks_count() <= self.MAX_LABELS
+        for machine_nr in machines:
+            bars = sorted(self.__tasks[machine_nr].items())
+            ax.broken_barh([(start_time, duration) for start_time, (_, duration) in bars], (machine_nr - 0.4, 0.8),
+                           facecolors=[self.__color(job_nr) for _, (job_nr, _) in bars])
+            if labelled:
+                for start_time, (job_nr, duration) in bars:
+                    if self.__fits(job_nr, duration * scale):
+                        ax.text(start_time + duration / 2., machine_nr, str(job_nr), ha='center', va='center',
+                                fontsize=8)
+        ax.set_xlim(0, span)
+        ax.set_xticks(range(0, span + 1, tick_step(span)))
+        ax.set_yticks(machines)
+        ax.set_xlabel("Time")
+        ax.set_ylabel("Machines")
+        ax.set_title(title)
+        fig.savefig(image_path)
+        plt.close(fig)
+
+    def __get_span(self):
+        return max([start_time + duration for machine in self.__tasks.values()
+                    for start_time, (_, duration) in machine.items()] or [0])
+
+    def __fits(self, job_nr, width):
+        return width >= len(str(job_nr)) * self.CHAR_WIDTH + 4
 
-        self.__fig.savefig(self.__out_dir + sep + title + '.png')
+    @staticmethod
+    def __color(job_nr):
+        return COLORS[hash(job_nr) % len(COLORS)]
@@ -25,7 +25,7 @@ class JobShopGenotype(object):
         
     def nonrandom_generate_genes(self, problem):
         joblist = []
-        for job in problem.get_jobs_list():
+        for job in problem.jobs_list:
             for task in job.get_tasks_list():
                 joblist.append(job)
         return joblist
@@ -51,36 +51,72 @@ class BasicJobShopEvaluation(Operator):
 
     ''' arbitrary sign change to conserve bigger == better'''
     def __schedule_time(self, genes):
-        return self.schedule(genes).get_completion_time()
+        gene_jobs, machines, durations, _ = self.compile_genes(genes)
+        makespan, _ = self.dispatch(gene_jobs, machines, durations)
+        return makespan
 
-    def schedule(self,genes):
-        ending_times = [0 for _ in xrange(self.machines_nr)]
-        jobs_in_progress = [None for _ in xrange(self.machines_nr)]
-        currentTime = 0
+    def schedule(self, genes):
+        gene_jobs, machines, durations, jobs = self.compile_genes(genes)
+        _, dispatched = self.dispatch(gene_jobs, machines, durations)
         solution = Solution(self.machines_nr)
-        jobs_tasks = {}
-        jobList = list(copy.deepcopy(genes))
-        for job in jobList:
-            jobs_tasks[job.jid] = list(copy.deepcopy(job.get_tasks_list()))
-        while jobList:
-            for job in jobList:
-                task = jobs_tasks[job.jid][0]
-                if currentTime >= ending_times[task.machine] and self.__notInProgress(job, ending_times, jobs_in_progress, currentTime):
-                    ending_times[task.machine] = currentTime + task.get_duration()
-                    jobs_in_progress[task.machine] = job
-                    task.set_start_time(currentTime)
-                    solution.append_task_to_machine(task, currentTime)
-                    jobs_tasks[job.jid].remove(task)
-                    jobList.remove(job)
-            currentTime += 1
+        for job_index, task_index, start_time in dispatched:
+            task = copy.copy(jobs[job_index].get_tasks_list()[task_index])
+            task.set_start_time(start_time)
+            solution.append_task_to_machine(task, start_time)
         return solution
 
-    '''wymogi JobShop - jeden job moze naraz isc tylko na jednej maszynie'''
-    def __notInProgress(self, job, ending_times, jobs_in_progress, currentTime):
-        for i in xrange(len(jobs_in_progress)):
-            if currentTime < ending_times[i] and job.jid == jobs_in_progress[i].jid:
-                return False
-        return True
+    @staticmethod
+    def compile_genes(genes):
+        ''' przeksztalca geny na tablice indeksow: (numery jobow kolejnych genow, maszyny taskow jobow,
+            czasy taskow jobow, joby) - bez kopiowania obiektow Job/Task '''
+        job_indices = {}
+        jobs = []
+        machines = []
+        durations = []
+        gene_jobs = []
+        for job in genes:
+            if job.jid not in job_indices:
+                job_indices[job.jid] = len(jobs)
+                jobs.append(job)
+                tasks = job.get_tasks_list()
+                machines.append([task.machine for task in tasks])
+                durations.append([task.get_duration() for task in tasks])
+            gene_jobs.append(job_indices[job.jid])
+        return gene_jobs, machines, durations, jobs
+
+    def dispatch(self, gene_jobs, machines, durations):
+        ''' zdarzeniowy dekoder: kolejne geny dostaja maszyne w chwili, gdy wolne sa i maszyna, i job; czas
+            przeskakuje od razu do najblizszego zwolnienia maszyny lub joba zamiast co 1, wiec koszt nie zalezy
+            od dlugosci taskow
+            :return: (makespan, lista (numer joba, numer taska, czas startu) w kolejnosci przydzielania) '''
+        machine_free = [0] * self.machines_nr
+        job_free = [0] * len(machines)
+        next_task = [0] * len(machines)
+        dispatched = []
+        makespan = 0
+        current_time = 0
+        pending = gene_jobs
+        while pending:
+            waiting = []
+            next_time = None
+            for job in pending:
+                task = next_task[job]
+                machine = machines[job][task]
+                ready_time = max(machine_free[machine], job_free[job])
+                if ready_time <= current_time:
+                    end_time = current_time + durations[job][task]
+                    machine_free[machine] = job_free[job] = end_time
+                    next_task[job] = task + 1
+                    dispatched.append((job, task, current_time))
+                    if end_time > makespan:
+                        makespan = end_time
+                else:
+                    waiting.append(job)
+                    if next_time is None or ready_time < next_time:
+                        next_time = ready_time
+            pending = waiting
+            current_time = next_time
+        return makespan, dispatched
 
 '''zamiana miejscami dwoch losowych genów'''
 class BasicJobShopMutation(AbstractMutation):
@@ -0,0 +1,172 @@
+import random
+
+from flowshop_genetics import FlowShopEvaluation, IncrementalFlowShopEvaluation, PermutationGenotype, \
+    PermutationInitializer, swap
+
+
+def neh(time_matrix):
+    """
+    Nawaz-Enscore-Ham: jobs ordered by decreasing total processing time are inserted one by one at the position
+    minimizing the makespan of the partial permutation. Insertion makespans are scored with Taillard's acceleration
+    (heads and tails of the partial permutation), so the whole construction is O(n^2 * m).
+
+    :return: permutation of jobs of :param time_matrix:
+    """
+    jobs = sorted(xrange(len(time_matrix[0])), key=lambda job: -sum(processor[job] for processor in time_matrix))
+    partial = IncrementalFlowShopEvaluation(time_matrix)
+    permutation = []
+    for job in jobs:
+        partial.set_base(permutation)
+        makespans = partial.compute_insertion_makespans(job)
+        permutation.insert(makespans.index(min(makespans)), job)
+    return permutation
+
+
+def palmer(time_matrix):
+    """ Palmer's slope index: jobs that are short on early processors and long on late ones go first """
+    processors_count = len(time_matrix)
+
+    def slope(job):
+        return sum((2 * (pi + 1) - processors_count - 1) * time_matrix[pi][job] for pi in xrange(processors_count))
+
+    return sorted(xrange(len(time_matrix[0])), key=lambda job: -slope(job))
+
+
+def johnson(first_times, second_times):
+    """ :return: optimal permutation of a two-processor flow shop (Johnson's rule) """
+    jobs = range(len(first_times))
+    head = sorted([job for job in jobs if first_times[job] < second_times[job]], key=lambda job: first_times[job])
+    tail = sorted([job for job in jobs if first_times[job] >= second_times[job]], key=lambda job: -second_times[job])
+    return head + tail
+
+
+def cds(time_matrix):
+    """
+    Campbell-Dudek-Smith: Johnson's rule applied to m - 1 surrogate two-processor problems, built by summing the
+    first k and the last k processors. :return: the best of the surrogate permutations
+    """
+    processors_count = len(time_matrix)
+    jobs_count = len(time_matrix[0])
+    if processors_count < 2:
+        return sorted(xrange(jobs_count), key=lambda job: time_matrix[0][job])
+    evaluation = FlowShopEvaluation(time_matrix)
+    best_permutation, best_makespan = None, None
+    for k in xrange(1, processors_count):
+        first_times = [sum(time_matrix[pi][job] for pi in xrange(k)) for job in xrange(jobs_count)]
+        second_times = [sum(time_matrix[pi][job] for pi in xrange(processors_count - k, processors_count))
+                        for job in xrange(jobs_count)]
+        permutation = johnson(first_times, second_times)
+        makespan = evaluation.compute_makespan(permutation)
+        if best_makespan is None or makespan < best_makespan:
+            best_permutation, best_makespan = permutation, makespan
+    return best_permutation
+
+
+HEURISTICS = (neh, cds, palmer)
+
+
+def insert_jobs(permutation, jobs, time_matrix):
+    """
+    Inserts :param jobs: missing from :param permutation: one by one at their best positions, in place. Jobs are
+    inserted in NEH order (decreasing total processing time), each insertion costs O(n * m).
+    """
+    partial = IncrementalFlowShopEvaluation(time_matrix)
+    for job in sorted(jobs, key=lambda job: -sum(processor[job] for processor in time_matrix)):
+        partial.set_base(permutation)
+        makespans = partial.compute_insertion_makespans(job)
+        permutation.insert(makespans.index(min(makespans)), job)
+
+
+def match_jobs(old_jids, new_jids):
+    """
+    :return: dict job index in the old window -> job index in the new window, for jobs present in both windows;
+             a jid repeated in a window (e.g. by a predicted problem) is matched in order of occurrence
+    """
+    new_indices = {}
+    for index, jid in enumerate(new_jids):
+        new_indices.setdefault(jid, []).append(index)
+    for indices in new_indices.values():
+        indices.reverse()
+    matching = {}
+    for index, jid in enumerate(old_jids):
+        indices = new_indices.get(jid)
+        if indices:
+            matching[index] = indices.pop()
+    return matching
+
+
+def carry_over_population(population, old_jids, new_jids, time_matrix):
+    """
+    Moves :param population: of a window of :param old_jids: onto the window of :param new_jids:, in place: jobs
+    which left the window are dropped, jobs which entered it are inserted at their best positions for
+    :param time_matrix:. Genotypes which became duplicates are removed, fitness of the others is reset, they are
+    evaluated in the next step.
+
+    :return: False, leaving the population unchanged, if the windows have no job in common
+    """
+    matching = match_jobs(old_jids, new_jids)
+    if not matching:
+        return False
+    new_jobs = sorted(set(xrange(len(new_jids))) - set(matching.values()))
+    carried = []
+    seen = set()
+    for genotype in population:
+        permutation = [matching[job] for job in genotype.permutation if job in matching]
+        insert_jobs(permutation, new_jobs, time_matrix)
+        if tuple(permutation) not in seen:
+            seen.add(tuple(permutation))
+            genotype.permutation = permutation
+            genotype.fitness = None
+            carried.append(genotype)
+    population[:] = carried
+    return True
+
+
+class SeededPermutationInitializer(PermutationInitializer):
+    """
+    PermutationInitializer seeding a fraction of the population with constructive flow shop heuristics, so a window
+    doesn't start from noise. Seeds beyond the distinct heuristic permutations are their copies with a random swap,
+    the rest of the population stays random for diversity.
+    """
+
+    def __init__(self, permutation_length, population_size=100, time_matrix=None, seeded_fraction=0.2,
+                 heuristics=HEURISTICS):
+        """
+        :param time_matrix: flow shop time matrix of the permutations, seeding is skipped without it
+        :param seeded_fraction: part of the population built from heuristic seeds
+        :param heuristics: functions time_matrix -> permutation
+        """
+        super(SeededPermutationInitializer, self).__init__(permutation_length, population_size)
+        self.seeded_fraction = seeded_fraction
+        self.heuristics = heuristics
+        self.time_matrix = time_matrix
+        self.__seeds = None
+
+    def set_problem(self, time_matrix):
+        super(SeededPermutationInitializer, self).set_problem(time_matrix)
+        self.time_matrix = time_matrix
+        self.__seeds = None
+
+    def process(self, population):
+        seeded_count = min(int(round(self.seeded_fraction * self.population_size)), self.population_size)
+        seeds = self.get_seeds() if seeded_count else []
+        if not seeds:
+            seeded_count = 0
+        for i in xrange(seeded_count):
+            permutation = list(seeds[i % len(seeds)])
+            if i >= len(seeds) and len(permutation) > 1:
+                swap(permutation, *random.sample(xrange(len(permutation)), 2))
+            population.append(PermutationGenotype(permutation))
+        for _ in xrange(self.population_size - seeded_count):
+            population.append(PermutationGenotype(PermutationInitializer.generate_permutation(self.permutation_length)))
+
+    def get_seeds(self):
+        """ :return: distinct heuristic permutations for the current time matrix, computed once per matrix """
+        if self.__seeds is None:
+            self.__seeds = []
+            if self.time_matrix is not None and len(self.time_matrix[0]) == self.permutation_length:
+                for heuristic in self.heuristics:
+                    permutation = heuristic(self.time_matrix)
+                    if permutation not in self.__seeds:
+                        self.__seeds.append(permutation)
+        return self.__seeds
@@ -0,0 +1,91 @@
+import logging
+import random
+from array import array
+
+from flowshop_genetics import PermutationGenotype, adjust_permutation
+
+logger = logging.getLogger(__name__)
+
+
+def ring_topology(keys):
+    """ every island sends to the next one, the last to the first """
+    return dict((key, [keys[(i + 1) % len(keys)]]) for i, key in enumerate(keys) if len(keys) > 1)
+
+
+def random_topology(keys):
+    """ every island sends to another island drawn anew on each migration """
+    return dict((key, [random.choice([other for other in keys if other != key])]) for key in keys if len(keys) > 1)
+
+
+def full_topology(keys):
+    """ every island sends to all other islands """
+    return dict((key, [other for other in keys if other != key]) for key in keys)
+
+
+TOPOLOGIES = {
+    "ring": ring_topology,
+    "random": random_topology,
+    "full": full_topology
+}
+
+
+class IslandMigration(object):
+    """
+    Periodic exchange of elite permutations between slaves of a master, so that slaves cooperate instead of being
+    independent restarts. Permutations travel as compact arrays, so they are cheap to pickle to pool workers.
+    """
+
+    def __init__(self, topology="ring", interval=10, elites=2):
+        """
+        :param topology: "ring", "random" or "full", see TOPOLOGIES
+        :param interval: slave steps between migrations
+        :param elites: number of best permutations each slave sends to each of its destinations
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError("Unknown topology: %s" % topology)
+        self.topology = topology
+        self.interval = interval
+        self.elites = elites
+        self.migrations = 0
+
+    def is_due(self, previous_steps, steps):
+        """ :return: whether a migration interval ended between :param previous_steps: and :param steps: """
+        return steps // self.interval > previous_steps // self.interval
+
+    def route(self, emigrants):
+        """
+        :param emigrants: dict slave key -> list of elite permutations of the slave
+        :return: dict slave key -> list of permutations the slave receives
+        """
+        self.migrations += 1
+        immigrants = dict((key, []) for key in emigrants)
+        for source, destinations in TOPOLOGIES[self.topology](sorted(emigrants.keys())).items():
+            for destination in destinations:
+                immigrants[destination].extend(emigrants[source])
+        return immigrants
+
+
+def elite_permutations(slave, count):
+    """ :return: permutations of :param count: best genotypes of :param slave:, as compact arrays """
+    evaluated = [genotype for genotype in slave.population if genotype.fitness is not None]
+    evaluated.sort(key=lambda genotype: genotype.fitness, reverse=True)
+    return [array('l', genotype.permutation) for genotype in evaluated[:count]]
+
+
+def accept_immigrants(slave, permutations):
+    """
+    Replaces the worst genotypes of :param slave: with :param permutations:, at most half of the population, so
+    immigrants don't take the island over. Immigrants are evaluated with the rest of the population in the next step.
+    """
+    permutations = list(permutations)
+    limit = len(slave.population) // 2
+    if len(permutations) > limit:
+        permutations = random.sample(permutations, limit)
+    if not permutations:
+        return
+    slave.population.sort(key=lambda genotype: genotype.fitness)
+    for i, permutation in enumerate(permutations):
+        permutation = list(permutation)
+        adjust_permutation(permutation, slave.initializer.permutation_length)
+        slave.population[i] = PermutationGenotype(permutation)
+    logger.debug("%d immigrants accepted", len(permutations))
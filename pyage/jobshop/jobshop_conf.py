@@ -10,7 +10,7 @@ from pyage.jobshop.flowshop_genetics import FlowShopEvaluation
 from pyage.jobshop.problemGenerator import  ProblemGenerator, UniformIntDistribution, RandomizedTasksProvider, PredictedProblemGenerator, RandomizedProblemProvider
 from pyage.jobshop.statistics import  GanttStatistics
 from pyage.jobshop.timeKeeper import TimeKeeper
-from pyage.jobshop.manufacture import Manufacture
+from pyage.jobshop.manufacture import EventDrivenManufacture
 
 
 logger = logging.getLogger(__name__)
@@ -22,7 +22,7 @@ logger.debug("AGGREGATE, %s agents", agents_count)
 seed = None
 
 timeKeeper = lambda: TimeKeeper(5,-1)
-manufacture = lambda: Manufacture(machines_number)
+manufacture = lambda: EventDrivenManufacture(machines_number)
 
 start_problem_provider = RandomizedProblemProvider(
 				jobs_number = 20,
@@ -1,12 +1,15 @@
 from pyage.core.stop_condition import get_all_jobs_scheduled_stop_condition, AllJobsScheduledStopCondition
-from flowshop_genetics import PermutationInitializer, FirstHalfSwapsCrossover, PermutationMutation
+from flowshop_genetics import FirstHalfSwapsCrossover, PermutationMutation
 from flowshop_genetics import FlowShopEvaluation
-from manufacture import Manufacture
-from pyage.jobshop.problem import TimeMatrixConverter
-from pyage.jobshop.problemGenerator import ProblemProvider, DistortedProblemGenerator, Counter
+from heuristics import SeededPermutationInitializer
+from manufacture import EventDrivenManufacture
+from matrix_io import MatrixFile
+from pyage.jobshop.problem import CompactProblem
+from pyage.jobshop.problemGenerator import ProblemProvider, DistortedProblemGenerator
 from timeKeeper import TimeKeeper
 from statistics import GanttStatistics
 from agents import masters_factory
+from islands import IslandMigration
 import logging
 
 import launcher_config_small as l_conf
@@ -29,20 +32,25 @@ def get_all_jobs_scheduled_stop_condition():
 
 
 def generate_incoming_problems(initial_problem, distortion_factor, problems_count):
+    """ yields :param problems_count: distorted copies of :param initial_problem: matrix, one at a time """
     problem_generator = DistortedProblemGenerator(distortion_factor)
-    converter = TimeMatrixConverter(Counter())
-    incoming_problems = []
+    compact_problem = CompactProblem.from_matrix(initial_problem, range(len(initial_problem[0])))
     for _ in xrange(problems_count):
-        distorted_problem = problem_generator.generate_distorted_problem(converter.matrix_to_problem(initial_problem))
-        incoming_problems.append(converter.problem_to_matrix(distorted_problem))
-    return incoming_problems
+        yield problem_generator.distort_compact_problem(compact_problem).to_time_matrix()
+
+
+def get_incoming_problems(initial_problem, distortion_factor):
+    if l_conf.deliveries_file is not None:
+        return MatrixFile(l_conf.deliveries_file)  # memory mapped, jobs keep arrival times stored in it
+    # materialized, as main() reuses the feed for every number of aggregates and repeat
+    #return list(generate_incoming_problems(initial_problem['matrix'], distortion_factor, l_conf.number_of_deliveries))
+    return [[[3, 15, 16, 9, 9, 16, 5], [30, 1, 22, 1, 6, 30, 9], [12, 13, 14, 26, 3, 16, 3], [103, 15, 5, 32, 13, 15, 4]], [[8, 19, 10, 36, 11, 35, 5], [21, 5, 11, 3, 7, 30, 4], [12, 13, 14, 15, 9, 16, 5], [16, 15, 34, 11, 10, 9, 11]], [[8, 18, 35, 1, 16, 6, 10], [30, 0, 11, 3, 1, 21, 5], [3, 15, 1, 15, 27, 5, 5], [16, 9, 13, 5, 10, 9, 11]]]
 
 
 def main():
     for initial_problem in l_conf.matrices:
         for distortion_factor in l_conf.distortion_factors:
-            #incoming_problems = generate_incoming_problems(initial_problem['matrix'], distortion_factor, l_conf.number_of_deliveries)
-            incoming_problems = [[[3, 15, 16, 9, 9, 16, 5], [30, 1, 22, 1, 6, 30, 9], [12, 13, 14, 26, 3, 16, 3], [103, 15, 5, 32, 13, 15, 4]], [[8, 19, 10, 36, 11, 35, 5], [21, 5, 11, 3, 7, 30, 4], [12, 13, 14, 15, 9, 16, 5], [16, 15, 34, 11, 10, 9, 11]], [[8, 18, 35, 1, 16, 6, 10], [30, 0, 11, 3, 1, 21, 5], [3, 15, 1, 15, 27, 5, 5], [16, 9, 13, 5, 10, 9, 11]]]
+            incoming_problems = get_incoming_problems(initial_problem, distortion_factor)
             print "Initial problem matrix: {0}\nIncoming problem matrices: {1}\nDistortion factor: {2}".format(initial_problem,
                                                                                                                incoming_problems,
                                                                                                                distortion_factor)
@@ -56,38 +64,44 @@ def main():
 
 
 def create_base_params():
-    return {
+    params = {
         "stop_condition": lambda: get_all_jobs_scheduled_stop_condition(),
         "locator": RandomLocator,
         "logger": lambda: logger,
         "address_provider": lambda: SequenceAddressProvider(),
         "stats": lambda: GanttStatistics()
     }
+    if l_conf.profiler is not None:
+        params["profiler"] = lambda: l_conf.profiler
+    return params
 
 
 def create_resolver(params):
-    def resolver(conf, conf_arg_name, args):
-        try:
-            return params[args[0].address.split('.')[0] + '__' + conf_arg_name]()
-        except:
-            return params[conf_arg_name]()
+    return inject.CachingResolver.from_params(params)
 
-    return resolver
 
-
-def create_classic_params(agents_count, agent_population, time_matrix, incoming_problems_feed, distortion_factor):
+def create_classic_params(agents_count, agent_population, time_matrix, incoming_problems_feed, distortion_factor,
+                          **master_options):
     JOBS_COUNT = len(time_matrix[0])
+    master_options.setdefault("processes", l_conf.processes)
+    master_options.setdefault("steps_per_round", l_conf.steps_per_round)
+    master_options.setdefault("warm_start", l_conf.warm_start)
+    master_options.setdefault("window_budget", l_conf.window_budget)
+    if l_conf.island_topology is not None:
+        master_options.setdefault("islands", IslandMigration(l_conf.island_topology, l_conf.migration_interval,
+                                                             l_conf.migration_elites))
     return {
-        "agents": masters_factory(1, l_conf.window_time, time_matrix, distortion_factor),
-        "manufacture": lambda: Manufacture(len(time_matrix)),
+        "agents": masters_factory(1, l_conf.window_time, time_matrix, distortion_factor, **master_options),
+        "manufacture": lambda: EventDrivenManufacture(len(time_matrix)),
         "timeKeeper": lambda: TimeKeeper(1, 1),
         "slaves": generate_agents("flowshop", agents_count, Agent),
-        "initializer": lambda: PermutationInitializer(JOBS_COUNT, agent_population),
+        "initializer": lambda: SeededPermutationInitializer(JOBS_COUNT, agent_population, time_matrix,
+                                                            l_conf.seeded_fraction),
         "evaluation": lambda: FlowShopEvaluation(time_matrix),
         "operators": lambda: [
             FirstHalfSwapsCrossover(),
             PermutationMutation(2),
-            FlowShopEvaluation(time_matrix),
+            FlowShopEvaluation(time_matrix, batched=True),
             TournamentSelection(agent_population, agent_population)
         ],
         "migration": NoMigration,
@@ -95,9 +109,15 @@ def create_classic_params(agents_count, agent_population, time_matrix, incoming_
     }
 
 
-def launch_computation(agents_count, agent_population, obj, incoming_problems_feed, distortion_factor):
+def launch_computation(agents_count, agent_population, obj, incoming_problems_feed, distortion_factor, **master_options):
+    """
+    :param master_options: extra MasterAgent arguments, e.g. render_gantt=False
+    :return: dict with summary makespan, number of windows and steps of the computation
+    :raise: the exception which stopped the workplace, if any
+    """
     base_params = create_base_params()
-    specific_params = create_classic_params(agents_count, agent_population, obj["matrix"], incoming_problems_feed, distortion_factor)
+    specific_params = create_classic_params(agents_count, agent_population, obj["matrix"], incoming_problems_feed,
+                                            distortion_factor, **master_options)
 
     inject.resolve_attr = create_resolver(dict(base_params.items() + specific_params.items()))
 
@@ -106,6 +126,14 @@ def launch_computation(agents_count, agent_population, obj, incoming_problems_fe
     while not workplace.stopped:
         workplace.step()
     workplace.unregister()
+    if workplace.error is not None:
+        raise workplace.error[0], workplace.error[1], workplace.error[2]
+    master = workplace.get_agents()[0]
+    return {
+        "makespan": master.get_summary_makespan(),
+        "windows": master.get_windows_calculated(),
+        "steps": workplace.steps
+    }
 
 
 if __name__ == "__main__":
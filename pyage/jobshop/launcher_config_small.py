@@ -5,6 +5,16 @@ numbers_of_aggregates = [1, 2, 4, 6, 8, 10, 15, 20, 50]
 aggregate_sizes = 10
 distortion_factors = [0.1, 0.3, 0.5]
 number_of_deliveries = 3
+deliveries_file = None  # matrix_io file of incoming problems, used instead of distorting the initial problem
+processes = 0  # > 0 steps slaves in worker processes
+steps_per_round = 10
+island_topology = None  # "ring", "random" or "full" exchanges elites between slaves, see islands.IslandMigration
+migration_interval = 10
+migration_elites = 2
+window_budget = None  # agents.AnytimeBudget refining each window on its actual jobs, in process only
+profiler = None  # pyage.core.profiling.OperatorProfiler shared by the workplace and slaves, in process only
+warm_start = False  # carries slave populations over to the next window by job identity
+seeded_fraction = 0.0  # > 0 seeds that part of every population with NEH, CDS and Palmer, see heuristics
 
 matrices = [
     {
@@ -1,6 +1,11 @@
+import heapq
 import logging
-import copy
+from array import array
+from collections import deque
 
+from pyage.jobshop import event_trace
+from pyage.jobshop.event_trace import DEBUG, MANUFACTURE_CHECK, NOTHING_TO_POP, SOLUTION_APPENDED, SOLUTION_ASSIGNED, \
+    TASK_POPPED
 from problem import Job, Problem, Solution
 
 logger = logging.getLogger(__name__)
@@ -17,14 +22,17 @@ class Manufacture(object):
         return self.solution is not None
 
     def assign_tasks(self, solution):
-        logger.debug("Manufacture solution assigned: \n%s", solution)        
+        trace = event_trace.current
+        if trace.is_enabled_for(DEBUG):
+            trace.emit(DEBUG, SOLUTION_ASSIGNED, self.machines_nr, solution.get_tasks_count())
         if self.solution is None:
-            new_sol = copy.deepcopy(solution)
+            new_sol = solution.share()
         else:
-            print "manufcturing"
             new_sol = self.solution.append_clone_more_solution_part(solution)
+            if trace.is_enabled_for(DEBUG):
+                trace.emit(DEBUG, SOLUTION_APPENDED, self.machines_nr, new_sol.get_tasks_count())
         self.solution = new_sol
-        
+
     def time_tick(self, new_time):
         if new_time is self.time:
             return
@@ -33,17 +41,16 @@ class Manufacture(object):
         self.__check_and_update(self.time)
 
     def __check_and_update(self, time):
+        trace = event_trace.current
         for machine in self.machines:
             if machine.taskEndTime <= time:
-                logger.debug("Updating machine: %d", machine.idd)
+                trace.emit(DEBUG, MANUFACTURE_CHECK, time, machine.idd)
                 try:
-                    print "CHECK AND UPDATE: POP, " + str(time)
                     task = self.solution.pop_head_task(machine.idd, time)
                     machine.taskEndTime = time+task.get_duration()
-                    logger.debug("New endtime: %d", machine.taskEndTime)
                     self.history.append([ machine.idd, task.get_task_job().get_jid(), time, task.get_duration(), 'Tick ' + str(time) ])
                 except IndexError:
-                    logger.debug("Nothing to add")
+                    trace.emit(DEBUG, NOTHING_TO_POP, time, machine.idd)
 
     def get_history(self):
         return self.history
@@ -80,4 +87,131 @@ class Machine(object):
     def __init__(self, idd):
         self.idd = idd
         self.taskEndTime = 0
-        self.jobInProgress = None
\ No newline at end of file
+        self.jobInProgress = None
+
+
+class EventDrivenManufacture(object):
+    """
+    Discrete-event manufacture: tasks wait in per-machine queues and a heap holds, for every machine able to start its
+    head task, the time it starts it. Time jumps from event to event instead of polling machines on every tick, each
+    task is queued, scheduled and started once, so simulating n tasks on m machines takes O(n log m).
+
+    A task starts once its machine is free, its release time has come and the previous task of its job (in order of
+    addition) has completed. Machine queues follow the order of addition as well, so tasks never wait for each other
+    in a cycle. Task data and the executed history are kept in integer arrays.
+    """
+
+    def __init__(self, machines_nr):
+        self.machines_nr = machines_nr
+        self.time = -1
+        self.__queues = [deque() for _ in xrange(machines_nr)]
+        self.__free_times = [0] * machines_nr
+        self.__scheduled = [False] * machines_nr
+        self.__events = []
+        self.__machines = array('l')
+        self.__releases = array('l')
+        self.__durations = array('l')
+        self.__predecessors = array('l')
+        self.__successors = array('l')
+        self.__completions = array('l')
+        self.__jids = []
+        self.__last_tasks = {}
+        self.executed_tasks = array('l')
+        self.start_times = array('l')
+
+    def tasks_assigned(self):
+        return len(self.__jids) > 0
+
+    def add_task(self, machine, jid, release_time, duration):
+        """ queues a task at the end of :param machine: queue, after the previously added tasks of :param jid: """
+        task = len(self.__jids)
+        predecessor = self.__last_tasks.get(jid, -1)
+        self.__machines.append(machine)
+        self.__releases.append(release_time)
+        self.__durations.append(duration)
+        self.__predecessors.append(predecessor)
+        self.__successors.append(-1)
+        self.__completions.append(-1)
+        self.__jids.append(jid)
+        if predecessor >= 0:
+            self.__successors[predecessor] = task
+        self.__last_tasks[jid] = task
+        self.__queues[machine].append(task)
+        self.__schedule_head(machine)
+        return task
+
+    def add_window_schedule(self, time_matrix, permutation, completion_times, jids, offset=0):
+        """
+        Queues a flow shop window schedule: jobs go through machines 0..m-1, in order of :param permutation:.
+
+        :param completion_times: completion_times[machine][position] as computed by FlowShopEvaluation, tasks are
+                                 released at their planned start times shifted by :param offset:
+        :param jids: jids of the jobs (columns) of :param time_matrix:
+        """
+        for position, job in enumerate(permutation):
+            for machine in xrange(len(time_matrix)):
+                duration = time_matrix[machine][job]
+                self.add_task(machine, jids[job], offset + completion_times[machine][position] - duration, duration)
+
+    def assign_tasks(self, solution):
+        """ queues tasks of a :class:`problem.Solution`, released at their start times """
+        tasks = [task for machine in xrange(self.machines_nr) for task in solution.get_tasks(machine)]
+        tasks.sort(key=lambda task: task.get_start_time())
+        for task in tasks:
+            self.add_task(task.get_task_machine(), task.get_task_job().get_jid(), task.get_start_time(),
+                          task.get_duration())
+
+    def time_tick(self, new_time):
+        if new_time != self.time:
+            self.advance_to(new_time)
+
+    def advance_to(self, time):
+        """ starts every task able to start until :param time: (inclusive) """
+        trace = event_trace.current
+        events = self.__events
+        while events and events[0][0] <= time:
+            start, machine = heapq.heappop(events)
+            self.__scheduled[machine] = False
+            task = self.__queues[machine].popleft()
+            end = start + self.__durations[task]
+            self.__completions[task] = end
+            self.__free_times[machine] = end
+            self.executed_tasks.append(task)
+            self.start_times.append(start)
+            trace.emit(DEBUG, TASK_POPPED, start, machine, self.__jids[task], self.__releases[task],
+                       self.__durations[task])
+            self.__schedule_head(machine)
+            successor = self.__successors[task]
+            if successor >= 0:
+                self.__schedule_head(self.__machines[successor])
+        self.time = time
+
+    def run(self):
+        """ :return: completion time of all queued tasks """
+        self.advance_to(float("inf"))
+        self.time = max(self.__free_times) if self.__jids else 0
+        return self.time
+
+    def get_history(self):
+        """ :return: executed tasks as [machine, jid, start time, duration, label], as in Manufacture """
+        history = []
+        for task, start in zip(self.executed_tasks, self.start_times):
+            history.append([self.__machines[task], self.__jids[task], start, self.__durations[task],
+                            'Tick ' + str(start)])
+        return history
+
+    def __schedule_head(self, machine):
+        queue = self.__queues[machine]
+        if self.__scheduled[machine] or not queue:
+            return
+        head = queue[0]
+        predecessor = self.__predecessors[head]
+        job_ready_time = 0
+        if predecessor >= 0:
+            job_ready_time = self.__completions[predecessor]
+            if job_ready_time < 0:
+                return  # scheduled when the predecessor starts
+        start = max(self.time, self.__free_times[machine], self.__releases[head], job_ready_time)
+        heapq.heappush(self.__events, (start, machine))
+        self.__scheduled[machine] = True
+
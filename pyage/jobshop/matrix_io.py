@@ -0,0 +1,178 @@
+"""
+Binary files of flow shop time matrices, e.g. benchmark instances or feeds of incoming problems.
+
+Layout (little endian):
+    header:  magic "PYJM", version (uint16), reserved (uint16), machines (uint32), problems (uint32)
+    index:   per problem: jobs (uint32), reserved (uint32), offset of its data block (uint64)
+    blocks:  per problem: durations (int32, column-major: tasks of job 0, then of job 1, ...), arrival times of
+             jobs (int32)
+
+Files are opened with mmap and nothing is read before it is asked for, so opening a feed of thousands of problems
+is instant and worker processes opening the same file share its pages. Column-major durations are laid out as
+CompactProblem.durations of a flow shop problem.
+
+Converting a JSON lines or CSV feed (see problemGenerator readers):
+    python matrix_io.py feed.jsonl feed.pyjm
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from pyage.core.lazy import optional
+numpy = optional("numpy")
+
+from pyage.jobshop.problem import CompactProblem, _array
+
+MAGIC = "PYJM"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHII")
+_ENTRY = struct.Struct("<IIQ")
+_INT32 = 4
+
+
+def _int32_array(values):
+    values = array('i', values)
+    if values.itemsize != _INT32:
+        raise TypeError("array 'i' is not 32 bit on this platform")
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def write_problems(path, time_matrices, arrival_times=None):
+    """
+    :param time_matrices: time_matrix[machine][job] matrices, all with the same number of machines
+    :param arrival_times: per problem, an arrival time of all its jobs or a list of arrival times of jobs; 0 if None
+    :return: number of problems written
+    """
+    time_matrices = list(time_matrices)
+    arrival_times = [0] * len(time_matrices) if arrival_times is None else list(arrival_times)
+    if len(arrival_times) != len(time_matrices):
+        raise ValueError("%d arrival times given for %d problems" % (len(arrival_times), len(time_matrices)))
+    machines = len(time_matrices[0]) if time_matrices else 0
+    offset = _HEADER.size + _ENTRY.size * len(time_matrices)
+    entries = []
+    for index, time_matrix in enumerate(time_matrices):
+        if len(time_matrix) != machines:
+            raise ValueError("Time matrices differ in number of machines: %d != %d" % (len(time_matrix), machines))
+        jobs = len(time_matrix[0])
+        if isinstance(arrival_times[index], (int, long)):
+            arrival_times[index] = [arrival_times[index]] * jobs
+        elif len(arrival_times[index]) != jobs:
+            raise ValueError("Problem %d has %d jobs, %d arrival times given" % (index, jobs, len(arrival_times[index])))
+        entries.append(_ENTRY.pack(jobs, 0, offset))
+        offset += _INT32 * jobs * (machines + 1)
+    with open(path, "wb") as matrix_file:
+        matrix_file.write(_HEADER.pack(MAGIC, VERSION, 0, machines, len(time_matrices)))
+        matrix_file.write("".join(entries))
+        for time_matrix, arrival_time in zip(time_matrices, arrival_times):
+            jobs = len(time_matrix[0])
+            matrix_file.write(_int32_array(time_matrix[machine][job] for job in xrange(jobs)
+                                           for machine in xrange(machines)).tostring())
+            matrix_file.write(_int32_array(arrival_time).tostring())
+    return len(time_matrices)
+
+
+class MatrixFile(object):
+    """
+    Memory mapped file written by :func:`write_problems`, iterable over its time matrices.
+
+    With numpy, durations and arrival times are read-only views of the mapping, so they share its pages; without it
+    they are copied, one problem at a time. The file is mapped with numpy.memmap then, so the mapping stays alive as
+    long as any view of it does, even after :meth:`close`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if numpy is not None:
+            self.__mmap = numpy.memmap(path, dtype=numpy.uint8, mode="r")
+        else:
+            with open(path, "rb") as matrix_file:
+                self.__mmap = mmap.mmap(matrix_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.__mmap) < _HEADER.size:
+            raise ValueError("%s is not a time matrix file" % path)
+        magic, version, _, self.machines_count, self.__problems = _HEADER.unpack_from(self.__mmap, 0)
+        if magic != MAGIC:
+            raise ValueError("%s is not a time matrix file" % path)
+        if version != VERSION:
+            raise ValueError("%s has unsupported version %d" % (path, version))
+
+    def __len__(self):
+        return self.__problems
+
+    def __iter__(self):
+        for index in xrange(self.__problems):
+            yield self.get_time_matrix(index)
+
+    def jobs_count(self, index):
+        return self.__get_entry(index)[0]
+
+    def get_durations(self, index):
+        """ :return: durations of problem :param index:, column-major (job by job) """
+        jobs, _, offset = self.__get_entry(index)
+        return self.__read_int32(offset, jobs * self.machines_count)
+
+    def get_arrival_times(self, index):
+        jobs, _, offset = self.__get_entry(index)
+        return self.__read_int32(offset + _INT32 * jobs * self.machines_count, jobs)
+
+    def get_time_matrix(self, index, as_lists=True):
+        """
+        :return: time_matrix[machine][job] lists of problem :param index:, or with numpy and not :param as_lists: a
+                 read-only view of the mapping (transposed column-major durations, nothing is copied)
+        """
+        durations = self.get_durations(index)
+        if numpy is not None:
+            time_matrix = durations.reshape(-1, self.machines_count).T
+            return time_matrix.tolist() if as_lists else time_matrix
+        return [durations[machine::self.machines_count].tolist() for machine in xrange(self.machines_count)]
+
+    def get_compact_problem(self, index, jids):
+        """ :rtype: CompactProblem of problem :param index:, with jobs identified by :param jids: """
+        machines = self.machines_count
+        jobs = self.jobs_count(index)
+        if len(jids) != jobs:
+            raise ValueError("Problem %d has %d jobs, %d jids given" % (index, jobs, len(jids)))
+        return CompactProblem(tuple(jids), tuple(self.get_arrival_times(index).tolist()),
+                              _array('l', xrange(0, (jobs + 1) * machines, machines)),
+                              _array('l', range(machines) * jobs), _array('l', self.get_durations(index).tolist()))
+
+    def close(self):
+        """ no more problems can be read; with numpy, the file is unmapped once arrays read from it are gone too """
+        if numpy is None:
+            self.__mmap.close()
+        self.__mmap = None
+
+    def __repr__(self):
+        return "MatrixFile(%r, %d problems)" % (self.path, self.__problems)
+
+    def __get_entry(self, index):
+        if self.__mmap is None:
+            raise ValueError("%s is closed" % self.path)
+        if not 0 <= index < self.__problems:
+            raise IndexError("Problem index out of range: %d" % index)
+        return _ENTRY.unpack_from(self.__mmap, _HEADER.size + _ENTRY.size * index)
+
+    def __read_int32(self, offset, count):
+        if numpy is not None:
+            return self.__mmap[offset:offset + _INT32 * count].view("<i4")  # keeps the mapping alive
+        values = array('i')
+        values.fromstring(self.__mmap[offset:offset + _INT32 * count])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+
+def convert(source_path, path):
+    """ writes time matrices of a JSON lines (.jsonl/.json) or CSV feed at :param source_path: to :param path: """
+    from pyage.jobshop.problemGenerator import read_csv, read_json_lines
+    reader = read_csv if source_path.endswith(".csv") else read_json_lines
+    return write_problems(path, reader(source_path))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python matrix_io.py FEED(.jsonl|.csv) OUTPUT")
+    print "%d problems written to %s" % (convert(sys.argv[1], sys.argv[2]), sys.argv[2])
@@ -1,6 +1,12 @@
+from array import array
+from collections import deque
 import copy
 import logging
 
+from pyage.jobshop import event_trace
+from pyage.jobshop.event_trace import DEBUG, EQUIVALENT_TASK, EQUIVALENT_TASK_MISSING, JOB_MATCHED, SUPERJOB_TASK, \
+    SUPERJOB_TOO_SHORT, TASK_NOT_STARTED, TASK_POPPED
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,31 +18,35 @@ class Problem(object):
         return "Problem consisted of: \n" + "\n".join(map(str, self.jobs_list))
 
     def get_jobs_list(self):
+        """ :return: deep copy of jobs, to be used only when they are going to be modified """
         return list(copy.deepcopy(self.jobs_list))
 
+    def to_compact(self):
+        return CompactProblem.from_jobs(self.jobs_list)
+
     def get_job_by_jid(self, jid):
         for job in self.jobs_list:
             if job.jid == jid:
                 return job
 
     def merge_with(self, prob):
-        new_jobs_list = self.get_jobs_list() + prob.get_jobs_list()
+        new_jobs_list = self.jobs_list + prob.jobs_list
         return Problem(new_jobs_list)
 
     def __eq__(self, other):
         return self.jobs_list == other.jobs_list
 
     def represents_same(self, other):
-        for job in self.get_jobs_list():
-            for other_job in other.get_jobs_list():
+        for job in self.jobs_list:
+            for other_job in other.jobs_list:
                 if other_job.represents_same(job):
                     break
                 return False
         return True
 
     def represents_superProblem(self, subOther):
-        for job in self.get_jobs_list():
-            for subjob in subOther.get_jobs_list():
+        for job in self.jobs_list:
+            for subjob in subOther.jobs_list:
                 if job.represents_superjob(subjob):
                     break
                 return False
@@ -93,14 +103,13 @@ class Job(object):
             try:
                 task = self.tasks_list[i]
             except IndexError:
-                print "Index error"
+                event_trace.current.emit(DEBUG, SUPERJOB_TOO_SHORT, len(self.tasks_list),
+                                         len(potentialSubjob.tasks_list))
                 return False
-            print i
-            print subtask
-            print task
             if (task.get_task_machine() == subtask.get_task_machine()
                 and task.get_duration() >= subtask.get_duration()):
-                print "same joooob"
+                event_trace.current.emit(DEBUG, SUPERJOB_TASK, i, task.get_task_machine(), task.get_duration(),
+                                         subtask.get_task_machine(), subtask.get_duration())
             else:
                 return False
         return True
@@ -139,6 +148,114 @@ class Task(object):
         return self.machine == other.machine and self.duration == other.duration
 
 
+class TaskQueue(object):
+    """
+    Tasks of a machine as a sequence of chunks: (tuple of tasks, start, end) views of immutable tuples, plus a tail
+    list collecting appended tasks. Popping either end moves a view bound, so both are O(1), and copies share the
+    tuples, copying only the views - O(number of chunks), whatever the number of tasks.
+    """
+
+    def __init__(self, tasks=()):
+        self.__chunks = deque()
+        self.__tail = []
+        self.__length = 0
+        self.extend(tasks)
+
+    def append(self, task):
+        self.__tail.append(task)
+        self.__length += 1
+
+    def extend(self, tasks):
+        """ bulk append, :param tasks: become a chunk of their own """
+        chunk = tuple(tasks)
+        if chunk:
+            self.__seal()
+            self.__chunks.append((chunk, 0, len(chunk)))
+            self.__length += len(chunk)
+
+    def splice(self, other):
+        """ appends tasks of :param other: :class:`TaskQueue`, sharing its chunks """
+        other.__seal()
+        self.__seal()
+        self.__chunks.extend(other.__chunks)
+        self.__length += other.__length
+
+    def share(self):
+        """ :return: copy sharing chunks with this queue, popping one does not affect the other """
+        self.__seal()
+        shared = TaskQueue()
+        shared.__chunks.extend(self.__chunks)
+        shared.__length = self.__length
+        return shared
+
+    def popleft(self):
+        self.__seal()
+        if not self.__chunks:
+            raise IndexError("pop from an empty TaskQueue")
+        chunk, start, end = self.__chunks.popleft()
+        if start + 1 < end:
+            self.__chunks.appendleft((chunk, start + 1, end))
+        self.__length -= 1
+        return chunk[start]
+
+    def pop(self):
+        if self.__tail:
+            self.__length -= 1
+            return self.__tail.pop()
+        if not self.__chunks:
+            raise IndexError("pop from an empty TaskQueue")
+        chunk, start, end = self.__chunks.pop()
+        if start < end - 1:
+            self.__chunks.append((chunk, start, end - 1))
+        self.__length -= 1
+        return chunk[end - 1]
+
+    def remove(self, task):
+        """ removes the first occurrence of :param task:, splitting the chunk holding it """
+        self.__seal()
+        for index, (chunk, start, end) in enumerate(self.__chunks):
+            for position in xrange(start, end):
+                if chunk[position] == task:
+                    self.__chunks.rotate(-index)
+                    self.__chunks.popleft()
+                    for view in ((chunk, position + 1, end), (chunk, start, position)):
+                        if view[1] < view[2]:
+                            self.__chunks.appendleft(view)
+                    self.__chunks.rotate(index)
+                    self.__length -= 1
+                    return
+        raise ValueError("TaskQueue.remove(x): x not in queue")
+
+    def chunks_count(self):
+        return len(self.__chunks) + (1 if self.__tail else 0)
+
+    def __seal(self):
+        if self.__tail:
+            self.__chunks.append((tuple(self.__tail), 0, len(self.__tail)))
+            self.__tail = []
+
+    def __len__(self):
+        return self.__length
+
+    def __iter__(self):
+        for chunk, start, end in self.__chunks:
+            for position in xrange(start, end):
+                yield chunk[position]
+        for task in self.__tail:
+            yield task
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError("TaskQueue index out of range")
+        for chunk, start, end in self.__chunks:
+            if index < end - start:
+                return chunk[start + index]
+            index -= end - start
+        return self.__tail[index]
+
+
 class Solution(object):
     def __init__(self, machines_nr):
         self.__machines_nr = machines_nr
@@ -150,7 +267,7 @@ class Solution(object):
     def __initialize_machines_dicts(self, machines_nr):
         for i in xrange(machines_nr):
             self.__machines_start_times[i] = []
-            self.__machines_tasks[i] = []
+            self.__machines_tasks[i] = TaskQueue()
             self.__machines_end_times[i] = 0
 
     def append_task_to_machine(self, task, timestamp=0):
@@ -158,66 +275,99 @@ class Solution(object):
         self.__machines_tasks[machine_nr].append(task)
         self.__machines_end_times[machine_nr] = task.get_start_time() + task.get_duration()
 
+    def extend_machine(self, machine_nr, tasks):
+        """ bulk append of :param tasks: (ordered by start time) to :param machine_nr: """
+        tasks = tuple(tasks)
+        self.__machines_tasks[machine_nr].extend(tasks)
+        if tasks:
+            self.__machines_end_times[machine_nr] = tasks[-1].get_start_time() + tasks[-1].get_duration()
+
+    def splice(self, solution):
+        """ appends tasks of :param solution: in place, sharing its task chunks """
+        for m_nr in xrange(self.__machines_nr):
+            tasks = solution.get_tasks(m_nr)
+            if len(tasks):
+                self.__machines_tasks[m_nr].splice(tasks)
+                self.__machines_end_times[m_nr] = solution.__machines_end_times[m_nr]
+
+    def share(self):
+        """
+        :return: solution sharing tasks with this one, tasks popped from one of them stay in the other (and the tasks
+                 themselves are not modified by either)
+        """
+        shared = Solution(self.__machines_nr)
+        for m_nr in xrange(self.__machines_nr):
+            shared.__machines_tasks[m_nr] = self.__machines_tasks[m_nr].share()
+            shared.__machines_end_times[m_nr] = self.__machines_end_times[m_nr]
+        return shared
+
     def get_completion_time(self):
         return max(self.__machines_end_times.values())
 
     def pop_head_task(self, machine_number, time):
         head_task = self.__machines_tasks[machine_number][0]
-        print "TASK IN QUESTION: " + str(head_task)
         if time < head_task.get_start_time():
+            event_trace.current.emit(DEBUG, TASK_NOT_STARTED, time, machine_number, head_task.job.jid,
+                                     head_task.get_start_time())
             raise IndexError
-        print "PASSED"
+        event_trace.current.emit(DEBUG, TASK_POPPED, time, machine_number, head_task.job.jid,
+                                 head_task.get_start_time(), head_task.get_duration())
         self.__remove_first_task(machine_number)
         return head_task
 
+    def get_tasks_count(self):
+        return sum(len(tasks) for tasks in self.__machines_tasks.values())
+
     def get_tasks(self, machine_number):
         return self.__machines_tasks[machine_number]
 
     def remove_last_task(self, machine_number):
-        self.__machines_tasks[machine_number] = self.__machines_tasks[machine_number][:-1]
+        self.__machines_tasks[machine_number].pop()
 
     def __remove_first_task(self, machine_number):
-        self.__machines_tasks[machine_number].remove(self.__machines_tasks[machine_number][0])
+        self.__machines_tasks[machine_number].popleft()
 
     def append_clone_more_solution_part(self, new_solution):
-        raw_tasks = []
-        for m_nr in xrange(self.__machines_nr):
-            old_tasks = self.get_tasks(m_nr)
-            new_tasks = new_solution.get_tasks(m_nr)
-            raw_tasks.append(copy.deepcopy(old_tasks + new_tasks))
-        new_solution = Solution(self.__machines_nr)
-        for m_nr in xrange(self.__machines_nr):
-            for task in raw_tasks[m_nr]:
-                new_solution.append_task_to_machine(task)
-
-        return new_solution
+        """
+        :return: this solution followed by :param new_solution:, both left untouched. Task chunks and the tasks in
+                 them are shared, so neither the committed prefix nor the new part is copied; solutions never mutate
+                 their tasks, methods adjusting them put modified copies in place of the shared ones.
+        """
+        merged = self.share()
+        merged.splice(new_solution)
+        return merged
 
 
     def adjustTasksWithTime(self, time):
         for machine in self.__machines_tasks:
+            shifted_tasks = []
             for task in self.__machines_tasks[machine]:
-                task.set_start_time(task.get_start_time() + time)
+                shifted_task = copy.copy(task)  # the task may be shared with other solutions
+                shifted_task.set_start_time(task.get_start_time() + time)
+                shifted_tasks.append(shifted_task)
+            self.__machines_tasks[machine] = TaskQueue(shifted_tasks)
 
     def adjustSolutionToSubProblem(self, problem, oldPredictedProblem):
         for machine in self.__machines_tasks:
+            adjusted_tasks = []
             for task in self.__machines_tasks[machine]:
                 for oldJob in oldPredictedProblem.jobs_list:
                     if task.get_task_job().represents_same(oldJob):
-
-                        print 'they represent same!!'
-                        print task.get_task_job()
-                        print oldJob
+                        event_trace.current.emit(DEBUG, JOB_MATCHED, machine, task.get_task_job().get_jid(),
+                                                 oldJob.get_jid())
                         returnTask = self.get_equivalent_task_from_problem(task, problem)
                         if returnTask.duration == 0:
-                            self.__machines_tasks[machine].remove(task)
-                        else:
-                            task.duration = self.get_equivalent_task_from_problem(task, problem).duration
+                            task = None
+                            break
+                        task = copy.copy(task)  # the task may be shared with other solutions
+                        task.duration = returnTask.duration
+                if task is not None:
+                    adjusted_tasks.append(task)
+            self.__machines_tasks[machine] = TaskQueue(adjusted_tasks)
 
 
 
     def get_equivalent_task_from_problem(self, task, problem):
-        print "insider:"
-        print problem
         joblist = problem.get_jobs_list()
         flag = False
         if len(joblist) == 1:
@@ -226,15 +376,13 @@ class Solution(object):
                     wantedTask = taskk
                     flag = True
                     break
-                else:
-                    print "taskk: " + str(taskk)
-                    print "task: " + str(task)
             if not flag:
+                event_trace.current.emit(DEBUG, EQUIVALENT_TASK_MISSING, task.machine)
                 return Task(0, 0)
-            print task.duration
-            print wantedTask.duration
+            event_trace.current.emit(DEBUG, EQUIVALENT_TASK, task.machine, task.duration, wantedTask.duration)
             if (task.duration < wantedTask.duration):
-                print "something is fucked up"
+                logger.warning("Equivalent task at machine %s lasts longer than the predicted one: %s > %s",
+                               task.machine, wantedTask.duration, task.duration)
             joblist[0].tasks_list.remove(wantedTask)
             return wantedTask
         else:
@@ -283,22 +431,93 @@ class TimeMatrixConverter(object):
             tasks_list.append(Task(task, time_matrix[task][job_number]))
         return Job(self.id_generator.next(), tasks_list, arrival_time)
 
+    def file_to_problem(self, matrix_file, index, arrival_time=None):
+        """
+        :param matrix_file: :class:`matrix_io.MatrixFile`
+        :param arrival_time: overrides arrival times stored in the file if given
+        """
+        jids = [self.id_generator.next() for _ in xrange(matrix_file.jobs_count(index))]
+        return matrix_file.get_compact_problem(index, jids).to_problem(arrival_time)
+
     def window_to_matrix(self, job_window):
-        tasks_number = len(job_window.get_jobs()[0].get_tasks_list())
-        time_matrix = [[] for i in xrange(0, tasks_number)]
-        for job in job_window.get_jobs():
-            task_number = 0
-            for task in job.get_tasks_list():
-                time_matrix[task_number].append(task.duration)
-                task_number += 1
-        return time_matrix
+        return job_window.to_compact().to_time_matrix()
 
     def problem_to_matrix(self, problem):
-        tasks_number = len(problem.get_jobs_list()[0].get_tasks_list())
-        time_matrix = [[] for i in xrange(0, tasks_number)]
-        for job in problem.get_jobs_list():
-            task_number = 0
+        return problem.to_compact().to_time_matrix()
+
+
+def _array(typecode, values):
+    """ contiguous array of machine word integers, or a tuple when values are not integers """
+    try:
+        return array(typecode, values)
+    except TypeError:
+        return tuple(values)
+
+
+class CompactProblem(object):
+    """
+    Flat, read-only view of jobs: task k of job j is at index job_offsets[j] + k of machines and durations.
+    Instances share their arrays, modifications produce new instances (see with_durations).
+    """
+    __slots__ = ('jids', 'arrival_times', 'job_offsets', 'machines', 'durations')
+
+    def __init__(self, jids, arrival_times, job_offsets, machines, durations):
+        self.jids = jids
+        self.arrival_times = arrival_times
+        self.job_offsets = job_offsets
+        self.machines = machines
+        self.durations = durations
+
+    @staticmethod
+    def from_jobs(jobs):
+        job_offsets = [0]
+        machines = []
+        durations = []
+        for job in jobs:
             for task in job.get_tasks_list():
-                time_matrix[task_number].append(task.duration)
-                task_number += 1
-        return time_matrix
\ No newline at end of file
+                machines.append(task.get_task_machine())
+                durations.append(task.get_duration())
+            job_offsets.append(len(durations))
+        return CompactProblem(tuple(job.get_jid() for job in jobs), tuple(job.arrival_time for job in jobs),
+                              _array('l', job_offsets), _array('l', machines), _array('l', durations))
+
+    @staticmethod
+    def from_matrix(time_matrix, jids, arrival_time=0):
+        """ :param time_matrix: flow shop matrix, time_matrix[task][job] is processed at machine task """
+        tasks_number = len(time_matrix)
+        jobs_number = len(jids)
+        return CompactProblem(tuple(jids), (arrival_time,) * jobs_number,
+                              _array('l', xrange(0, (jobs_number + 1) * tasks_number, tasks_number)),
+                              _array('l', range(tasks_number) * jobs_number),
+                              _array('l', [time_matrix[task][job] for job in xrange(jobs_number)
+                                           for task in xrange(tasks_number)]))
+
+    def jobs_count(self):
+        return len(self.jids)
+
+    def tasks_count(self, job_index):
+        return self.job_offsets[job_index + 1] - self.job_offsets[job_index]
+
+    def get_durations(self, job_index):
+        return self.durations[self.job_offsets[job_index]:self.job_offsets[job_index + 1]]
+
+    def to_time_matrix(self):
+        """ :return: flow shop matrix, with as many rows as there are tasks in the first job """
+        if not self.jids:
+            raise IndexError("Problem has no jobs")
+        return [[self.durations[offset + task] for offset in self.job_offsets[:-1]]
+                for task in xrange(self.tasks_count(0))]
+
+    def with_durations(self, durations):
+        """ :return: copy sharing everything but :param durations: """
+        return CompactProblem(self.jids, self.arrival_times, self.job_offsets, self.machines, durations)
+
+    def to_problem(self, arrival_time=None):
+        """ :return: new Job/Task graph, arrival times are overridden with :param arrival_time: if given """
+        jobs_list = []
+        for job_index in xrange(self.jobs_count()):
+            tasks_list = [Task(self.machines[i], self.durations[i])
+                          for i in xrange(self.job_offsets[job_index], self.job_offsets[job_index + 1])]
+            job_arrival_time = self.arrival_times[job_index] if arrival_time is None else arrival_time
+            jobs_list.append(Job(self.jids[job_index], tasks_list, job_arrival_time))
+        return Problem(jobs_list)
\ No newline at end of file
@@ -1,4 +1,6 @@
 from problem import Job, JobUtil, Task, Problem, TimeMatrixConverter
+import csv
+import json
 import random
 
 counter = 0
@@ -111,49 +113,104 @@ class DistortedProblemGenerator(object):
         self.distortion_factor = distortion_factor
 
     def generate_distorted_problem(self, problem, arrival_time=0):
-        problem_active_execution_time = 0
-        distorted_job_list = problem.get_jobs_list()
-        for job in distorted_job_list:
-            problem_active_execution_time += JobUtil.calculate_active_execution_time(job)
-            job.arrival_time = arrival_time
-        expected_distortion_level = self.distortion_factor * problem_active_execution_time
+        return self.distort_compact_problem(problem.to_compact()).to_problem(arrival_time)
+
+    def distort_compact_problem(self, compact_problem):
+        """ :rtype: CompactProblem sharing everything but durations with :param compact_problem: """
+        durations = list(compact_problem.durations)  # copy-on-write: only the durations are distorted
+        expected_distortion_level = self.distortion_factor * sum(durations)
         distortion_level = 0
         while distortion_level < expected_distortion_level:
-            job = self.__draw_random_job(distorted_job_list)
-            task = self.__draw_random_task(job)
-            distortion_level += self.__distort_task(task)
-        return Problem(distorted_job_list)
+            job_index = self.__draw_random_job(compact_problem)
+            task_index = compact_problem.job_offsets[job_index] + self.__draw_random_task(compact_problem, job_index)
+            distortion_level += self.__distort_task(durations, task_index)
+        return compact_problem.with_durations(durations)
 
-    def __draw_random_job(self, jobs):
-        return jobs[random.randint(0, len(jobs)-1)]
+    def __draw_random_job(self, compact_problem):
+        return random.randint(0, compact_problem.jobs_count()-1)
 
-    def __draw_random_task(self, job):
-        tasks = job.get_tasks_list()
-        return tasks[random.randint(0, len(tasks)-1)]
+    def __draw_random_task(self, compact_problem, job_index):
+        return random.randint(0, compact_problem.tasks_count(job_index)-1)
 
-    def __distort_task(self, task):
-        distortion = int(round(task.duration * random.uniform(0, 2*self.distortion_factor)))
+    def __distort_task(self, durations, task_index):
+        distortion = int(round(durations[task_index] * random.uniform(0, 2*self.distortion_factor)))
         if random.randint(0, 1) == 0:
-            task.duration -= distortion
+            durations[task_index] -= distortion
         else:
-            task.duration += distortion
+            durations[task_index] += distortion
         return distortion
 
 
+_PENDING = object()
+_EXHAUSTED = object()
+
+
+def read_json_lines(path):
+    """ yields time matrices stored one per line, as JSON lists of processor rows """
+    with open(path) as feed:
+        for line in feed:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_csv(path):
+    """ yields time matrices stored as CSV rows of processing times, one row per processor, separated by blank lines """
+    with open(path) as feed:
+        time_matrix = []
+        for row in csv.reader(feed):
+            if row:
+                time_matrix.append([int(duration) for duration in row])
+            elif time_matrix:
+                yield time_matrix
+                time_matrix = []
+        if time_matrix:
+            yield time_matrix
+
+
 class ProblemProvider(object):
     def __init__(self, problems_feed):
-        self.problems_feed = problems_feed
+        """
+        :param problems_feed: iterable of time matrices: a list, a generator or one of the file readers; it is
+                              consumed lazily, at most one matrix ahead of the problems provided so far. Jobs of a
+                              matrix_io.MatrixFile arrive at their stored arrival times, but not before the problem
+                              is provided
+        """
+        self.__matrix_file = problems_feed if hasattr(problems_feed, "get_compact_problem") else None
+        self.__problems = iter(problems_feed) if self.__matrix_file is None else iter(xrange(len(problems_feed)))
+        self.__next_problem = _PENDING
         self.current_idx = 0
 
+    @staticmethod
+    def from_json_lines(path):
+        return ProblemProvider(read_json_lines(path))
+
+    @staticmethod
+    def from_csv(path):
+        return ProblemProvider(read_csv(path))
+
+    @staticmethod
+    def from_matrix_file(path):
+        """ :param path: file written by matrix_io.write_problems, memory mapped and read one matrix at a time """
+        from pyage.jobshop.matrix_io import MatrixFile
+        return ProblemProvider(MatrixFile(path))
+
     def provide_next(self, arrival_time):
-        if self.current_idx >= len(self.problems_feed):
+        if not self.has_next():
             raise IndexError
-        idx = self.current_idx
+        next_problem = self.__next_problem  # a time matrix, or an index into the matrix file
+        self.__next_problem = _PENDING
         self.current_idx += 1
-        return TimeMatrixConverter(Counter()).matrix_to_problem(self.problems_feed[idx], arrival_time)
+        if self.__matrix_file is not None:
+            problem = TimeMatrixConverter(Counter()).file_to_problem(self.__matrix_file, next_problem)
+            for job in problem.jobs_list:  # new jobs, not shared with anything yet
+                job.arrival_time = max(job.arrival_time, arrival_time)
+            return problem
+        return TimeMatrixConverter(Counter()).matrix_to_problem(next_problem, arrival_time)
 
     def has_next(self):
-        return self.current_idx < len(self.problems_feed)
+        if self.__next_problem is _PENDING:
+            self.__next_problem = next(self.__problems, _EXHAUSTED)
+        return self.__next_problem is not _EXHAUSTED
 
 
 class RandomizedTasksProvider(object):
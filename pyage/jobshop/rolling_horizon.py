@@ -1,5 +1,10 @@
-from Queue import PriorityQueue
-from problem import JobUtil
+from problem import CompactProblem, JobUtil
+
+RANK = 0
+KEY = 1
+JOB = 2
+LEFT = 3
+RIGHT = 4
 
 
 class JobWindow(object):
@@ -24,32 +29,87 @@ class JobWindow(object):
     def get_jobs(self):
         return list(self.__jobs)
 
+    def to_compact(self):
+        return CompactProblem.from_jobs(self.__jobs)
+
     def __str__(self):
         return "JobWindow [predictive_time=" + str(self.__predictive_time) + ", total_active_execution_time=" + \
                str(self.__total_active_execution_time) + ", jobs=" + str(self.__jobs) + "]"
 
 
 class JobBacklog(object):
+    """
+    Jobs ordered by JobPrioritizer, in order of addition among equal priorities.
+
+    Backed by a persistent leftist heap of (rank, key, job, left, right) tuples. Nodes are never modified, so
+    snapshot() and restore() only save and swap the root in O(1), and a snapshot stays valid whatever happens to
+    the backlog afterwards. No locks are taken, the backlog is owned by a single master.
+    """
+
     def __init__(self):
-        self._jobs_priority_queue = PriorityQueue()
+        self.__root = None
+        self.__size = 0
+        self.__sequence = 0
 
     def add_problem(self, problem):
         for job in problem.jobs_list:
             self.add_job(job)
 
     def add_job(self, job):
-        self._jobs_priority_queue.put((JobPrioritizer.prioritize(job), job))
+        self.__sequence += 1
+        node = (1, (JobPrioritizer.prioritize(job), self.__sequence), job, None, None)
+        self.__root = _merge(self.__root, node)
+        self.__size += 1
 
     def is_empty(self):
-        return self._jobs_priority_queue.empty()
+        return self.__root is None
 
     def pop_top_priority_job(self):
         if self.is_empty():
             raise Exception("Backlog is empty")
-        return self._jobs_priority_queue.get()[1]
+        job = self.__root[JOB]
+        self.__root = _merge(self.__root[LEFT], self.__root[RIGHT])
+        self.__size -= 1
+        return job
 
     def size(self):
-        return self._jobs_priority_queue.qsize()
+        return self.__size
+
+    def snapshot(self):
+        return self.__root, self.__size
+
+    def restore(self, snapshot):
+        self.__root, self.__size = snapshot
+
+    def pop_window(self, predictive_time):
+        """ :return: JobWindow filled with top priority jobs, which are removed from the backlog """
+        job_window = JobWindow(predictive_time)
+        while not job_window.is_full() and not self.is_empty():
+            job_window.add_job(self.pop_top_priority_job())
+        return job_window
+
+    def peek_window(self, predictive_time):
+        """ :return: JobWindow pop_window would return, the backlog is left unchanged """
+        snapshot = self.snapshot()
+        try:
+            return self.pop_window(predictive_time)
+        finally:
+            self.restore(snapshot)
+
+
+def _merge(first, second):
+    """ :return: root of a new leftist heap of both heaps' nodes, sharing all but the right spine with them """
+    if first is None:
+        return second
+    if second is None:
+        return first
+    if second[KEY] < first[KEY]:
+        first, second = second, first
+    left = first[LEFT]
+    right = _merge(first[RIGHT], second)
+    if left is None or left[RANK] < right[RANK]:
+        left, right = right, left
+    return (right[RANK] + 1 if right is not None else 1), first[KEY], first[JOB], left, right
 
 
 class JobPrioritizer(object):
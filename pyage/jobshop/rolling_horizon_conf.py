@@ -11,7 +11,7 @@ from pyage.jobshop.flowshop_genetics import FirstHalfSwapsCrossover
 from pyage.jobshop.flowshop_genetics import FlowShopEvaluation
 from pyage.jobshop.flowshop_genetics import PermutationInitializer
 from pyage.jobshop.flowshop_genetics import PermutationMutation
-from pyage.jobshop.manufacture import Manufacture
+from pyage.jobshop.manufacture import EventDrivenManufacture
 from pyage.jobshop.statistics import GanttStatistics
 from pyage.jobshop.timeKeeper import TimeKeeper
 from pyage.solutions.evolution.selection import TournamentSelection
@@ -38,13 +38,13 @@ WINDOW_TIME = 250
 machines_number = len(time_matrix())
 
 timeKeeper = lambda: TimeKeeper(1, 1)
-manufacture = lambda: Manufacture(machines_number)
+manufacture = lambda: EventDrivenManufacture(machines_number)
 stop_condition = lambda: StepLimitStopCondition(1000)
 
 slaves = generate_agents("flowshop", AGENTS_COUNT, Agent)
 agents = masters_factory(AGENTS_COUNT, WINDOW_TIME, time_matrix())
 
-evaluation = lambda: FlowShopEvaluation(time_matrix())
+evaluation = lambda: FlowShopEvaluation(time_matrix(), batched=True)
 initializer = lambda: PermutationInitializer(JOBS_COUNT, POPULATION_SIZE)
 operators = lambda: [
     FirstHalfSwapsCrossover(),
@@ -0,0 +1,151 @@
+import logging
+import multiprocessing
+import random
+import traceback
+
+from flowshop_genetics import PermutationGenotype
+from islands import accept_immigrants, elite_permutations
+
+logger = logging.getLogger(__name__)
+
+STEP = "step"
+RESET = "reset"
+BEST = "best"
+ELITES = "elites"
+IMMIGRATE = "immigrate"
+STOP = "stop"
+
+
+class SlavePool(object):
+    """
+    Distributes slaves across persistent worker processes.
+
+    Workers are forked once, so each of them inherits the already injected slaves and owns their populations from
+    then on. The master only sends commands and receives the best permutation and makespan of every slave.
+    """
+
+    def __init__(self, slaves, processes, reset_slave):
+        """
+        :param slaves: dict of slaves, as injected into the master
+        :param processes: number of worker processes
+        :param reset_slave: function(slave, time_matrix[, jids]) preparing a slave for a new job window, run in the
+                            workers
+        """
+        self.__keys = sorted(slaves.keys())
+        self.__connections = []
+        self.__workers = []
+        self.__best = {}
+        processes = max(1, min(processes, len(self.__keys)))
+        for worker_nr in xrange(processes):
+            worker_slaves = dict((key, slaves[key]) for key in self.__keys[worker_nr::processes])
+            master_end, worker_end = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_serve,
+                                             args=(worker_end, worker_slaves, reset_slave, random.getrandbits(32)))
+            worker.daemon = True
+            worker.start()
+            worker_end.close()
+            self.__connections.append(master_end)
+            self.__workers.append(worker)
+        logger.info("Started %d slave workers for %d slaves", processes, len(self.__keys))
+
+    def keys(self):
+        return list(self.__keys)
+
+    def step(self, steps=1):
+        """ steps every slave :param steps: times, workers run in parallel """
+        self.__broadcast(STEP, steps)
+        self.__best = {}
+
+    def reset(self, time_matrices, jids=None):
+        """
+        :param time_matrices: dict slave key -> time matrix of the job window assigned to the slave
+        :param jids: optional dict slave key -> jids of the job window, passed on to reset_slave
+        """
+        self.__broadcast(RESET, (time_matrices, jids))
+        self.__best = {}
+
+    def get_best_genotypes(self):
+        """ :return: list of best PermutationGenotype of every slave, ordered by slave key """
+        if not self.__best:
+            for best in self.__broadcast(BEST):
+                self.__best.update(best)
+        return [self.__best[key] for key in self.__keys]
+
+    def get_elites(self, count):
+        """ :return: dict slave key -> permutations (arrays) of :param count: best genotypes of the slave """
+        elites = {}
+        for worker_elites in self.__broadcast(ELITES, count):
+            elites.update(worker_elites)
+        return elites
+
+    def immigrate(self, immigrants):
+        """ :param immigrants: dict slave key -> permutations replacing the worst genotypes of the slave """
+        self.__broadcast(IMMIGRATE, immigrants)
+        self.__best = {}
+
+    def close(self):
+        for connection in self.__connections:
+            try:
+                connection.send((STOP, None))
+                connection.close()
+            except IOError:
+                pass
+        for worker in self.__workers:
+            worker.join()
+        self.__connections = []
+        self.__workers = []
+
+    def __broadcast(self, command, argument=None):
+        for connection in self.__connections:
+            connection.send((command, argument))
+        results = []
+        for connection in self.__connections:
+            succeeded, result = connection.recv()
+            if not succeeded:
+                raise RuntimeError("Slave worker failed:\n" + result)
+            results.append(result)
+        return results
+
+
+def _serve(connection, slaves, reset_slave, seed):
+    random.seed(seed)
+    while True:
+        command, argument = connection.recv()
+        if command == STOP:
+            break
+        try:
+            connection.send((True, _execute(slaves, reset_slave, command, argument)))
+        except Exception:
+            connection.send((False, traceback.format_exc()))
+    connection.close()
+
+
+def _execute(slaves, reset_slave, command, argument):
+    if command == STEP:
+        for _ in xrange(argument):
+            for slave in slaves.values():
+                slave.step()
+    elif command == RESET:
+        time_matrices, jids = argument
+        for key, time_matrix in time_matrices.items():
+            if key in slaves:
+                if jids is None:
+                    reset_slave(slaves[key], time_matrix)
+                else:
+                    reset_slave(slaves[key], time_matrix, jids[key])
+    elif command == BEST:
+        best = {}
+        for key, slave in slaves.items():
+            genotype = slave.get_best_genotype()
+            best_genotype = PermutationGenotype(list(genotype.permutation))
+            best_genotype.fitness = genotype.fitness
+            best[key] = best_genotype
+        return best
+    elif command == ELITES:
+        return dict((key, elite_permutations(slave, argument)) for key, slave in slaves.items())
+    elif command == IMMIGRATE:
+        for key, permutations in argument.items():
+            if key in slaves:
+                accept_immigrants(slaves[key], permutations)
+    else:
+        raise ValueError("Unknown command: %s" % command)
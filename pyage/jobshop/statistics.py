@@ -19,11 +19,12 @@ class DummyStats(Statistics):
 		pass
 
 class GanttStatistics():
-    gantt = GanttGenerator('gantt')
+    def __init__(self, out_dir='gantt', output_format='png'):
+        self.gantt = GanttGenerator(out_dir, output_format)
+
     def update(self, step_count, agents):
         pass
 
     def summarize(self, stats):
-        for a in stats:
-            self.gantt.add_task(a[0], a[1], a[2], a[3])
-            self.gantt.generate(a[4])
+        self.gantt.add_tasks(stats)
+        self.gantt.generate('Gantt')
@@ -1,14 +1,16 @@
 from gantt_generator import GanttGenerator
 
 class GanttStats():
+    """ writes a Gantt chart of the history summarized so far, one image per summarize call (i.e. per window) """
 
-    def __init__(self):
-        self.gantt = GanttGenerator('gantt')
+    def __init__(self, out_dir='gantt', output_format='png'):
+        self.gantt = GanttGenerator(out_dir, output_format)
+        self.summaries = 0
 
     def update(self, step_count, agents):
         pass
 
     def summarize(self, stats):
-        for a in stats:
-            self.gantt.add_task(a[0], a[1], a[2], a[3])
-            self.gantt.generate(a[4])
\ No newline at end of file
+        self.gantt.add_tasks(stats)
+        self.summaries += 1
+        self.gantt.generate('Window ' + str(self.summaries))
@@ -0,0 +1,127 @@
+"""
+Runs the launcher experiment grid (matrices x distortion factors x numbers of aggregates x repeats) in parallel.
+
+Every cell of the grid is computed by launcher.launch_computation in a fresh worker process, so module level state
+(inject.resolve_attr, id counters, Manufacture.history, the shared stop condition) never leaks between cells. Results
+are appended to a JSON-lines file as soon as a cell finishes; re-running with the same output file skips the cells
+already recorded there, so a crashed sweep can be resumed. The sweep is the parallelism: slaves of a cell are
+stepped in its worker process, whatever launcher_config_small.processes says.
+
+usage: python sweep.py --output sweep.jsonl --processes 32 --seed 0
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+import traceback
+
+import launcher
+import launcher_config_small as l_conf
+
+from pyage.core.lazy import optional
+numpy = optional("numpy")
+
+logger = logging.getLogger(__name__)
+
+
+def grid_cells(base_seed=0):
+    """ :return: list of dicts describing every launch_computation run of launcher.main """
+    cells = []
+    for matrix_nr in xrange(len(l_conf.matrices)):
+        for distortion_factor in l_conf.distortion_factors:
+            for number_of_aggregates in l_conf.numbers_of_aggregates:
+                for repeat in xrange(l_conf.repeats):
+                    cells.append({
+                        "cell": "m{0}-d{1}-a{2}-r{3}".format(matrix_nr, distortion_factor, number_of_aggregates,
+                                                             repeat),
+                        "matrix": matrix_nr,
+                        "distortion_factor": distortion_factor,
+                        "aggregates": number_of_aggregates,
+                        "population": l_conf.aggregate_sizes,
+                        "repeat": repeat,
+                        "seed": base_seed + len(cells)
+                    })
+    return cells
+
+
+def completed_cells(output_path):
+    """ :return: set of names of cells successfully recorded in :param output_path: """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path) as output:
+        for line in output:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # line truncated by a crash
+            if "error" not in record:
+                completed.add(record["cell"])
+    return completed
+
+
+def run_cell(cell):
+    """ executed in a worker process, never raises: failures are reported in the returned record """
+    random.seed(cell["seed"])
+    if numpy is not None:
+        numpy.random.seed(cell["seed"])
+    sys.stdout = open(os.devnull, "w")  # masters print their histories, results go to the output file only
+    record = dict(cell)
+    start = time.time()
+    try:
+        initial_problem = l_conf.matrices[cell["matrix"]]
+        incoming_problems = launcher.get_incoming_problems(initial_problem, cell["distortion_factor"])
+        # cells run concurrently in one working directory: no Gantt charts, which would overwrite each other;
+        # slaves are stepped in process, as daemonic pool workers can't start SlavePool processes of their own
+        record.update(launcher.launch_computation(cell["aggregates"], cell["population"], initial_problem,
+                                                  incoming_problems, cell["distortion_factor"], render_gantt=False,
+                                                  processes=0))
+    except Exception:
+        record["error"] = traceback.format_exc()
+    record["wall_time"] = time.time() - start
+    return record
+
+
+def run_sweep(output_path, processes=None, base_seed=0):
+    """ :return: number of cells computed by this run """
+    completed = completed_cells(output_path)
+    cells = [cell for cell in grid_cells(base_seed) if cell["cell"] not in completed]
+    logger.info("%d cells already completed, %d to go", len(completed), len(cells))
+    if not cells:
+        return 0
+    if l_conf.processes > 0:
+        logger.info("Slaves are stepped in cell processes, processes = %d of the launcher config is ignored",
+                    l_conf.processes)
+    pool = multiprocessing.Pool(processes, maxtasksperchild=1)  # fresh process, hence fresh globals, per cell
+    try:
+        with open(output_path, "a") as output:
+            for record in pool.imap_unordered(run_cell, cells):
+                output.write(json.dumps(record, sort_keys=True) + "\n")
+                output.flush()
+                if "error" in record:
+                    logger.warning("Cell %s failed:\n%s", record["cell"], record["error"])
+                else:
+                    logger.info("Cell %s: makespan=%s, steps=%s, wall_time=%.2fs", record["cell"],
+                                record["makespan"], record["steps"], record["wall_time"])
+    finally:
+        pool.close()
+        pool.join()
+    return len(cells)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs launcher experiment grid in parallel worker processes")
+    parser.add_argument("--output", default="sweep.jsonl", help="JSON-lines results file, appended to and resumed")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes, defaults to cpu count")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first cell, next cells use seed + n")
+    args = parser.parse_args()
+    run_sweep(args.output, args.processes, args.seed)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,91 @@
+import random
+from unittest import TestCase
+from agents import AnytimeBudget, GeneticsHelper, MasterAgent, get_window_budget
+from flowshop_genetics import FirstHalfSwapsCrossover, FlowShopEvaluation, PermutationInitializer, PermutationMutation
+from pyage.core import inject
+from pyage.core.profiling import OperatorProfiler
+from pyage.solutions.evolution.selection import TournamentSelection
+from rolling_horizon import JobWindow
+from problem import TimeMatrixConverter
+from problemGenerator import Counter
+
+
+class EvolvingSlave(object):
+    def __init__(self, time_matrix, population_size=10):
+        self.operators = [FirstHalfSwapsCrossover(2 * population_size), PermutationMutation(2),
+                          FlowShopEvaluation(time_matrix), TournamentSelection(size=population_size,
+                                                                               tournament_size=population_size)]
+        self.initializer = PermutationInitializer(len(time_matrix[0]), population_size)
+        self.population = []
+
+    def initialize(self):
+        self.initializer.process(self.population)
+
+    def step(self):
+        for operator in self.operators:
+            operator.process(self.population)
+
+    def get_best_genotype(self):
+        return max(self.population, key=lambda g: g.fitness)
+
+
+class TestAnytimeSolving(TestCase):
+    def setUp(self):
+        rng = random.Random(3)  # module-global random state is left to the code under test
+        self.time_matrix = [[rng.randint(1, 50) for _ in xrange(12)] for _ in xrange(5)]
+        window = JobWindow(sum(map(sum, self.time_matrix)))
+        for job in TimeMatrixConverter(Counter()).matrix_to_problem(self.time_matrix).jobs_list:
+            window.add_job(job)
+        self.helper = GeneticsHelper(window)
+
+    def test_respects_evaluations_budget(self):
+        result = self.helper.solve_anytime([EvolvingSlave(self.time_matrix)], AnytimeBudget(evaluations=500))
+        self.assertTrue(1 < result.steps)
+        self.assertTrue(result.evaluations <= 500)
+        self.assertEqual(result.makespan, FlowShopEvaluation(self.time_matrix).compute_makespan(result.permutation))
+        makespans = [makespan for _, _, makespan in result.trace]
+        self.assertEqual(sorted(set(makespans), reverse=True), makespans)
+        self.assertEqual(result.makespan, makespans[-1])
+
+    def test_shares_budget_between_slaves(self):
+        slaves = [EvolvingSlave(self.time_matrix), EvolvingSlave(self.time_matrix)]
+        result = self.helper.solve_anytime(slaves, AnytimeBudget(evaluations=500))
+        self.assertTrue(result.evaluations <= 500)
+        self.assertEqual(sum(slave.operators[2].evaluations for slave in slaves), result.evaluations)
+
+    def test_runs_single_generation_without_budget(self):
+        result = self.helper.solve_anytime([EvolvingSlave(self.time_matrix)], AnytimeBudget())
+        self.assertEqual(1, result.steps)
+        self.assertEqual(1, len(result.trace))
+
+    def test_stops_at_deadline(self):
+        result = self.helper.solve_anytime([EvolvingSlave(self.time_matrix)], AnytimeBudget(time=20))
+        self.assertTrue(1 <= result.steps)
+        self.assertTrue(result.elapsed < 1000)
+
+    def test_budget_per_window(self):
+        budget = AnytimeBudget(evaluations=100)
+        self.assertIs(budget, get_window_budget(budget, 3))
+        self.assertEqual(300, get_window_budget(lambda window: AnytimeBudget(evaluations=100 * window), 3).evaluations)
+
+
+class ProfiledSlave(object):
+    profiler = OperatorProfiler()
+
+
+class TestInProcessOnlyOptions(TestCase):
+    def setUp(self):
+        self.resolve_attr = inject.resolve_attr
+        inject.resolve_attr = inject.CachingResolver({"slaves": lambda: {"slave": ProfiledSlave()},
+                                                      "manufacture": lambda: None, "timeKeeper": lambda: None,
+                                                      "stop_condition": lambda: None,
+                                                      "problem_provider": lambda: None})
+
+    def tearDown(self):
+        inject.resolve_attr = self.resolve_attr
+
+    def test_rejects_window_budget_in_worker_processes(self):
+        self.assertRaises(ValueError, MasterAgent, [[1]], 10, processes=2, window_budget=AnytimeBudget())
+
+    def test_rejects_profiled_slaves_in_worker_processes(self):
+        self.assertRaises(ValueError, MasterAgent, [[1]], 10, processes=2)
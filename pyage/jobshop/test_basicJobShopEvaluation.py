@@ -0,0 +1,32 @@
+from unittest import TestCase
+from genetic_classes import BasicJobShopEvaluation, JobShopGenotype
+from problem import Job, Task, Problem
+
+
+class TestBasicJobShopEvaluation(TestCase):
+    def setUp(self):
+        self.evaluation = BasicJobShopEvaluation(2)
+        self.job_1 = Job(1, [Task(0, 3), Task(1, 2)])
+        self.job_2 = Job(2, [Task(1, 4), Task(0, 1)])
+        self.genes = [self.job_1, self.job_2, self.job_1, self.job_2]
+
+    def test_schedule_starts_tasks_as_soon_as_machine_and_job_are_free(self):
+        solution = self.evaluation.schedule(self.genes)
+        self.assertEqual([t.get_start_time() for t in solution.get_tasks(0)], [0, 4])
+        self.assertEqual([t.get_start_time() for t in solution.get_tasks(1)], [0, 4])
+        self.assertEqual(solution.get_completion_time(), 6)
+
+    def test_schedule_does_not_modify_genes(self):
+        self.evaluation.schedule(self.genes)
+        self.assertEqual([t.get_start_time() for t in self.job_1.get_tasks_list()], [-1, -1])
+
+    def test_process_assigns_negated_makespan(self):
+        genotype = JobShopGenotype(Problem([self.job_1, self.job_2]))
+        self.evaluation.process([genotype])
+        self.assertEqual(genotype.fitness, -6)
+
+    def test_makespan_does_not_depend_on_time_resolution(self):
+        long_job = Job(3, [Task(0, 10 ** 9), Task(1, 10 ** 9)])
+        genotype = JobShopGenotype(Problem([long_job]))
+        self.evaluation.process([genotype])
+        self.assertEqual(genotype.fitness, -2 * 10 ** 9)
@@ -0,0 +1,39 @@
+from unittest import TestCase
+from problem import CompactProblem, Job, Problem, Task
+
+
+class TestCompactProblem(TestCase):
+    def setUp(self):
+        self.problem = Problem([Job(1, [Task(0, 3), Task(1, 4)], 2), Job(2, [Task(1, 5), Task(0, 6)], 7)])
+
+    def test_from_jobs_flattens_tasks(self):
+        compact_problem = self.problem.to_compact()
+        self.assertEqual((1, 2), compact_problem.jids)
+        self.assertEqual((2, 7), compact_problem.arrival_times)
+        self.assertEqual([0, 2, 4], list(compact_problem.job_offsets))
+        self.assertEqual([0, 1, 1, 0], list(compact_problem.machines))
+        self.assertEqual([5, 6], list(compact_problem.get_durations(1)))
+
+    def test_to_time_matrix_is_indexed_by_task_then_job(self):
+        self.assertEqual([[3, 5], [4, 6]], self.problem.to_compact().to_time_matrix())
+
+    def test_from_matrix_round_trips(self):
+        time_matrix = [[1, 2, 3], [4, 5, 6]]
+        compact_problem = CompactProblem.from_matrix(time_matrix, [7, 8, 9])
+        self.assertEqual(time_matrix, compact_problem.to_time_matrix())
+        self.assertEqual([0, 1], list(compact_problem.machines[2:4]))
+
+    def test_with_durations_shares_everything_else(self):
+        compact_problem = self.problem.to_compact()
+        distorted = compact_problem.with_durations([1, 1, 1, 1])
+        self.assertIs(compact_problem.machines, distorted.machines)
+        self.assertEqual([3, 4, 5, 6], list(compact_problem.durations))
+
+    def test_to_problem_overrides_arrival_time(self):
+        problem = self.problem.to_compact().to_problem(9)
+        self.assertEqual([9, 9], [job.arrival_time for job in problem.jobs_list])
+        self.assertEqual([3, 4, 5, 6], list(problem.to_compact().durations))
+
+    def test_non_integer_tasks_are_kept(self):
+        compact_problem = Problem([Job("jid", [Task("machine", "duration")])]).to_compact()
+        self.assertEqual(("machine",), compact_problem.machines)
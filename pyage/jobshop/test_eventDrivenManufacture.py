@@ -0,0 +1,81 @@
+import random
+from unittest import TestCase
+from flowshop_genetics import FlowShopEvaluation
+from manufacture import EventDrivenManufacture
+from problem import Job, Solution, Task
+
+
+class TestEventDrivenManufacture(TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.time_matrix = [[rng.randint(1, 20) for _ in xrange(8)] for _ in xrange(4)]
+        self.evaluation = FlowShopEvaluation(self.time_matrix)
+
+    def test_simulates_flow_shop_makespan(self):
+        permutation = [3, 0, 7, 1, 6, 2, 5, 4]
+        manufacture = EventDrivenManufacture(4)
+        for job in permutation:
+            for machine in xrange(4):
+                manufacture.add_task(machine, job, 0, self.time_matrix[machine][job])
+        self.assertEqual(self.evaluation.compute_makespan(permutation), manufacture.run())
+        self.assertEqual(32, len(manufacture.get_history()))
+
+    def test_window_schedule_is_executed_as_planned(self):
+        permutation = [5, 2, 0, 4, 1, 7, 3, 6]
+        completion_times = self.evaluation.compute_makespan(permutation, True)[1]
+        jids = range(100, 108)
+        manufacture = EventDrivenManufacture(4)
+        manufacture.add_window_schedule(self.time_matrix, permutation, completion_times, jids, offset=50)
+        self.assertEqual(50 + completion_times[-1][-1], manufacture.run())
+        for machine, jid, start, duration, _ in manufacture.get_history():
+            position = permutation.index(jids.index(jid))
+            self.assertEqual(50 + completion_times[machine][position], start + duration)
+
+    def test_waits_for_release_and_previous_task_of_job(self):
+        manufacture = EventDrivenManufacture(2)
+        manufacture.add_task(1, 7, 0, 4)
+        manufacture.add_task(0, 8, 0, 5)
+        manufacture.add_task(1, 8, 0, 2)
+        manufacture.add_task(0, 9, 10, 1)
+        manufacture.time_tick(4)
+        self.assertEqual([[0, 8, 0, 5, 'Tick 0'], [1, 7, 0, 4, 'Tick 0']], manufacture.get_history())
+        self.assertEqual(11, manufacture.run())
+        self.assertEqual([[1, 8, 5, 2, 'Tick 5'], [0, 9, 10, 1, 'Tick 10']], manufacture.get_history()[2:])
+
+    def test_does_not_start_tasks_in_the_past(self):
+        manufacture = EventDrivenManufacture(1)
+        manufacture.time_tick(20)
+        manufacture.add_task(0, 1, 5, 3)
+        self.assertEqual(23, manufacture.run())
+
+    def test_tasks_wait_for_their_jobs_across_machines(self):
+        manufacture = EventDrivenManufacture(2)
+        manufacture.add_task(0, 1, 0, 1)
+        manufacture.add_task(1, 1, 0, 1)
+        manufacture.add_task(1, 2, 0, 1)
+        manufacture.add_task(0, 2, 0, 1)
+        manufacture.add_task(0, 3, 0, 1)
+        manufacture.add_task(1, 3, 0, 1)
+        self.assertEqual(6, manufacture.run())
+        self.assertEqual([0, 1, 2, 3, 4, 5], list(manufacture.executed_tasks))
+
+    def test_assigns_solution(self):
+        first, second = Task(0, 3), Task(1, 2)
+        Job(1, [first, second])
+        first.set_start_time(1)
+        second.set_start_time(4)
+        solution = Solution(2)
+        solution.append_task_to_machine(second)
+        solution.append_task_to_machine(first)
+        manufacture = EventDrivenManufacture(2)
+        manufacture.assign_tasks(solution)
+        self.assertTrue(manufacture.tasks_assigned())
+        self.assertEqual(6, manufacture.run())
+
+    def test_long_horizon(self):
+        manufacture = EventDrivenManufacture(3)
+        for job in xrange(5000):
+            for machine in xrange(3):
+                manufacture.add_task(machine, job, 2 * job, 1)
+        self.assertEqual(2 * 4999 + 3, manufacture.run())
+        self.assertEqual(15000, len(manufacture.executed_tasks))
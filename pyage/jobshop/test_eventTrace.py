@@ -0,0 +1,70 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+from StringIO import StringIO
+from unittest import TestCase
+from pyage.jobshop import event_trace
+from pyage.jobshop.event_trace import DEBUG, INFO, TASK_NOT_STARTED, TASK_POPPED, BinarySink, EventTrace, \
+    JsonLinesSink, read_binary
+from pyage.jobshop.problem import Job, Solution, Task
+
+
+class TestEventTrace(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_keeps_last_events_of_enabled_levels(self):
+        trace = EventTrace(level=INFO, capacity=2)
+        trace.emit(DEBUG, TASK_POPPED, 0, 0, 0, 0, 0)
+        for time in xrange(3):
+            trace.emit(INFO, TASK_NOT_STARTED, time, 1, 2, 5)
+        self.assertEqual([(INFO, TASK_NOT_STARTED, (1, 1, 2, 5)), (INFO, TASK_NOT_STARTED, (2, 1, 2, 5))],
+                         trace.get_events())
+        self.assertEqual("TASK NOT STARTED: time 2, machine 1, job 2, start at 5", trace.dump()[-1])
+
+    def test_disabled_by_default(self):
+        trace = EventTrace()
+        trace.emit(INFO, TASK_POPPED, 0, 0, 0, 0, 0)
+        self.assertEqual([], trace.get_events())
+        self.assertFalse(trace.is_enabled_for(INFO))
+
+    def test_streams_to_json_lines_sink(self):
+        path = os.path.join(self.directory, "trace.jsonl")
+        trace = EventTrace(level=DEBUG, sink=JsonLinesSink(path))
+        trace.emit(DEBUG, TASK_POPPED, 4, 1, 7, 3, 9)
+        trace.close()
+        with open(path) as trace_file:
+            self.assertEqual([{"level": DEBUG, "event": TASK_POPPED, "args": [4, 1, 7, 3, 9]}],
+                             [json.loads(line) for line in trace_file])
+
+    def test_binary_sink_round_trip(self):
+        path = os.path.join(self.directory, "trace.bin")
+        trace = EventTrace(level=DEBUG, sink=BinarySink(path))
+        trace.emit(DEBUG, TASK_POPPED, 4, 1, 7, 3, 9)
+        trace.emit(INFO, TASK_NOT_STARTED, 5, 0, -1, 2 ** 40)
+        trace.close()
+        self.assertEqual(trace.get_events(), list(read_binary(path)))
+
+    def test_solution_emits_instead_of_printing(self):
+        task = Task(1, 3)
+        Job(7, [task])
+        task.set_start_time(2)
+        solution = Solution(2)
+        solution.append_task_to_machine(task)
+        previous = event_trace.install(EventTrace(level=DEBUG))
+        stdout, sys.stdout = sys.stdout, StringIO()
+        try:
+            self.assertRaises(IndexError, lambda: solution.pop_head_task(1, 1))
+            self.assertIs(task, solution.pop_head_task(1, 2))
+            printed = sys.stdout.getvalue()
+            events = event_trace.current.get_events()
+        finally:
+            sys.stdout = stdout
+            event_trace.install(previous)
+        self.assertEqual("", printed)
+        self.assertEqual([(DEBUG, TASK_NOT_STARTED, (1, 1, 7, 2)), (DEBUG, TASK_POPPED, (2, 1, 7, 2, 3))], events)
@@ -0,0 +1,74 @@
+from unittest import TestCase
+from fitness_cache import FitnessCache
+from flowshop_genetics import FlowShopEvaluation, OpenShopEvaluation, PermutationGenotype
+
+
+class TestFitnessCache(TestCase):
+    def setUp(self):
+        self.cache = FitnessCache(max_size=2)
+        self.token = object()
+
+    def test_get_counts_hits_and_misses(self):
+        self.cache.put(self.token, [0, 1, 2], -10)
+        self.assertEqual(self.cache.get(self.token, [0, 1, 2]), -10)
+        self.assertIsNone(self.cache.get(self.token, [2, 1, 0]))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_entries_of_other_time_matrix_are_not_returned(self):
+        self.cache.put(self.token, [0, 1, 2], -10)
+        self.assertIsNone(self.cache.get(object(), [0, 1, 2]))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.put(self.token, [0, 1], -1)
+        self.cache.put(self.token, [1, 0], -2)
+        self.cache.get(self.token, [0, 1])
+        self.cache.put(self.token, [0, 1, 2], -3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(self.token, [1, 0]))
+        self.assertEqual(self.cache.get(self.token, [0, 1]), -1)
+
+
+class TestCachedFlowShopEvaluation(TestCase):
+    def setUp(self):
+        self.cache = FitnessCache()
+        self.evaluation = FlowShopEvaluation([[1, 2], [3, 4]], cache=self.cache)
+
+    def test_known_genotypes_are_not_evaluated_again(self):
+        self.evaluation.process([PermutationGenotype([0, 1])])
+        population = [PermutationGenotype([0, 1]), PermutationGenotype([1, 0])]
+        self.evaluation.process(population)
+        self.assertEqual([g.fitness for g in population], [-8, -9])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_replacing_time_matrix_invalidates_cache(self):
+        self.evaluation.process([PermutationGenotype([0, 1])])
+        self.evaluation.time_matrix = [[1, 2], [3, 5]]
+        genotype = PermutationGenotype([0, 1])
+        self.evaluation.process([genotype])
+        self.assertEqual(genotype.fitness, -9)
+        self.assertEqual(self.evaluation.JOBS_COUNT, 3)
+
+    def test_operators_evaluating_equal_time_matrices_share_entries(self):
+        self.evaluation.process([PermutationGenotype([0, 1])])
+        other = FlowShopEvaluation([[1, 2], [3, 4]], cache=self.cache)
+        genotype = PermutationGenotype([0, 1])
+        other.process([genotype])
+        self.assertEqual(-8, genotype.fitness)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+        self.assertEqual(0, other.evaluations)
+
+    def test_replacing_time_matrix_evicts_only_entries_nobody_evaluates(self):
+        other = FlowShopEvaluation([[5, 6], [7, 8]], cache=self.cache)
+        self.evaluation.process([PermutationGenotype([0, 1])])
+        other.process([PermutationGenotype([0, 1])])
+        self.assertEqual(2, len(self.cache))
+        self.evaluation.time_matrix = [[1, 2], [3, 5]]
+        self.assertEqual(1, len(self.cache))
+        genotype = PermutationGenotype([0, 1])
+        other.process([genotype])
+        self.assertEqual(-20, genotype.fitness)
+        self.assertEqual(1, self.cache.hits)
+
+    def test_operators_of_different_kinds_do_not_share_entries(self):
+        self.assertNotEqual(self.cache.acquire(FlowShopEvaluation, [[1, 2], [3, 4]]),
+                            self.cache.acquire(OpenShopEvaluation, [[1, 2], [3, 4]]))
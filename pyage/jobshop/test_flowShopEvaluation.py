@@ -0,0 +1,150 @@
+import random
+from unittest import TestCase, skipIf
+from flowshop_genetics import FlowShopEvaluation, IncrementalFlowShopEvaluation, InsertionPermutationMutation, \
+    MemeticPermutationMutation, OpenShopEvaluation, PermutationGenotype, PermutationInitializer, swap
+from pyage.core import inject
+import flowshop_genetics
+
+
+class TestFlowShopEvaluation(TestCase):
+    def setUp(self):
+        self.time_matrix = [[54, 83, 15, 71, 77, 36, 53, 38, 27, 87],
+                            [79, 3, 11, 99, 56, 70, 99, 60, 5, 56],
+                            [16, 89, 49, 15, 89, 45, 60, 23, 57, 64],
+                            [66, 58, 31, 68, 78, 91, 13, 59, 49, 85]]
+        self.evaluation = FlowShopEvaluation(self.time_matrix)
+
+    def test_compute_makespan_of_identity_permutation(self):
+        evaluation = FlowShopEvaluation([[1, 2], [3, 4]])
+        self.assertEqual(evaluation.compute_makespan([0, 1]), 8)
+        self.assertEqual(evaluation.compute_makespan([1, 0]), 9)
+
+    @skipIf(flowshop_genetics.numpy is None, "numpy not installed")
+    def test_compute_makespans_matches_scalar_path(self):
+        permutations = [PermutationInitializer.generate_permutation(10) for _ in xrange(50)]
+        expected = [self.evaluation.compute_makespan(p) for p in permutations]
+        self.assertEqual(self.evaluation.compute_makespans(permutations), expected)
+
+    @skipIf(flowshop_genetics.numpy is None, "numpy not installed")
+    def test_batched_process_assigns_same_fitness_as_scalar_process(self):
+        population = [PermutationGenotype(PermutationInitializer.generate_permutation(10)) for _ in xrange(20)]
+        batched_population = [PermutationGenotype(list(g.permutation)) for g in population]
+        self.evaluation.process(population)
+        FlowShopEvaluation(self.time_matrix, batched=True).process(batched_population)
+        self.assertEqual([g.fitness for g in batched_population], [g.fitness for g in population])
+
+
+class TestIncrementalFlowShopEvaluation(TestCase):
+    def setUp(self):
+        self.time_matrix = [[54, 83, 15, 71, 77, 36, 53, 38, 27, 87],
+                            [79, 3, 11, 99, 56, 70, 99, 60, 5, 56],
+                            [16, 89, 49, 15, 89, 45, 60, 23, 57, 64],
+                            [66, 58, 31, 68, 78, 91, 13, 59, 49, 85]]
+        self.evaluation = FlowShopEvaluation(self.time_matrix)
+        self.permutation = [3, 0, 7, 1, 9, 4, 2, 8, 5, 6]
+        self.incremental = IncrementalFlowShopEvaluation(self.time_matrix)
+        self.incremental.set_base(self.permutation)
+
+    def test_base_makespan_matches_full_evaluation(self):
+        self.assertEqual(self.incremental.makespan, self.evaluation.compute_makespan(self.permutation))
+
+    def test_swap_makespans_match_full_evaluation(self):
+        for i in xrange(len(self.permutation)):
+            for j in xrange(len(self.permutation)):
+                swapped = list(self.permutation)
+                swap(swapped, i, j)
+                self.assertEqual(self.incremental.compute_swap_makespan(i, j),
+                                 self.evaluation.compute_makespan(swapped))
+
+    def test_insertion_makespans_match_full_evaluation(self):
+        reduced = [job for job in self.permutation if job != 4]
+        self.incremental.set_base(reduced)
+        expected = [self.evaluation.compute_makespan(reduced[:k] + [4] + reduced[k:]) for k in xrange(len(reduced) + 1)]
+        self.assertEqual(self.incremental.compute_insertion_makespans(4), expected)
+
+    def test_move_makespans_match_full_evaluation(self):
+        reduced = self.permutation[:2] + self.permutation[3:]
+        expected = [self.evaluation.compute_makespan(reduced[:k] + [self.permutation[2]] + reduced[k:])
+                    for k in xrange(len(reduced) + 1)]
+        self.assertEqual(self.incremental.compute_move_makespans(2), expected)
+
+
+class CountingEvaluation(object):
+    """ compute_makespan of another evaluation, without being a FlowShopEvaluation """
+
+    def __init__(self, evaluation):
+        self.evaluation = evaluation
+        self.calls = 0
+
+    def compute_makespan(self, permutation):
+        self.calls += 1
+        return self.evaluation.compute_makespan(permutation)
+
+
+class TestMemeticPermutationMutation(TestCase):
+    def setUp(self):
+        self.time_matrix = [[54, 83, 15, 71, 77, 36, 53, 38, 27, 87],
+                            [79, 3, 11, 99, 56, 70, 99, 60, 5, 56],
+                            [16, 89, 49, 15, 89, 45, 60, 23, 57, 64],
+                            [66, 58, 31, 68, 78, 91, 13, 59, 49, 85]]
+        self.evaluation = FlowShopEvaluation(self.time_matrix)
+        self.resolve_attr = inject.resolve_attr
+        inject.resolve_attr = inject.CachingResolver({"evaluation": lambda: self.evaluation})
+
+    def tearDown(self):
+        inject.resolve_attr = self.resolve_attr
+
+    def test_swaps_jobs_without_worsening_makespan(self):
+        mutation = MemeticPermutationMutation(local_rounds_count=5, attempts_per_round=4, random_swaps_count=2)
+        permutation = [3, 0, 7, 1, 9, 4, 2, 8, 5, 6]
+        genotype = PermutationGenotype(list(permutation))
+        mutation.mutate(genotype)
+        self.assertEqual(range(10), sorted(genotype.permutation))
+        self.assertTrue(self.evaluation.compute_makespan(genotype.permutation)
+                        <= self.evaluation.compute_makespan(permutation))
+
+    def test_scores_candidates_fully_with_other_evaluations(self):
+        mutation = MemeticPermutationMutation(local_rounds_count=3, attempts_per_round=4, random_swaps_count=2)
+        incremental = PermutationGenotype([3, 0, 7, 1, 9, 4, 2, 8, 5, 6])
+        full = PermutationGenotype(list(incremental.permutation))
+        state = random.getstate()
+        mutation.mutate(incremental)
+        random.setstate(state)  # the same candidates, scored by the other path
+        self.evaluation = CountingEvaluation(self.evaluation)
+        mutation.mutate(full)
+        self.assertEqual(incremental.permutation, full.permutation)
+        self.assertEqual(1 + 3 * 4, self.evaluation.calls)
+
+
+class TestInsertionPermutationMutation(TestCase):
+    def setUp(self):
+        self.time_matrix = [[54, 83, 15, 71, 77, 36, 53, 38, 27, 87],
+                            [79, 3, 11, 99, 56, 70, 99, 60, 5, 56],
+                            [16, 89, 49, 15, 89, 45, 60, 23, 57, 64],
+                            [66, 58, 31, 68, 78, 91, 13, 59, 49, 85]]
+        self.evaluation = FlowShopEvaluation(self.time_matrix)
+        self.resolve_attr = inject.resolve_attr
+        inject.resolve_attr = inject.CachingResolver({"evaluation": lambda: self.evaluation})
+
+    def tearDown(self):
+        inject.resolve_attr = self.resolve_attr
+
+    def test_moves_jobs_without_worsening_makespan(self):
+        mutation = InsertionPermutationMutation(local_rounds_count=5, attempts_per_round=4)
+        permutation = [3, 0, 7, 1, 9, 4, 2, 8, 5, 6]
+        genotype = PermutationGenotype(list(permutation))
+        mutation.mutate(genotype)
+        self.assertEqual(range(10), sorted(genotype.permutation))
+        self.assertTrue(self.evaluation.compute_makespan(genotype.permutation)
+                        <= self.evaluation.compute_makespan(permutation))
+
+    def test_finds_best_move_of_two_job_permutations(self):
+        self.evaluation = FlowShopEvaluation([[1, 5], [5, 1]])
+        genotype = PermutationGenotype([1, 0])
+        InsertionPermutationMutation(local_rounds_count=1, attempts_per_round=10).mutate(genotype)
+        self.assertEqual([0, 1], genotype.permutation)
+
+    def test_rejects_evaluations_other_than_flow_shop(self):
+        self.evaluation = OpenShopEvaluation([[1, 2], [3, 4]])
+        mutation = InsertionPermutationMutation(local_rounds_count=1, attempts_per_round=1)
+        self.assertRaises(TypeError, mutation.mutate, PermutationGenotype([0, 1, 2, 3]))
@@ -0,0 +1,57 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+from gantt_generator import GanttGenerator, tick_step
+from stats import GanttStats
+
+
+class TestGanttGenerator(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_svg_labels_only_readable_bars(self):
+        gantt = GanttGenerator(self.directory, 'svg')
+        gantt.add_tasks([[0, 11, 0, 500, 'Tick 0'], [0, 12, 500, 1, 'Tick 500'], [1, 11, 500, 30, 'Tick 500']])
+        svg = gantt.to_svg('window')
+        self.assertEqual(3, svg.count('<rect'))
+        self.assertEqual(2, svg.count('>11</text>'))
+        self.assertEqual(0, svg.count('>12</text>'))
+        self.assertTrue(os.path.exists(gantt.generate('window')))
+
+    def test_thousands_of_tasks_render_without_labels(self):
+        gantt = GanttGenerator(self.directory, 'html')
+        for machine in xrange(5):
+            for job in xrange(1000):
+                gantt.add_task(machine, job, job * 10 + machine, 10)
+        self.assertEqual(5000, gantt.get_tasks_count())
+        html = open(gantt.generate('long')).read()
+        self.assertEqual(5000, html.count('<rect'))
+        self.assertTrue(html.count('<line') <= 21)
+        self.assertEqual(0, html.count('text-anchor="middle">999<'))
+
+    def test_tick_step(self):
+        self.assertEqual([1, 1, 2, 5, 50, 1000], [tick_step(span) for span in (1, 20, 21, 100, 1000, 20000)])
+
+    def test_writes_one_png_per_summary(self):
+        try:
+            import matplotlib
+        except ImportError:
+            self.skipTest("matplotlib is not installed")
+        stats = GanttStats(self.directory)
+        history = [[0, 1, 0, 5, 'Tick 0'], [1, 1, 5, 3, 'Tick 5']]
+        stats.summarize(history)
+        stats.summarize(history + [[0, 2, 5, 4, 'Tick 5']])
+        self.assertEqual(['Window 1.png', 'Window 2.png'], sorted(os.listdir(self.directory)))
+        self.assertEqual(3, stats.gantt.get_tasks_count())
+
+    def test_imports_matplotlib_lazily(self):
+        code = "import sys, stats, statistics; print 'matplotlib' in sys.modules"
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                         env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+        self.assertEqual("False", output.strip())
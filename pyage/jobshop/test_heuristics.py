@@ -0,0 +1,107 @@
+import itertools
+import random
+from unittest import TestCase
+from flowshop_genetics import FlowShopEvaluation, PermutationGenotype
+from heuristics import SeededPermutationInitializer, carry_over_population, cds, insert_jobs, johnson, match_jobs, neh, \
+    palmer
+
+
+def random_time_matrix(rng, processors_count, jobs_count):
+    return [[rng.randint(1, 30) for _ in xrange(jobs_count)] for _ in xrange(processors_count)]
+
+
+def naive_neh(time_matrix):
+    """ NEH evaluating every partial permutation from scratch """
+    jobs = sorted(xrange(len(time_matrix[0])), key=lambda job: -sum(processor[job] for processor in time_matrix))
+    permutation = []
+    for job in jobs:
+        candidates = [permutation[:i] + [job] + permutation[i:] for i in xrange(len(permutation) + 1)]
+        permutation = min(candidates, key=lambda candidate: partial_makespan(time_matrix, candidate))
+    return permutation
+
+
+def partial_makespan(time_matrix, partial_permutation):
+    partial_time_matrix = [[processor[job] for job in partial_permutation] for processor in time_matrix]
+    return FlowShopEvaluation(partial_time_matrix).compute_makespan(range(len(partial_permutation)))
+
+
+class TestHeuristics(TestCase):
+    def setUp(self):
+        self.random = random.Random(7)
+
+    def test_neh_with_acceleration_matches_naive_neh(self):
+        for _ in xrange(5):
+            time_matrix = random_time_matrix(self.random, 4, 8)
+            self.assertEqual(naive_neh(time_matrix), neh(time_matrix))
+
+    def test_johnson_is_optimal_for_two_processors(self):
+        time_matrix = random_time_matrix(self.random, 2, 6)
+        evaluation = FlowShopEvaluation(time_matrix)
+        optimum = min(evaluation.compute_makespan(list(p)) for p in itertools.permutations(range(6)))
+        self.assertEqual(optimum, evaluation.compute_makespan(johnson(*time_matrix)))
+        self.assertEqual(optimum, evaluation.compute_makespan(cds(time_matrix)))
+
+    def test_heuristics_return_permutations(self):
+        time_matrix = random_time_matrix(self.random, 5, 9)
+        for heuristic in neh, cds, palmer:
+            self.assertEqual(range(9), sorted(heuristic(time_matrix)))
+
+    def test_palmer_puts_increasing_jobs_first(self):
+        self.assertEqual([1, 0], palmer([[5, 1], [1, 5]]))
+
+    def test_seeds_fraction_of_population(self):
+        time_matrix = random_time_matrix(self.random, 4, 8)
+        initializer = SeededPermutationInitializer(8, 10, time_matrix, seeded_fraction=0.5)
+        population = []
+        initializer.process(population)
+        self.assertEqual(10, len(population))
+        self.assertEqual(neh(time_matrix), population[0].permutation)
+        self.assertTrue(all(genotype.is_permutation_valid() for genotype in population))
+
+    def test_seeds_follow_new_problem(self):
+        initializer = SeededPermutationInitializer(8, 10, random_time_matrix(self.random, 4, 8), seeded_fraction=0.5)
+        time_matrix = random_time_matrix(self.random, 3, 5)
+        initializer.set_problem(time_matrix)
+        population = []
+        initializer.process(population)
+        self.assertEqual(5, initializer.permutation_length)
+        self.assertEqual(neh(time_matrix), population[0].permutation)
+
+    def test_no_seeds_without_fraction(self):
+        calls = []
+        initializer = SeededPermutationInitializer(8, 10, random_time_matrix(self.random, 4, 8), seeded_fraction=0,
+                                                   heuristics=[lambda time_matrix: calls.append(time_matrix)])
+        population = []
+        initializer.process(population)
+        self.assertEqual(10, len(population))
+        self.assertEqual([], calls)
+
+    def test_matches_jobs_by_jid(self):
+        self.assertEqual({1: 0, 2: 2}, match_jobs([10, 11, 12], [11, 13, 12]))
+        self.assertEqual({0: 1, 2: 2}, match_jobs([5, 6, 5], [7, 5, 5]))
+        self.assertEqual({}, match_jobs([1], [2]))
+
+    def test_inserts_jobs_at_best_positions(self):
+        time_matrix = random_time_matrix(self.random, 4, 6)
+        permutation = [0, 1, 2]
+        insert_jobs(permutation, [3, 4, 5], time_matrix)
+        self.assertEqual(range(6), sorted(permutation))
+        evaluation = FlowShopEvaluation(time_matrix)
+        makespan = evaluation.compute_makespan(permutation)
+        partial = [job for job in permutation if job != 5]
+        self.assertEqual(makespan, min(evaluation.compute_makespan(partial[:i] + [5] + partial[i:])
+                                       for i in xrange(6)))
+
+    def test_carries_population_over_to_next_window(self):
+        time_matrix = random_time_matrix(self.random, 3, 4)
+        population = [PermutationGenotype([2, 0, 1]), PermutationGenotype([0, 2, 1]), PermutationGenotype([1, 2, 0])]
+        for genotype in population:
+            genotype.fitness = -1
+        # jobs 10 and 12 stay in the window, 11 is finished, 13 and 14 arrive
+        self.assertTrue(carry_over_population(population, [10, 11, 12], [12, 13, 10, 14], time_matrix))
+        self.assertEqual(2, len(population))
+        for genotype, order in zip(population, [[0, 2], [2, 0]]):
+            self.assertEqual(order, [job for job in genotype.permutation if job in (0, 2)])
+            self.assertEqual([0, 1, 2, 3], sorted(genotype.permutation))
+            self.assertEqual(None, genotype.fitness)
+        self.assertFalse(carry_over_population(population, [20], [21], time_matrix))
@@ -0,0 +1,83 @@
+from unittest import TestCase
+from flowshop_genetics import PermutationGenotype, adjust_permutation
+from islands import IslandMigration, accept_immigrants, elite_permutations, full_topology, ring_topology
+from slave_pool import SlavePool
+
+
+class PermutationLength(object):
+    def __init__(self, permutation_length):
+        self.permutation_length = permutation_length
+
+
+class PopulationSlave(object):
+    def __init__(self, permutations):
+        self.initializer = PermutationLength(len(permutations[0]))
+        self.population = []
+        for fitness, permutation in enumerate(permutations):
+            genotype = PermutationGenotype(list(permutation))
+            genotype.fitness = fitness
+            self.population.append(genotype)
+
+    def step(self):
+        for genotype in self.population:
+            if genotype.fitness is None:
+                genotype.fitness = len(self.population)
+
+    def get_best_genotype(self):
+        return max(self.population, key=lambda g: g.fitness)
+
+
+def ignore_reset(slave, time_matrix):
+    pass
+
+
+class TestIslands(TestCase):
+    def test_topologies(self):
+        self.assertEqual({"a": ["b"], "b": ["c"], "c": ["a"]}, ring_topology(["a", "b", "c"]))
+        self.assertEqual({"a": ["b", "c"], "b": ["a", "c"], "c": ["a", "b"]}, full_topology(["a", "b", "c"]))
+        self.assertEqual({}, ring_topology(["a"]))
+
+    def test_migration_is_due_once_per_interval(self):
+        islands = IslandMigration(interval=10)
+        self.assertFalse(islands.is_due(0, 9))
+        self.assertTrue(islands.is_due(9, 10))
+        self.assertTrue(islands.is_due(5, 15))
+        self.assertFalse(islands.is_due(10, 19))
+
+    def test_routes_elites_along_ring(self):
+        islands = IslandMigration("ring", elites=1)
+        immigrants = islands.route({"a": [[0, 1]], "b": [[1, 0]]})
+        self.assertEqual({"a": [[1, 0]], "b": [[0, 1]]}, immigrants)
+        self.assertEqual(1, islands.migrations)
+        self.assertRaises(ValueError, lambda: IslandMigration("star"))
+
+    def test_elites_replace_worst_genotypes(self):
+        source = PopulationSlave([[0, 1, 2], [1, 2, 0], [2, 0, 1], [2, 1, 0]])
+        destination = PopulationSlave([[0, 2, 1], [1, 0, 2], [0, 1, 2], [1, 2, 0]])
+        elites = elite_permutations(source, 2)
+        self.assertEqual([[2, 1, 0], [2, 0, 1]], [list(permutation) for permutation in elites])
+        accept_immigrants(destination, elites)
+        permutations = [genotype.permutation for genotype in destination.population]
+        self.assertEqual([[2, 1, 0], [2, 0, 1], [0, 1, 2], [1, 2, 0]], permutations)
+        self.assertEqual([None, None, 2, 3], [genotype.fitness for genotype in destination.population])
+
+    def test_immigrants_are_fitted_to_window_of_destination(self):
+        destination = PopulationSlave([[0, 1, 2], [1, 2, 0]])
+        accept_immigrants(destination, [[3, 0, 1, 2]])
+        self.assertEqual([0, 1, 2], sorted(destination.population[0].permutation))
+        permutation = [1, 0]
+        adjust_permutation(permutation, 3)
+        self.assertEqual([1, 0, 2], permutation)
+
+    def test_elites_are_exchanged_between_pool_workers(self):
+        slaves = {"a": PopulationSlave([[0, 1, 2], [1, 2, 0]]), "b": PopulationSlave([[2, 1, 0], [0, 2, 1]])}
+        pool = SlavePool(slaves, 2, ignore_reset)
+        try:
+            islands = IslandMigration("ring", elites=1)
+            pool.immigrate(islands.route(pool.get_elites(1)))
+            pool.step()
+            elites = pool.get_elites(1)
+            self.assertEqual([[0, 2, 1]], [list(permutation) for permutation in elites["a"]])
+            self.assertEqual([[1, 2, 0]], [list(permutation) for permutation in elites["b"]])
+        finally:
+            pool.close()
@@ -38,4 +38,31 @@ class TestJobBacklog(TestCase):
         self.job_backlog.add_problem(Problem([self.job_4, self.job_7, self.job_2]))
         self.assertEqual(self.job_backlog.pop_top_priority_job().arrival_time, 2)
         self.assertEqual(self.job_backlog.pop_top_priority_job().arrival_time, 4)
-        self.assertEqual(self.job_backlog.pop_top_priority_job().arrival_time, 7)
\ No newline at end of file
+        self.assertEqual(self.job_backlog.pop_top_priority_job().arrival_time, 7)
+
+    def test_pop_top_priority_job_keeps_order_of_addition_for_equal_priorities(self):
+        job_a = Job("a", [Task("machine", "duration")], 3)
+        job_b = Job("b", [Task("machine", "duration")], 3)
+        self.job_backlog.add_problem(Problem([job_a, self.job_7, job_b]))
+        self.assertEqual(["a", "b", "jid1"], [self.job_backlog.pop_top_priority_job().jid for _ in xrange(3)])
+
+    def test_restore_brings_back_backlog_from_snapshot(self):
+        self.job_backlog.add_problem(Problem([self.job_4, self.job_7]))
+        snapshot = self.job_backlog.snapshot()
+        self.job_backlog.add_job(self.job_2)
+        self.job_backlog.pop_top_priority_job()
+        self.job_backlog.pop_top_priority_job()
+        self.job_backlog.restore(snapshot)
+        self.assertEqual(self.job_backlog.size(), 2)
+        self.assertEqual(self.job_backlog.pop_top_priority_job().arrival_time, 4)
+        self.job_backlog.restore(snapshot)
+        self.assertEqual(self.job_backlog.pop_top_priority_job().arrival_time, 4)
+
+    def test_peek_window_leaves_backlog_unchanged(self):
+        jobs = [Job(jid, [Task("machine", 5)], jid) for jid in xrange(4)]
+        self.job_backlog.add_problem(Problem(jobs))
+        job_window = self.job_backlog.peek_window(12)
+        self.assertEqual(jobs[:3], job_window.get_jobs())
+        self.assertEqual(self.job_backlog.size(), 4)
+        self.assertEqual(jobs[:3], self.job_backlog.pop_window(12).get_jobs())
+        self.assertEqual(self.job_backlog.size(), 1)
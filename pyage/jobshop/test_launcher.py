@@ -0,0 +1,29 @@
+from unittest import TestCase
+import launcher
+import launcher_config_small as l_conf
+
+
+class TestCreateClassicParams(TestCase):
+    def setUp(self):
+        self.masters_factory = launcher.masters_factory
+        self.master_options = None
+        launcher.masters_factory = self.record_master_options
+
+    def tearDown(self):
+        launcher.masters_factory = self.masters_factory
+
+    def record_master_options(self, count, job_window_time, time_matrix, distortion_factor, **kwargs):
+        self.master_options = kwargs
+        return lambda: {}
+
+    def test_master_options_override_config(self):
+        launcher.create_classic_params(2, 4, [[1, 2], [3, 4]], [], 0.1, processes=3, steps_per_round=7,
+                                       render_gantt=False)
+        self.assertEqual((3, 7, False), (self.master_options["processes"], self.master_options["steps_per_round"],
+                                         self.master_options["render_gantt"]))
+
+    def test_config_provides_missing_master_options(self):
+        launcher.create_classic_params(2, 4, [[1, 2], [3, 4]], [], 0.1)
+        self.assertEqual((l_conf.processes, l_conf.steps_per_round, l_conf.warm_start),
+                         (self.master_options["processes"], self.master_options["steps_per_round"],
+                          self.master_options["warm_start"]))
@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase, skipIf
+import matrix_io
+from flowshop_genetics import FlowShopEvaluation
+from matrix_io import MatrixFile, convert, write_problems
+from problem import TimeMatrixConverter
+from problemGenerator import Counter, ProblemProvider
+
+
+class TestMatrixIo(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "problems.pyjm")
+        self.time_matrices = [[[3, 15, 16], [30, 1, 22]], [[8, 19, 10, 36], [21, 5, 11, 3]]]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        self.assertEqual(2, write_problems(self.path, self.time_matrices, [5, [1, 2, 3, 4]]))
+        matrix_file = MatrixFile(self.path)
+        self.assertEqual((2, 2, 4), (len(matrix_file), matrix_file.machines_count, matrix_file.jobs_count(1)))
+        self.assertEqual(self.time_matrices, list(matrix_file))
+        self.assertEqual([3, 30, 15, 1, 16, 22], list(matrix_file.get_durations(0)))
+        self.assertEqual([5, 5, 5], list(matrix_file.get_arrival_times(0)))
+        self.assertRaises(IndexError, lambda: matrix_file.get_time_matrix(2))
+        matrix_file.close()
+        self.assertRaises(ValueError, lambda: matrix_file.get_time_matrix(0))
+
+    def test_round_trip_without_numpy(self):
+        write_problems(self.path, self.time_matrices)
+        numpy, matrix_io.numpy = matrix_io.numpy, None
+        try:
+            self.assertEqual(self.time_matrices, list(MatrixFile(self.path)))
+        finally:
+            matrix_io.numpy = numpy
+
+    def test_rejects_other_files(self):
+        with open(self.path, "w") as other_file:
+            other_file.write("[[1, 2], [3, 4]]\n")
+        self.assertRaises(ValueError, lambda: MatrixFile(self.path))
+        self.assertRaises(ValueError, lambda: write_problems(self.path, [[[1]], [[1], [2]]]))
+
+    def test_rejects_arrival_times_not_matching_problems(self):
+        self.assertRaises(ValueError, lambda: write_problems(self.path, self.time_matrices, [0]))
+        self.assertRaises(ValueError, lambda: write_problems(self.path, self.time_matrices, [0, [1, 2]]))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_problems_keep_arrival_times(self):
+        write_problems(self.path, self.time_matrices, [0, [1, 2, 3, 4]])
+        problem = TimeMatrixConverter(Counter()).file_to_problem(MatrixFile(self.path), 1)
+        self.assertEqual([1, 2, 3, 4], [job.arrival_time for job in problem.get_jobs_list()])
+        self.assertEqual(self.time_matrices[1], TimeMatrixConverter(Counter()).problem_to_matrix(problem))
+
+    def test_provider_keeps_arrival_times_not_earlier_than_delivery(self):
+        write_problems(self.path, self.time_matrices, [0, [1, 2, 30, 4]])
+        provider = ProblemProvider(MatrixFile(self.path))
+        self.assertEqual([7, 7, 7], [job.arrival_time for job in provider.provide_next(7).get_jobs_list()])
+        self.assertEqual([7, 7, 30, 7], [job.arrival_time for job in provider.provide_next(7).get_jobs_list()])
+        self.assertFalse(provider.has_next())
+
+    def test_feeds_provider_and_evaluation(self):
+        source_path = os.path.join(self.directory, "feed.jsonl")
+        with open(source_path, "w") as feed:
+            for time_matrix in self.time_matrices:
+                feed.write(json.dumps(time_matrix) + "\n")
+        convert(source_path, self.path)
+        provider = ProblemProvider.from_matrix_file(self.path)
+        problems = []
+        while provider.has_next():
+            problems.append(provider.provide_next(7))
+        self.assertEqual([3, 4], [len(problem.get_jobs_list()) for problem in problems])
+        evaluation = FlowShopEvaluation.from_matrix_file(MatrixFile(self.path), 1)
+        self.assertEqual(FlowShopEvaluation(self.time_matrices[1]).compute_makespan([2, 0, 1, 3]),
+                         evaluation.compute_makespan([2, 0, 1, 3]))
+
+    @skipIf(matrix_io.numpy is None, "numpy is not installed")
+    def test_batched_evaluation_reads_durations_from_mapping(self):
+        write_problems(self.path, self.time_matrices)
+        matrix_file = MatrixFile(self.path)
+        view = matrix_file.get_time_matrix(1, as_lists=False)
+        self.assertEqual(self.time_matrices[1], view.tolist())
+        self.assertFalse(view.flags.writeable)
+        evaluation = FlowShopEvaluation.from_matrix_file(matrix_file, 1, batched=True)
+        self.assertTrue(matrix_io.numpy.shares_memory(matrix_file.get_durations(1), evaluation.time_matrix))
+        permutations = [[2, 0, 1, 3], [3, 2, 1, 0]]
+        self.assertEqual([FlowShopEvaluation(self.time_matrices[1]).compute_makespan(permutation)
+                          for permutation in permutations], evaluation.compute_makespans(permutations))
+
+    @skipIf(matrix_io.numpy is None, "numpy is not installed")
+    def test_views_outlive_closed_file(self):
+        write_problems(self.path, self.time_matrices)
+        matrix_file = MatrixFile(self.path)
+        evaluation = FlowShopEvaluation.from_matrix_file(matrix_file, 1, batched=True)
+        arrival_times = matrix_file.get_arrival_times(0)
+        matrix_file.close()
+        del matrix_file
+        self.assertEqual([FlowShopEvaluation(self.time_matrices[1]).compute_makespan([2, 0, 1, 3])],
+                         evaluation.compute_makespans([[2, 0, 1, 3]]))
+        self.assertEqual([0, 0, 0], arrival_times.tolist())
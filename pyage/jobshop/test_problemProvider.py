@@ -0,0 +1,65 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from problemGenerator import ProblemProvider
+
+
+class TestProblemProvider(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.matrices = [[[1, 2], [3, 4]], [[5, 6, 7], [8, 9, 10]]]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_provides_problems_of_list_feed(self):
+        provider = ProblemProvider(self.matrices)
+        self.assertTrue(provider.has_next())
+        problem = provider.provide_next(4)
+        self.assertEqual([[1, 2], [3, 4]], problem.to_compact().to_time_matrix())
+        self.assertEqual([4, 4], [job.arrival_time for job in problem.jobs_list])
+        provider.provide_next(5)
+        self.assertFalse(provider.has_next())
+        self.assertRaises(IndexError, lambda: provider.provide_next(6))
+
+    def test_looks_ahead_at_most_one_problem(self):
+        drawn = []
+
+        def feed():
+            for time_matrix in self.matrices:
+                drawn.append(time_matrix)
+                yield time_matrix
+
+        provider = ProblemProvider(feed())
+        self.assertEqual(0, len(drawn))
+        self.assertTrue(provider.has_next())
+        self.assertTrue(provider.has_next())
+        self.assertEqual(1, len(drawn))
+        provider.provide_next(0)
+        self.assertEqual(1, len(drawn))
+        self.assertTrue(provider.has_next())
+        self.assertEqual(2, len(drawn))
+
+    def test_reads_json_lines(self):
+        path = os.path.join(self.directory, "feed.jsonl")
+        with open(path, "w") as feed:
+            for time_matrix in self.matrices:
+                feed.write(json.dumps(time_matrix) + "\n")
+        provider = ProblemProvider.from_json_lines(path)
+        self.assertEqual(self.matrices, self.__provide_all(provider))
+
+    def test_reads_csv_separated_by_blank_lines(self):
+        path = os.path.join(self.directory, "feed.csv")
+        with open(path, "w") as feed:
+            feed.write("1,2\n3,4\n\n\n5,6,7\n8,9,10\n")
+        provider = ProblemProvider.from_csv(path)
+        self.assertEqual(self.matrices, self.__provide_all(provider))
+
+    @staticmethod
+    def __provide_all(provider):
+        time_matrices = []
+        while provider.has_next():
+            time_matrices.append(provider.provide_next(0).to_compact().to_time_matrix())
+        return time_matrices
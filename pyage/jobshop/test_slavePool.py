@@ -0,0 +1,43 @@
+from unittest import TestCase
+from flowshop_genetics import PermutationGenotype
+from slave_pool import SlavePool
+
+
+class CountingSlave(object):
+    def __init__(self):
+        self.steps = 0
+        self.permutation = [0, 1, 2]
+
+    def step(self):
+        self.steps += 1
+
+    def get_best_genotype(self):
+        genotype = PermutationGenotype(self.permutation)
+        genotype.fitness = -self.steps
+        return genotype
+
+
+def reverse_permutation(slave, time_matrix, jids=None):
+    slave.permutation = range(len(time_matrix[0]))[::-1] if jids is None else list(jids)
+
+
+class TestSlavePool(TestCase):
+    def setUp(self):
+        self.pool = SlavePool({"a": CountingSlave(), "b": CountingSlave(), "c": CountingSlave()}, 2,
+                              reverse_permutation)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_slaves_are_stepped_in_workers(self):
+        self.pool.step(3)
+        self.pool.step(2)
+        self.assertEqual([g.fitness for g in self.pool.get_best_genotypes()], [-5, -5, -5])
+
+    def test_reset_is_applied_only_to_given_slaves(self):
+        self.pool.reset({"b": [[1, 1, 1, 1]]})
+        self.assertEqual([g.permutation for g in self.pool.get_best_genotypes()], [[0, 1, 2], [3, 2, 1, 0], [0, 1, 2]])
+
+    def test_reset_passes_jids_of_windows(self):
+        self.pool.reset({"a": [[1, 1]], "c": [[1, 1]]}, {"a": [7, 8], "c": [9, 4]})
+        self.assertEqual([g.permutation for g in self.pool.get_best_genotypes()], [[7, 8], [0, 1, 2], [9, 4]])
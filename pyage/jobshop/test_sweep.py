@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+import agents
+import launcher_config_small as l_conf
+import sweep
+
+CONFIG = {"matrices": [{"matrix": [[3, 15, 16, 9, 9, 16, 5], [30, 1, 22, 1, 6, 30, 9], [12, 13, 14, 26, 3, 16, 3],
+                                   [10, 15, 5, 32, 13, 15, 4]]}],
+          "distortion_factors": [0.1], "numbers_of_aggregates": [1], "aggregate_sizes": 4, "repeats": 1,
+          "deliveries_file": None, "window_budget": None, "processes": 0}
+
+
+def failing_step(master):
+    if master.get_windows_calculated() > 0:
+        raise RuntimeError("master failed mid-run")
+    original_step(master)
+
+
+original_step = agents.MasterAgent.step
+
+
+class TestSweep(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, "sweep.jsonl")
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)  # masters render Gantt charts to the working directory
+        self.config = dict((name, getattr(l_conf, name)) for name in CONFIG)
+        for name, value in CONFIG.items():
+            setattr(l_conf, name, value)
+
+    def tearDown(self):
+        agents.MasterAgent.step = original_step
+        for name, value in self.config.items():
+            setattr(l_conf, name, value)
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+
+    def read_records(self):
+        with open(self.output) as output:
+            return [json.loads(line) for line in output]
+
+    def test_failed_cell_is_recorded_and_rerun_on_resume(self):
+        agents.MasterAgent.step = failing_step
+        self.assertEqual(1, sweep.run_sweep(self.output, processes=1))
+        failed, = self.read_records()
+        self.assertIn("master failed mid-run", failed["error"])
+        self.assertEqual(set(), sweep.completed_cells(self.output))
+
+        agents.MasterAgent.step = original_step
+        self.assertEqual(1, sweep.run_sweep(self.output, processes=1))
+        self.assertEqual(set([failed["cell"]]), sweep.completed_cells(self.output))
+        self.assertNotIn("error", self.read_records()[-1])
+        self.assertEqual(0, sweep.run_sweep(self.output, processes=1))
+        self.assertFalse(os.path.exists("gantt"))  # concurrent cells would overwrite each other's charts
+
+    def test_cells_step_slaves_in_process_whatever_the_config(self):
+        l_conf.processes = 2  # pool workers are daemonic, they can't start SlavePool processes
+        self.assertEqual(1, sweep.run_sweep(self.output, processes=1))
+        record, = self.read_records()
+        self.assertNotIn("error", record)
@@ -0,0 +1,92 @@
+from unittest import TestCase
+from problem import Job, Problem, Solution, Task, TaskQueue
+
+
+def make_tasks(machine, starts, duration=2, jid=1):
+    tasks = []
+    for start in starts:
+        task = Task(machine, duration)
+        Job(jid, [task])
+        task.set_start_time(start)
+        tasks.append(task)
+    return tasks
+
+
+class TestTaskQueue(TestCase):
+    def test_pops_both_ends(self):
+        queue = TaskQueue(range(3))
+        queue.append(3)
+        queue.extend([4, 5])
+        self.assertEqual(0, queue.popleft())
+        self.assertEqual(5, queue.pop())
+        self.assertEqual(4, queue.pop())
+        self.assertEqual([1, 2, 3], list(queue))
+        self.assertEqual((1, 2, 3, 3), (queue[0], queue[1], queue[-1], len(queue)))
+        for expected in (1, 2, 3):
+            self.assertEqual(expected, queue.popleft())
+        self.assertRaises(IndexError, queue.popleft)
+        self.assertRaises(IndexError, queue.pop)
+
+    def test_shared_queues_pop_independently(self):
+        queue = TaskQueue([1, 2])
+        queue.append(3)
+        shared = queue.share()
+        shared.splice(TaskQueue([4]))
+        self.assertEqual(1, shared.popleft())
+        queue.pop()
+        self.assertEqual([1, 2], list(queue))
+        self.assertEqual([2, 3, 4], list(shared))
+
+    def test_remove_splits_chunk(self):
+        queue = TaskQueue([1, 2, 3])
+        queue.extend([4, 5])
+        queue.remove(4)
+        queue.remove(2)
+        self.assertEqual([1, 3, 5], list(queue))
+        self.assertEqual(3, queue.chunks_count())
+        self.assertRaises(ValueError, lambda: queue.remove(7))
+
+
+class TestSolutionMerging(TestCase):
+    def setUp(self):
+        self.committed = Solution(2)
+        self.committed.extend_machine(0, make_tasks(0, [0, 2, 4]))
+        self.committed.extend_machine(1, make_tasks(1, [2, 4]))
+        self.part = Solution(2)
+        self.part.extend_machine(0, make_tasks(0, [10, 12], jid=2))
+
+    def test_merged_solution_shares_committed_prefix(self):
+        merged = self.committed.append_clone_more_solution_part(self.part)
+        self.assertEqual([0, 2, 4, 10, 12], [task.get_start_time() for task in merged.get_tasks(0)])
+        self.assertEqual(14, merged.get_completion_time())
+        self.assertIs(self.committed.get_tasks(0)[0], merged.get_tasks(0)[0])
+        self.assertEqual(2, merged.get_tasks(0).chunks_count())
+        merged.pop_head_task(0, 0)
+        self.assertEqual(3, len(self.committed.get_tasks(0)))
+        self.assertEqual(2, len(self.part.get_tasks(0)))
+
+    def test_long_schedule_merges_without_copying(self):
+        merged = self.committed
+        for window in xrange(1000):
+            part = Solution(2)
+            part.extend_machine(0, make_tasks(0, [20 + 2 * window]))
+            merged = merged.append_clone_more_solution_part(part)
+            merged.pop_head_task(0, 10 ** 6)
+        self.assertEqual(3, len(merged.get_tasks(0)))
+        self.assertEqual(2020, merged.get_completion_time())
+
+    def test_adjusting_merged_solution_leaves_shared_tasks_untouched(self):
+        merged = self.committed.append_clone_more_solution_part(self.part)
+        merged.adjustTasksWithTime(5)
+        self.assertEqual([5, 7, 9, 15, 17], [task.get_start_time() for task in merged.get_tasks(0)])
+        self.assertEqual([0, 2, 4], [task.get_start_time() for task in self.committed.get_tasks(0)])
+        self.assertEqual([10, 12], [task.get_start_time() for task in self.part.get_tasks(0)])
+
+    def test_adjusting_to_sub_problem_leaves_shared_tasks_untouched(self):
+        merged = self.committed.append_clone_more_solution_part(self.part)
+        predicted = Problem([Job(1, [Task(0, 2)])])
+        actual = Problem([Job(3, [Task(0, 1)])])
+        merged.adjustSolutionToSubProblem(actual, predicted)
+        self.assertEqual([1, 1, 1, 1, 1], [task.get_duration() for task in merged.get_tasks(0)])
+        self.assertEqual([2, 2, 2], [task.get_duration() for task in self.committed.get_tasks(0)])
+        self.assertEqual([2, 2], [task.get_duration() for task in self.part.get_tasks(0)])
@@ -2,6 +2,9 @@ import random
 from pyage.core.operator import Operator
 from pyage.solutions.evolution.genotype import PointGenotype, FloatGenotype
 
+from pyage.core.lazy import optional
+numpy = optional("numpy")
+
 class AbstractCrossover(Operator):
     def __init__(self, type, size):
         super(AbstractCrossover, self).__init__(type)
@@ -39,4 +42,10 @@ class SinglePointCrossover(AbstractCrossover):
 
     def cross(self, p1, p2):
         crossingPoint = random.randint(1, len(p1.genes))
-        return FloatGenotype(p1.genes[:crossingPoint] + p2.genes[crossingPoint:])
\ No newline at end of file
+        return FloatGenotype(p1.genes[:crossingPoint] + p2.genes[crossingPoint:])
+
+    def cross_arrays(self, genes1, genes2):
+        """ batched counterpart of cross, requires numpy: :return: children of rows genes1[i] and genes2[i] """
+        crossing_points = numpy.random.randint(1, genes1.shape[1] + 1, size=len(genes1))
+        from_first = numpy.arange(genes1.shape[1]) < crossing_points[:, numpy.newaxis]
+        return numpy.where(from_first, genes1, genes2)
\ No newline at end of file
@@ -2,6 +2,9 @@ from math import cos, pi, sin, sqrt
 from pyage.core.operator import Operator
 from pyage.solutions.evolution.genotype import PointGenotype, FloatGenotype
 
+from pyage.core.lazy import optional
+numpy = optional("numpy")
+
 A = 10
 
 class FloatRastriginEvaluation(Operator):
@@ -12,6 +15,11 @@ class FloatRastriginEvaluation(Operator):
         for genotype in population:
             genotype.fitness = - self.__rastrigin(genotype.genes)
 
+    def evaluate_array(self, genes):
+        """ batched counterpart of process, requires numpy: :return: fitness of every row of :param genes: """
+        genes = numpy.asarray(genes, dtype=float)
+        return - (genes.shape[1] * A + (genes ** 2 - A * numpy.cos(2 * pi * genes)).sum(axis=1))
+
     def __rastrigin(self, genes):
         sum = len(genes) * A
         for gene in genes:
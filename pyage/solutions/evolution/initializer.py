@@ -3,6 +3,9 @@ from pyage.core.emas import EmasAgent
 from pyage.core.operator import Operator
 from pyage.solutions.evolution.genotype import PointGenotype, FloatGenotype
 
+from pyage.core.lazy import optional
+numpy = optional("numpy")
+
 class PointInitializer(Operator):
     def __init__(self, size=100, lowerbound=0.0, upperbound=1.0):
         super(PointInitializer, self).__init__(PointGenotype)
@@ -40,6 +43,10 @@ def float_emas_initializer(dims=2,energy=10, size=100, lowerbound=0.0, upperboun
         agents[agent.get_address()] = agent
     return agents
 
+def vectorized_float_emas_initializer(dims=2, energy=10, size=100, lowerbound=0.0, upperbound=1.0):
+    """ :return: (genes, energies) arrays of a VectorizedEmasAggregate population, requires numpy """
+    return numpy.random.uniform(lowerbound, upperbound, size=(size, dims)), numpy.repeat(float(energy), size)
+
 def emas_initializer(energy=10, size=100, lowerbound=0.0, upperbound=1.0):
     agents = {}
     for i in range(size):
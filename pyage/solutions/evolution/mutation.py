@@ -2,6 +2,9 @@ import random
 from pyage.core.operator import Operator
 from pyage.solutions.evolution.genotype import PointGenotype, FloatGenotype
 
+from pyage.core.lazy import optional
+numpy = optional("numpy")
+
 class AbstractMutation(Operator):
     def __init__(self, type, probability):
         super(AbstractMutation, self).__init__()
@@ -34,3 +37,9 @@ class UniformFloatMutation(AbstractMutation):
         index = random.randint(0, len(genotype.genes) - 1)
         genotype.genes[index] += random.uniform(-self.radius, self.radius)
 
+    def mutate_array(self, genes):
+        """ batched counterpart of mutate, requires numpy: mutates every row of :param genes: in place """
+        rows = numpy.arange(len(genes))
+        columns = numpy.random.randint(0, genes.shape[1], size=len(rows))
+        genes[rows, columns] += numpy.random.uniform(-self.radius, self.radius, size=len(rows))
+